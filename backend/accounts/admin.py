@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User
+from .models import User, LoginIdCounter
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
@@ -24,3 +24,15 @@ class UserAdmin(BaseUserAdmin):
     )
     
     readonly_fields = ['login_id', 'date_joined', 'last_login']
+
+    def save_model(self, request, obj, form, change):
+        # Deactivation or a role change signs the user out everywhere
+        if change and {'is_active', 'role'} & set(form.changed_data):
+            obj.revoke_tokens()
+        super().save_model(request, obj, form, change)
+
+
+@admin.register(LoginIdCounter)
+class LoginIdCounterAdmin(admin.ModelAdmin):
+    list_display = ['prefix', 'next_serial']
+    search_fields = ['prefix']
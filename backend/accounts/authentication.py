@@ -0,0 +1,114 @@
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import router
+from django.db.models import DEFERRED
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from accounts.models import User
+from accounts.user_cache import user_cache
+
+# Token claims copied onto the request user, keyed by User field name
+USER_TOKEN_CLAIMS = {
+    'email': 'email',
+    'login_id': 'login_id',
+}
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the users table on read-only requests.
+
+    For GET/HEAD/OPTIONS the request user is built from the token claims
+    (id, email, login_id) and the user's cached auth state (is_active,
+    token_version, role; see UserCache.auth_state). It is a regular User
+    instance with the remaining fields deferred, so role checks and
+    user=request.user filters work as before, and any other field is loaded
+    on first access. Deactivated users and revoked tokens are rejected and
+    demotions apply as soon as the auth state entry is invalidated, which
+    happens whenever the user is saved. Writes, tokens without the claims
+    and revocation checks (CHECK_REVOKE_TOKEN) still load the full user.
+
+    Set JWT_STATELESS_READS=False to always load the user.
+
+    With USER_CACHE['ENABLED'] every request instead loads the full user
+    through accounts.user_cache, which also enforces is_active and the
+    token_version claim, so revoked tokens stop working within seconds.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        if (
+            settings.JWT_STATELESS_READS
+            and not settings.USER_CACHE['ENABLED']
+            and request.method in SAFE_METHODS
+        ):
+            user = self.get_token_user(validated_token)
+            if user is not None:
+                return user, validated_token
+
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        """
+        Load the user through the user cache when enabled, and reject
+        tokens issued before the user's token_version was bumped.
+        """
+        if not settings.USER_CACHE['ENABLED']:
+            user = super().get_user(validated_token)
+        else:
+            try:
+                user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+            except (KeyError, ValidationError):
+                raise InvalidToken('Token contained no recognizable user identification')
+
+            user = user_cache.get(user_id)
+            if user is None:
+                raise AuthenticationFailed('User not found', code='user_not_found')
+            if not user.is_active:
+                raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        if validated_token.get('token_version', 0) != user.token_version:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+        return user
+
+    def get_token_user(self, validated_token):
+        """
+        Build the request user from the token claims, or return None
+        when the database has to be consulted.
+        """
+        if api_settings.CHECK_REVOKE_TOKEN:
+            return None
+
+        try:
+            user_id = User._meta.pk.to_python(validated_token[api_settings.USER_ID_CLAIM])
+            claims = {field: validated_token[claim] for field, claim in USER_TOKEN_CLAIMS.items()}
+        except (KeyError, ValidationError):
+            # Issued before the claims existed, or malformed
+            return None
+
+        state = user_cache.auth_state(user_id)
+        if state is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not state['is_active']:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+        if validated_token.get('token_version', 0) != state['token_version']:
+            raise AuthenticationFailed('Token has been revoked', code='token_revoked')
+
+        # The current role wins over the one in the token
+        values = {User._meta.pk.attname: user_id, **claims, **state}
+        return User.from_db(
+            router.db_for_read(User),
+            list(values),
+            [values.get(field.attname, DEFERRED) for field in User._meta.concrete_fields]
+        )
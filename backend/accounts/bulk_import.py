@@ -0,0 +1,233 @@
+import csv
+import io
+import json
+from datetime import date
+from itertools import islice
+
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from accounts.models import User
+from accounts.serializers import EmployeeImportRowSerializer
+from accounts.utils import allocate_login_serials, generate_random_password, login_id_prefix, seed_password_hash
+
+DEFAULT_BATCH_SIZE = 500
+SUPPORTED_FORMATS = ['csv', 'json']
+
+
+def iter_employee_rows(stream, fmt):
+    """
+    Yield employee rows (dicts) from a CSV or JSON stream.
+    CSV needs a header row; JSON is a list of objects or {"employees": [...]}.
+    """
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'. Use one of: {', '.join(SUPPORTED_FORMATS)}")
+
+    if isinstance(stream, (bytes, bytearray)):
+        stream = io.StringIO(stream.decode('utf-8-sig'))
+    elif isinstance(stream, str):
+        stream = io.StringIO(stream)
+
+    if fmt == 'csv':
+        for row in csv.DictReader(stream):
+            yield {key.strip(): (value or '').strip() for key, value in row.items() if key}
+        return
+
+    data = json.load(stream)
+    if isinstance(data, dict):
+        data = data.get('employees', [])
+    if not isinstance(data, list):
+        raise ValueError('JSON input must be a list of employee objects.')
+    yield from data
+
+
+def import_employees(rows, defaults=None, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Validate and create employees in batches.
+    Each batch reserves login_ids per prefix in one locked step and inserts users,
+    employee profiles, profile details and time off balances with
+    bulk_create inside a single transaction.
+
+    defaults: values used for missing row fields (e.g. company_name)
+    Returns a list with one result dict per input row, in input order.
+    """
+    report = []
+    rows = iter(rows)
+    row_number = 1
+
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        report.extend(_import_batch(batch, row_number, defaults or {}))
+        row_number += len(batch)
+
+    return report
+
+
+def _import_batch(batch, first_row_number, defaults):
+    from employees.models import EmployeeProfile
+    from profiles.models import ProfileDetail
+    from timeoff.accrual import new_balances
+    from timeoff.models import TimeOffType, TimeOffBalance
+
+    results = []
+    valid = []
+
+    # Validate rows without touching the database
+    for offset, raw in enumerate(batch):
+        row_number = first_row_number + offset
+        if not isinstance(raw, dict):
+            results.append({'row': row_number, 'status': 'error', 'errors': {'row': ['Expected an object.']}})
+            continue
+        data = {**defaults, **{key: value for key, value in raw.items() if value not in (None, '')}}
+        serializer = EmployeeImportRowSerializer(data=data)
+        if serializer.is_valid():
+            valid.append((row_number, serializer.validated_data))
+        else:
+            results.append({'row': row_number, 'status': 'error', 'errors': serializer.errors})
+
+    if valid:
+        with transaction.atomic():
+            # Check and insert in the same transaction; an email taken by a
+            # concurrent import or sign-up in between is caught per row on insert
+            accepted = _drop_taken_emails(valid, results)
+            users = [
+                (row_number, user, data)
+                for (row_number, _), (user, data) in zip(accepted, _build_users(accepted))
+            ] if accepted else []
+            users = _insert_users(users, results)
+
+            EmployeeProfile.objects.bulk_create([
+                EmployeeProfile(
+                    user=user,
+                    job_title=data.get('job_title', ''),
+                    department=data.get('department', '')
+                )
+                for _, user, data in users
+            ])
+            ProfileDetail.objects.bulk_create([
+                ProfileDetail(
+                    user=user,
+                    job_position=data.get('job_title', ''),
+                    department=data.get('department', '')
+                )
+                for _, user, data in users
+            ])
+
+            year = timezone.now().year
+            active_types = list(TimeOffType.objects.filter(is_active=True))
+            new_users = [user for _, user, _ in users]
+            TimeOffBalance.objects.bulk_create([
+                balance
+                for timeoff_type in active_types
+                for balance in new_balances(timeoff_type, year, new_users)
+            ], ignore_conflicts=True)
+
+        for row_number, user, _ in users:
+            results.append({
+                'row': row_number,
+                'status': 'created',
+                'id': str(user.id),
+                'login_id': user.login_id,
+                'email': user.email,
+                'generated_password': user.generated_password,
+            })
+
+    results.sort(key=lambda result: result['row'])
+    return results
+
+
+def _email_taken_error(row_number):
+    return {
+        'row': row_number,
+        'status': 'error',
+        'errors': {'email': ['A user with this email already exists.']}
+    }
+
+
+def _drop_taken_emails(valid, results):
+    """Keep rows whose email is unused (case-insensitively), in the database and within the batch"""
+    emails = [data['email'].lower() for _, data in valid]
+    taken = set(
+        User.objects.alias(email_lower=Lower('email')).filter(
+            email_lower__in=emails
+        ).values_list(Lower('email'), flat=True)
+    )
+    accepted = []
+    for row_number, data in valid:
+        email = data['email'].lower()
+        if email in taken:
+            results.append(_email_taken_error(row_number))
+            continue
+        taken.add(email)
+        accepted.append((row_number, data))
+    return accepted
+
+
+def _insert_users(users, results):
+    """
+    Insert (row_number, user, data) users with one bulk_create. If that
+    hits a unique constraint (a user created since the email check), insert
+    them one by one in savepoints and report the conflicting rows.
+    Returns the inserted entries.
+    """
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create([user for _, user, _ in users])
+        return users
+    except IntegrityError:
+        pass
+
+    inserted = []
+    for row_number, user, data in users:
+        try:
+            with transaction.atomic():
+                user.save(force_insert=True)
+        except IntegrityError:
+            if User.objects.filter(email__iexact=user.email).exists():
+                results.append(_email_taken_error(row_number))
+            else:
+                results.append({
+                    'row': row_number,
+                    'status': 'error',
+                    'errors': {'row': ['Conflicts with an existing user.']}
+                })
+            continue
+        inserted.append((row_number, user, data))
+    return inserted
+
+
+def _build_users(accepted):
+    """Build unsaved users with hashed passwords and allocated login_ids"""
+    users = []
+    prefix_counts = {}
+    for _, data in accepted:
+        if not data.get('date_of_joining'):
+            data['date_of_joining'] = date.today()
+        user = User(
+            email=data['email'],
+            company_name=data['company_name'],
+            full_name=data['full_name'],
+            phone=data['phone'],
+            role=data.get('role', 'EMPLOYEE'),
+            date_of_joining=data['date_of_joining'],
+            is_active=True,
+            is_first_login=True
+        )
+        # One-time password, changed on first login: hashed with the seed
+        # policy and re-hashed with the active one on first sign-in
+        user.generated_password = generate_random_password()
+        user.password = seed_password_hash(user.generated_password)
+        user.login_id = login_id_prefix(user.company_name, user.full_name, user.date_of_joining.year)
+        prefix_counts[user.login_id] = prefix_counts.get(user.login_id, 0) + 1
+        users.append((user, data))
+
+    # Reserve serials last so the counter locks are held only briefly
+    next_serials = allocate_login_serials(prefix_counts)
+    for user, _ in users:
+        prefix = user.login_id
+        user.login_id = f"{prefix}{str(next_serials[prefix]).zfill(4)}"
+        next_serials[prefix] += 1
+    return users
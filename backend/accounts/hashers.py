@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher, PBKDF2PasswordHasher, ScryptPasswordHasher
+)
+
+
+def _param(name, default):
+    """Work factor from settings.PASSWORD_HASHER_PARAMS, or the Django default"""
+    value = getattr(settings, 'PASSWORD_HASHER_PARAMS', {}).get(name)
+    return value if value is not None else default
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with a configurable iteration count.
+    Keeps the pbkdf2_sha256 algorithm name, so existing hashes verify and
+    are re-hashed on sign-in whenever the iteration count changes.
+    """
+    @property
+    def iterations(self):
+        return _param('pbkdf2_iterations', PBKDF2PasswordHasher.iterations)
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    """Scrypt with a configurable work factor (N, a power of two)"""
+    @property
+    def work_factor(self):
+        return _param('scrypt_work_factor', ScryptPasswordHasher.work_factor)
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 with configurable time cost, memory cost and parallelism"""
+    @property
+    def time_cost(self):
+        return _param('argon2_time_cost', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return _param('argon2_memory_cost', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return _param('argon2_parallelism', Argon2PasswordHasher.parallelism)
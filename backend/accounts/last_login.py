@@ -0,0 +1,89 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import update_last_login
+from django.db import close_old_connections
+from django.utils import timezone
+
+from accounts.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class LastLoginRecorder:
+    """
+    Records sign-in times without an UPDATE on the users row per sign-in.
+
+    In 'buffered' mode timestamps are kept per user in memory (repeated
+    sign-ins collapse into the latest one) and a background thread writes
+    them with one bulk_update every FLUSH_INTERVAL seconds, so last_login
+    is at most FLUSH_INTERVAL seconds stale. Pending timestamps are also
+    flushed at interpreter exit; a killed process loses at most one interval.
+    'sync' writes immediately as Django does, 'off' skips recording.
+    """
+
+    def __init__(self, options):
+        self.mode = options.get('MODE', 'buffered')
+        self.flush_interval = options.get('FLUSH_INTERVAL', 30)
+        self.batch_size = options.get('BATCH_SIZE', 500)
+
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+
+    def record(self, user, when=None):
+        """Record a sign-in for user"""
+        if self.mode == 'off':
+            return
+        if self.mode == 'sync':
+            update_last_login(None, user)
+            return
+
+        user.last_login = when or timezone.now()
+        with self._lock:
+            self._pending[user.pk] = user.last_login
+            if self._flusher is None:
+                self._start_flusher()
+
+    def flush(self):
+        """Write pending timestamps; returns the number of users updated"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        try:
+            User.objects.bulk_update(
+                [User(pk=user_id, last_login=when) for user_id, when in pending.items()],
+                ['last_login'],
+                batch_size=self.batch_size
+            )
+        except Exception:
+            logger.exception('Could not flush %d last_login updates', len(pending))
+            # Put them back unless a newer sign-in arrived meanwhile
+            with self._lock:
+                for user_id, when in pending.items():
+                    self._pending.setdefault(user_id, when)
+            return 0
+        return len(pending)
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def _start_flusher(self):
+        self._flusher = threading.Thread(target=self._run, name='last-login-flusher', daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            self.flush()
+            close_old_connections()
+
+
+last_login_recorder = LastLoginRecorder(settings.LAST_LOGIN)
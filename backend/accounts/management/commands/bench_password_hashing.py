@@ -0,0 +1,52 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+class Command(BaseCommand):
+    help = 'Measure sign-in password checks per second per core for each hash policy'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--policy',
+            action='append',
+            choices=list(settings.PASSWORD_HASHER_POLICIES),
+            help='Policy to benchmark (repeatable, default: all available)',
+        )
+        parser.add_argument(
+            '--seconds',
+            type=float,
+            default=3.0,
+            help='Time spent verifying per policy (default: 3)',
+        )
+
+    def handle(self, *args, **kwargs):
+        policies = kwargs.get('policy') or list(settings.PASSWORD_HASHER_POLICIES)
+        password = 'Benchmark123'
+
+        self.stdout.write(
+            f'Active policy: {settings.PASSWORD_HASH_POLICY} '
+            f'(single thread, so results are per core)\n'
+        )
+
+        for policy in policies:
+            hasher = import_string(settings.PASSWORD_HASHER_POLICIES[policy])()
+            try:
+                encoded = hasher.encode(password, hasher.salt())
+            except ValueError as exc:
+                # e.g. argon2-cffi not installed
+                self.stdout.write(self.style.WARNING(f'{policy:8} skipped: {exc}'))
+                continue
+
+            checks = 0
+            started = time.perf_counter()
+            deadline = started + kwargs['seconds']
+            while time.perf_counter() < deadline:
+                hasher.verify(password, encoded)
+                checks += 1
+            elapsed = time.perf_counter() - started
+
+            self.stdout.write(self.style.SUCCESS(
+                f'{policy:8} {checks / elapsed:10.1f} sign-ins/s/core '
+                f'({elapsed / checks * 1000:.2f} ms per check, {hasher.algorithm})'
+            ))
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from accounts.models import User
+from accounts.utils import seed_password_hash
 from employees.models import EmployeeProfile
 from timeoff.models import TimeOffType, TimeOffBalance
 from datetime import datetime
@@ -52,7 +53,7 @@ class Command(BaseCommand):
                     )
                     
                     if created:
-                        user.set_password(admin_data['password'])
+                        user.password = seed_password_hash(admin_data['password'])
                         user.save()
                         self.stdout.write(
                             self.style.SUCCESS(
@@ -65,7 +66,7 @@ class Command(BaseCommand):
                         for key, value in admin_data.items():
                             if key != 'password':
                                 setattr(user, key, value)
-                        user.set_password(admin_data['password'])
+                        user.password = seed_password_hash(admin_data['password'])
                         user.save()
                         self.stdout.write(
                             self.style.WARNING(
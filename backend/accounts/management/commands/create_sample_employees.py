@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from accounts.models import User
+from accounts.utils import seed_password_hash
 from employees.models import EmployeeProfile
 from attendance.models import AttendanceRecord
 
@@ -72,9 +73,9 @@ class Command(BaseCommand):
                 continue
             
             # Create user
-            user = User.objects.create_user(
+            user = User.objects.create(
                 email=emp_data['email'],
-                password=emp_data['password'],
+                password=seed_password_hash(emp_data['password']),
                 company_name=emp_data['company_name'],
                 full_name=emp_data['full_name'],
                 phone=emp_data['phone'],
@@ -0,0 +1,69 @@
+import json
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from accounts.bulk_import import (
+    DEFAULT_BATCH_SIZE, SUPPORTED_FORMATS, import_employees, iter_employee_rows
+)
+
+class Command(BaseCommand):
+    help = 'Bulk import employees from a CSV or JSON file (use "-" for stdin)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV/JSON file to import, or "-" to read stdin')
+        parser.add_argument(
+            '--format',
+            choices=SUPPORTED_FORMATS,
+            help='Input format (default: from the file extension)',
+        )
+        parser.add_argument(
+            '--company',
+            help='Company name for rows that do not set company_name',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows validated and inserted per transaction (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--report',
+            help='Write the per-row JSON report (including generated passwords) to this file',
+        )
+
+    def handle(self, *args, **kwargs):
+        path = kwargs['path']
+        fmt = kwargs.get('format') or path.rsplit('.', 1)[-1].lower()
+        if fmt not in SUPPORTED_FORMATS:
+            raise CommandError('Cannot infer the format; pass --format csv or --format json.')
+
+        defaults = {'company_name': kwargs['company']} if kwargs.get('company') else {}
+        started = time.monotonic()
+
+        try:
+            if path == '-':
+                report = import_employees(
+                    iter_employee_rows(sys.stdin, fmt), defaults, kwargs['batch_size']
+                )
+            else:
+                with open(path, newline='', encoding='utf-8-sig') as stream:
+                    report = import_employees(
+                        iter_employee_rows(stream, fmt), defaults, kwargs['batch_size']
+                    )
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for result in report:
+            if result['status'] != 'created':
+                self.stdout.write(self.style.ERROR(f"Row {result['row']}: {result['errors']}"))
+
+        if kwargs.get('report'):
+            with open(kwargs['report'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+            self.stdout.write(f"Report written to {kwargs['report']}")
+
+        created = sum(1 for result in report if result['status'] == 'created')
+        self.stdout.write(self.style.SUCCESS(
+            f'\nImported {created} of {len(report)} employees '
+            f'in {time.monotonic() - started:.2f}s'
+        ))
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from accounts.models import User
+from accounts.utils import seed_password_hash
 from employees.models import EmployeeProfile
 from attendance.models import AttendanceRecord
 from timeoff.models import TimeOffType, TimeOffBalance, TimeOffRequest
@@ -479,11 +480,10 @@ class Command(BaseCommand):
             # Create user
             user = User.objects.create(
                 **user_data,
+                password=seed_password_hash(password),
                 date_of_joining=date_of_joining,
                 is_first_login=False  # Demo users don't need to change password
             )
-            user.set_password(password)
-            user.save()
             created_users.append(user)
             
             # Create employee profile
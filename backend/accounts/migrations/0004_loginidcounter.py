@@ -0,0 +1,46 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:47
+
+from django.db import migrations, models
+
+LOGIN_ID_PREFIX_LENGTH = 10  # {company_code:2}{name_code:4}{year:4}
+
+
+def backfill_counters(apps, schema_editor):
+    """Seed one counter per existing prefix with the next free serial"""
+    User = apps.get_model('accounts', 'User')
+    LoginIdCounter = apps.get_model('accounts', 'LoginIdCounter')
+
+    next_serials = {}
+    for login_id in User.objects.values_list('login_id', flat=True).iterator():
+        prefix, serial = login_id[:LOGIN_ID_PREFIX_LENGTH], login_id[LOGIN_ID_PREFIX_LENGTH:]
+        if not serial.isdigit():
+            continue
+        next_serials[prefix] = max(next_serials.get(prefix, 1), int(serial) + 1)
+
+    LoginIdCounter.objects.bulk_create([
+        LoginIdCounter(prefix=prefix, next_serial=next_serial)
+        for prefix, next_serial in next_serials.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_users_date_jo_dcf7bf_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoginIdCounter',
+            fields=[
+                ('prefix', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('next_serial', models.PositiveIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'Login ID Counter',
+                'verbose_name_plural': 'Login ID Counters',
+                'db_table': 'login_id_counters',
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:29
+
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.functions.text
+
+
+def check_case_duplicate_emails(apps, schema_editor):
+    """
+    Refuse to add the constraint over emails that differ only in case;
+    which account to keep is for an admin to decide.
+    """
+    User = apps.get_model('accounts', 'User')
+    duplicates = list(
+        User.objects.values(email_lower=django.db.models.functions.text.Lower('email'))
+        .annotate(users=Count('id')).filter(users__gt=1)
+        .values_list('email_lower', flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Emails used by more than one user (ignoring case): '
+            f"{', '.join(duplicates)}. Change or merge these users, then migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_user_token_version'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicate_emails, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='user',
+            name='users_email_lower_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='users_email_lower_uniq'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 import uuid
 from datetime import datetime
 from django.db import models
+from django.db.models.functions import Lower, Upper
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 
 class UserManager(BaseUserManager):
@@ -44,6 +45,7 @@ class User(AbstractBaseUser, PermissionsMixin):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_first_login = models.BooleanField(default=True)  # Track if user needs to change password
+    token_version = models.PositiveIntegerField(default=0)  # Bumped to revoke issued tokens
     date_joined = models.DateTimeField(auto_now_add=True)
 
     objects = UserManager()
@@ -56,10 +58,29 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = 'User'
         verbose_name_plural = 'Users'
         ordering = ['-date_joined']
+        indexes = [
+            # Keyset pagination order for user listings
+            models.Index(fields=['-date_joined', 'id']),
+            # Case-insensitive sign-in lookups by login_id or email
+            models.Index(Upper('login_id'), name='users_login_id_upper_idx'),
+        ]
+        constraints = [
+            # Sign-in matches emails case-insensitively, so they must be
+            # unique case-insensitively too (also serves the email lookup)
+            models.UniqueConstraint(Lower('email'), name='users_email_lower_uniq'),
+        ]
 
     def __str__(self):
         return f"{self.login_id} - {self.full_name}"
 
+    def revoke_tokens(self):
+        """
+        Invalidate all tokens issued so far (takes effect on save). Call it
+        on a freshly read row, locked when concurrent writes are possible,
+        never on a cached request user.
+        """
+        self.token_version += 1
+
     def save(self, *args, **kwargs):
         # Generate login_id if not set
         if not self.login_id:
@@ -68,3 +89,25 @@ class User(AbstractBaseUser, PermissionsMixin):
             joining_year = self.date_of_joining.year if self.date_of_joining else datetime.now().year
             self.login_id = generate_login_id(self.company_name, self.full_name, joining_year)
         super().save(*args, **kwargs)
+
+        # Drop the cached copy used by authentication
+        from accounts.user_cache import invalidate_user
+        invalidate_user(self.pk)
+
+
+class LoginIdCounter(models.Model):
+    """
+    Next free login_id serial per prefix ({company_code}{name_code}{year}).
+    Rows are locked while serials are reserved, so allocation is O(1)
+    and concurrent creators never receive the same login_id.
+    """
+    prefix = models.CharField(max_length=20, primary_key=True)
+    next_serial = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        db_table = 'login_id_counters'
+        verbose_name = 'Login ID Counter'
+        verbose_name_plural = 'Login ID Counters'
+
+    def __str__(self):
+        return f"{self.prefix}: {self.next_serial}"
@@ -1,11 +1,24 @@
+import logging
 import re
+import time
 from rest_framework import serializers
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower, Upper
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User
 from .utils import generate_random_password
 from datetime import date
 
+logger = logging.getLogger(__name__)
+
+# Columns needed to authenticate and build the token response
+SIGNIN_USER_FIELDS = [
+    'id', 'password', 'login_id', 'company_name', 'full_name',
+    'email', 'phone', 'role', 'is_active', 'token_version'
+]
+
 class UserResponseSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -21,7 +34,7 @@ class AdminSignUpSerializer(serializers.ModelSerializer):
         fields = ['company_name', 'full_name', 'email', 'phone', 'password', 'confirm_password']
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter(email__iexact=value).exists():
             raise serializers.ValidationError('A user with this email already exists.')
         return value
 
@@ -74,21 +87,37 @@ class SignInSerializer(serializers.Serializer):
         if not login_identifier or not password:
             raise serializers.ValidationError('Login identifier and password are required.')
 
-        # Try to find user by login_id first, then by email
-        user = None
-        try:
-            user = User.objects.get(login_id=login_identifier)
-        except User.DoesNotExist:
-            try:
-                user = User.objects.get(email=login_identifier)
-            except User.DoesNotExist:
-                pass
+        # One query matching login_id or email, both case-insensitive
+        started = time.perf_counter()
+        identifier = login_identifier.strip()
+        candidates = list(
+            User.objects.alias(
+                login_id_upper=Upper('login_id'),
+                email_lower=Lower('email')
+            ).filter(
+                Q(login_id_upper=identifier.upper()) | Q(email_lower=identifier.lower())
+            ).only(*SIGNIN_USER_FIELDS).order_by()[:2]
+        )
+        lookup_ms = (time.perf_counter() - started) * 1000
+
+        # Prefer a login_id match, then an exact email match
+        candidates.sort(key=lambda candidate: (
+            candidate.login_id.upper() != identifier.upper(),
+            candidate.email != identifier
+        ))
+        user = candidates[0] if candidates else None
 
         if not user:
+            # Hash anyway so unknown identifiers take as long as wrong passwords
+            User().set_password(password)
             raise serializers.ValidationError('INVALID_CREDENTIALS')
 
         # Check password
-        if not user.check_password(password):
+        started = time.perf_counter()
+        password_ok = user.check_password(password)
+        self.timings = {'lookup': lookup_ms, 'password': (time.perf_counter() - started) * 1000}
+        logger.debug('Sign-in timings for %s: %s', user.login_id, self.timings)
+        if not password_ok:
             raise serializers.ValidationError('INVALID_CREDENTIALS')
 
         if not user.is_active:
@@ -108,6 +137,7 @@ class AuthTokenResponseSerializer(serializers.Serializer):
         refresh['email'] = user.email
         refresh['role'] = user.role
         refresh['login_id'] = user.login_id
+        refresh['token_version'] = user.token_version
         
         return {
             'user': UserResponseSerializer(user).data,
@@ -129,7 +159,7 @@ class CreateEmployeeSerializer(serializers.ModelSerializer):
         read_only_fields = ['login_id', 'generated_password']
     
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter(email__iexact=value).exists():
             raise serializers.ValidationError('A user with this email already exists.')
         return value
     
@@ -171,6 +201,22 @@ class CreateEmployeeSerializer(serializers.ModelSerializer):
         return user
 
 
+class EmployeeImportRowSerializer(CreateEmployeeSerializer):
+    """
+    Validates one row of a bulk employee import.
+    Email uniqueness is checked per batch by the importer, not per row.
+    """
+    email = serializers.EmailField(max_length=255)
+    job_title = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    department = serializers.CharField(max_length=255, required=False, allow_blank=True)
+    
+    class Meta(CreateEmployeeSerializer.Meta):
+        fields = CreateEmployeeSerializer.Meta.fields + ['job_title', 'department']
+    
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """
     Serializer for users to change their password.
@@ -213,10 +259,15 @@ class ChangePasswordSerializer(serializers.Serializer):
         return data
     
     def save(self):
-        user = self.context['request'].user
-        user.set_password(self.validated_data['new_password'])
-        user.is_first_login = False  # Mark that user has changed password
-        user.save()
+        # request.user may be a cached copy (see accounts.user_cache): lock
+        # and re-read the row, and write only the changed fields, so a stale
+        # is_active, role or token_version is never written back
+        with transaction.atomic():
+            user = User.objects.select_for_update().get(pk=self.context['request'].user.pk)
+            user.set_password(self.validated_data['new_password'])
+            user.is_first_login = False  # Mark that user has changed password
+            user.revoke_tokens()  # Sign out other sessions
+            user.save(update_fields=['password', 'is_first_login', 'token_version'])
         return user
 
 
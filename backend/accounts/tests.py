@@ -0,0 +1,256 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.cache import caches
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings, skipUnlessDBFeature
+from rest_framework.test import APIClient, APIRequestFactory
+from accounts.bulk_import import _build_users, _insert_users, import_employees
+from accounts.models import User
+from accounts.serializers import AuthTokenResponseSerializer, ChangePasswordSerializer
+from accounts.user_cache import user_cache
+from accounts.utils import (
+    _seed_hasher, generate_login_id, login_id_prefix, max_serials_by_prefix, seed_password_hash
+)
+
+
+def create_user(index, role='EMPLOYEE', email=None, **extra):
+    return User.objects.create_user(
+        email=email or f'user{index}@example.com',
+        password='pass12345',
+        company_name='Odoo',
+        full_name=f'User {index}',
+        phone='1234567890',
+        role=role,
+        **extra
+    )
+
+
+def import_row(index):
+    return {
+        'email': f'new{index}@example.com',
+        'full_name': f'New Person{index}',
+        'phone': '1234567890',
+        'company_name': 'Odoo',
+    }
+
+
+class BulkImportTests(TestCase):
+
+    def test_import_reports_existing_and_repeated_emails_per_row(self):
+        create_user(1)
+        rows = [import_row(1), {**import_row(2), 'email': 'user1@example.com'}, import_row(1)]
+        report = import_employees(rows)
+        self.assertEqual([result['status'] for result in report], ['created', 'error', 'error'])
+        self.assertEqual(User.objects.filter(email='new1@example.com').count(), 1)
+
+    def test_generated_passwords_use_seed_policy(self):
+        [result] = import_employees([import_row(1)])
+        user = User.objects.get(email='new1@example.com')
+        self.assertTrue(user.password.startswith(f'{_seed_hasher().algorithm}$'))
+        self.assertTrue(_seed_hasher().verify(result['generated_password'], user.password))
+
+    def test_insert_conflict_is_a_row_error(self):
+        # An email taken after the check (concurrent import or sign-up)
+        accepted = [(1, import_row(1)), (2, import_row(2))]
+        users = [
+            (row_number, user, data)
+            for (row_number, _), (user, data) in zip(accepted, _build_users(accepted))
+        ]
+        create_user(9, email='new2@example.com')
+        results = []
+        inserted = _insert_users(users, results)
+        self.assertEqual([row_number for row_number, _, _ in inserted], [1])
+        self.assertEqual(results, [{
+            'row': 2,
+            'status': 'error',
+            'errors': {'email': ['A user with this email already exists.']}
+        }])
+        self.assertTrue(User.objects.filter(email='new1@example.com').exists())
+
+
+class LoginSerialTests(TestCase):
+
+    def test_max_serial_is_numeric(self):
+        user = create_user(1)
+        prefix = user.login_id[:-4]
+        User.objects.filter(pk=user.pk).update(login_id=f'{prefix}9999')
+        User.objects.filter(pk=create_user(2).pk).update(login_id=f'{prefix}10000')
+        User.objects.filter(pk=create_user(3).pk).update(login_id=f'{prefix}ADMIN')
+        self.assertEqual(max_serials_by_prefix([prefix]), {prefix: 10000})
+
+
+class SeedPasswordHashTests(TestCase):
+
+    def test_shared_seed_password_is_salted_per_user(self):
+        first, second = seed_password_hash('admin123'), seed_password_hash('admin123')
+        self.assertNotEqual(first, second)
+        hasher = _seed_hasher()
+        self.assertTrue(hasher.verify('admin123', first))
+        self.assertTrue(hasher.verify('admin123', second))
+
+
+class EmailCaseTests(TestCase):
+
+    def test_emails_are_unique_ignoring_case(self):
+        create_user(1, email='Ann@Example.com')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            create_user(2, email='ann@example.com')
+
+        response = APIClient().post('/api/auth/admin/signup/', {
+            'company_name': 'Odoo', 'full_name': 'Ann Other', 'email': 'ANN@example.com',
+            'phone': '1234567890', 'password': 'Passw0rd!23', 'confirm_password': 'Passw0rd!23'
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+        report = import_employees([{**import_row(1), 'email': 'ann@EXAMPLE.com'}])
+        self.assertEqual(report[0]['status'], 'error')
+
+
+class SignInTimingTests(TestCase):
+
+    def sign_in(self):
+        create_user(1)
+        return APIClient().post('/api/auth/signin/', {
+            'login_identifier': 'user1@example.com', 'password': 'pass12345'
+        })
+
+    def test_no_server_timing_header_in_production(self):
+        response = self.sign_in()
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    @override_settings(DEBUG=True)
+    def test_server_timing_header_in_debug(self):
+        self.assertTrue(self.sign_in().has_header('Server-Timing'))
+
+
+@override_settings(JWT_STATELESS_READS=True)
+class StatelessReadTests(TestCase):
+    url = '/api/attendance/admin/day/'
+
+    def setUp(self):
+        caches[user_cache.cache_alias].clear()
+        self.user = create_user(1, role='ADMIN')
+        self.client = APIClient()
+        access = AuthTokenResponseSerializer.get_tokens_for_user(self.user)['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def save_user(self):
+        # Invalidation runs on commit
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+
+    def test_read_with_valid_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+
+    def test_deactivated_user_loses_read_access(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.is_active = False
+        self.save_user()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_revoked_token_loses_read_access(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.revoke_tokens()
+        self.save_user()
+        self.assertEqual(self.client.get(self.url).status_code, 401)
+
+    def test_demotion_applies_to_existing_token(self):
+        self.assertEqual(self.client.get(self.url).status_code, 200)
+        self.user.role = 'EMPLOYEE'
+        self.save_user()
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class UserCacheTests(TestCase):
+
+    def setUp(self):
+        caches[user_cache.cache_alias].clear()
+        self.user = create_user(1)
+
+    def test_password_is_not_cached(self):
+        cached = user_cache.get(self.user.pk)
+        shared = caches[user_cache.cache_alias].get(user_cache.key(self.user.pk))
+        self.assertNotIn('password', shared)
+        self.assertNotIn('last_login', shared)
+        self.assertEqual(cached.get_deferred_fields(), {'password', 'last_login'})
+        # Deferred fields still load on access
+        self.assertTrue(cached.check_password('pass12345'))
+
+    def test_saving_cached_user_keeps_password(self):
+        cached = user_cache.get(self.user.pk)
+        cached.full_name = 'Renamed'
+        cached.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.full_name, 'Renamed')
+        self.assertTrue(self.user.check_password('pass12345'))
+
+
+class ChangePasswordTests(TestCase):
+
+    def test_stale_request_user_is_not_written_back(self):
+        user = create_user(1)
+        stale = User.objects.get(pk=user.pk)
+        # Changed by an admin after the request user was loaded
+        user.is_active = False
+        user.role = 'HR'
+        user.revoke_tokens()
+        user.save()
+
+        request = APIRequestFactory().post('/api/auth/change-password/')
+        request.user = stale
+        serializer = ChangePasswordSerializer(
+            data={'old_password': 'pass12345', 'new_password': 'newpass123', 'confirm_password': 'newpass123'},
+            context={'request': request}
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
+        self.assertEqual(user.role, 'HR')
+        self.assertEqual(user.token_version, 2)
+        self.assertFalse(user.is_first_login)
+        self.assertTrue(user.check_password('newpass123'))
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentLoginIdTests(TransactionTestCase):
+    """Parallel creators must never receive the same login_id"""
+
+    WORKERS = 8
+    PER_WORKER = 10
+
+    def create_users(self, worker):
+        login_ids = []
+        try:
+            for index in range(self.PER_WORKER):
+                with transaction.atomic():
+                    login_id = generate_login_id('Odoo India', 'John Doe', 2026)
+                    User.objects.create(
+                        login_id=login_id,
+                        email=f'john{worker}-{index}@example.com',
+                        company_name='Odoo India',
+                        full_name='John Doe',
+                        phone='1234567890'
+                    )
+                login_ids.append(login_id)
+        finally:
+            connection.close()
+        return login_ids
+
+    def test_parallel_generation_is_unique_and_gapless(self):
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as pool:
+            login_ids = [
+                login_id
+                for worker_ids in pool.map(self.create_users, range(self.WORKERS))
+                for login_id in worker_ids
+            ]
+
+        total = self.WORKERS * self.PER_WORKER
+        prefix = login_id_prefix('Odoo India', 'John Doe', 2026)
+        self.assertEqual(len(set(login_ids)), total)
+        self.assertEqual(
+            sorted(login_ids),
+            [f'{prefix}{serial:04d}' for serial in range(1, total + 1)]
+        )
@@ -10,9 +10,13 @@ urlpatterns = [
     
     # Employee Management (Admin/HR only)
     path('create-employee/', views.create_employee, name='create_employee'),
+    path('bulk-import-employees/', views.bulk_import_employees, name='bulk_import_employees'),
     path('list-employees/', views.list_employees, name='list_employees'),
     
     # Password Management
     path('change-password/', views.change_password, name='change_password'),
     path('check-first-login/', views.check_first_login, name='check_first_login'),
+    
+    # Diagnostics (Admin only)
+    path('cache-stats/', views.cache_stats, name='cache_stats'),
 ]
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+from django.db.models import DEFERRED
+
+from accounts.models import User
+
+# User fields that decide whether a token is still honoured
+AUTH_STATE_FIELDS = ['is_active', 'token_version', 'role']
+
+# Never put in the shared cache: the password hash is a secret, and
+# last_login is written by bulk flushes that do not invalidate (see
+# accounts.last_login). Both are deferred and load on first access.
+UNCACHED_FIELDS = {'password', 'last_login'}
+
+
+class UserCache:
+    """
+    Two-level cache of User rows for request authentication.
+
+    The local level is a per-process LRU with a short TTL, so hot users
+    cost neither a database query nor a shared-cache round trip. The shared
+    level is the Django cache named by USER_CACHE['CACHE_ALIAS'] (locmem by
+    default, Redis for multi-process deployments) and is cleared by
+    invalidate() whenever a user is saved.
+
+    Users are stored as field values and rebuilt with User.from_db, so the
+    shared backend never holds pickled model instances. The password hash
+    and last_login are not stored; they are deferred on the rebuilt user.
+
+    auth_state() keeps a smaller entry per user with just the fields that
+    decide whether a token is honoured. It is used even with the full user
+    cache disabled, by stateless reads (see StatelessJWTAuthentication).
+    """
+
+    def __init__(self, options):
+        self.cache_alias = options.get('CACHE_ALIAS', 'default')
+        self.local_ttl = options.get('LOCAL_TTL', 5)
+        self.shared_ttl = options.get('SHARED_TTL', 60)
+        self.max_entries = options.get('MAX_ENTRIES', 1024)
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(['local_hits', 'shared_hits', 'misses', 'invalidations'], 0)
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    def key(self, user_id):
+        return f'user-cache:{user_id}'
+
+    def auth_key(self, user_id):
+        return f'user-auth:{user_id}'
+
+    def get(self, user_id):
+        """Return the user with this id, or None if it does not exist"""
+        fields = [field.attname for field in User._meta.concrete_fields if field.attname not in UNCACHED_FIELDS]
+        values = self._lookup(self.key(user_id), user_id, fields)
+        return None if values is None else self._build(values)
+
+    def auth_state(self, user_id):
+        """
+        The user's {'is_active', 'token_version', 'role'}, or None if it does
+        not exist. A small entry cached like get(), for checking tokens
+        whose user is otherwise built from the claims.
+        """
+        return self._lookup(self.auth_key(user_id), user_id, AUTH_STATE_FIELDS)
+
+    def invalidate(self, user_id):
+        """Drop a user from both levels (other processes keep theirs for LOCAL_TTL)"""
+        keys = [self.key(user_id), self.auth_key(user_id)]
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+            self._stats['invalidations'] += 1
+        self.shared.delete_many(keys)
+
+    def stats(self):
+        """Counters for this process since start or the last reset"""
+        with self._lock:
+            lookups = self._stats['local_hits'] + self._stats['shared_hits'] + self._stats['misses']
+            hits = lookups - self._stats['misses']
+            return {
+                **self._stats,
+                'local_entries': len(self._local),
+                'hit_rate': round(hits / lookups, 4) if lookups else None,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = dict.fromkeys(self._stats, 0)
+
+    def _lookup(self, key, user_id, fields):
+        """Field values of a user from the local level, the shared level or the database"""
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._local.move_to_end(key)
+                self._stats['local_hits'] += 1
+                return entry[1]
+
+        values = self.shared.get(key)
+        if values is not None:
+            self._count('shared_hits')
+        else:
+            self._count('misses')
+            values = User.objects.filter(pk=user_id).values(*fields).first()
+            if values is None:
+                return None
+            self.shared.set(key, values, self.shared_ttl)
+
+        self._remember(key, values)
+        return values
+
+    def _remember(self, key, values):
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, values)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_entries:
+                self._local.popitem(last=False)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _build(self, values):
+        return User.from_db(
+            router.db_for_read(User),
+            list(values),
+            [values.get(field.attname, DEFERRED) for field in User._meta.concrete_fields]
+        )
+
+
+user_cache = UserCache(settings.USER_CACHE)
+
+
+def invalidate_user(user_id):
+    """Invalidate a cached user once the surrounding transaction commits"""
+    transaction.on_commit(lambda: user_cache.invalidate(user_id))
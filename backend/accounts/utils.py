@@ -1,19 +1,16 @@
 from datetime import datetime
+from functools import lru_cache
 import secrets
 import string
 
-def generate_login_id(company_name, full_name, joining_year=None):
+def login_id_prefix(company_name, full_name, joining_year=None):
     """
-    Generate login_id in format: {company_code}{name_code}{year}{serial}
-    Example: OIJODO20220001
+    Build the login_id prefix: {company_code}{name_code}{year}
     
     - company_code: First 2 letters of company name (uppercase) - e.g., "OI" for "Odoo India"
     - name_code: First 2 letters of first name + first 2 letters of last name (uppercase)
     - year: Year of joining (4-digit)
-    - serial: 4-digit incremental number for that year
     """
-    from accounts.models import User
-    
     # Extract company code (first 2 letters)
     company_code = ''.join(filter(str.isalpha, company_name))[:2].upper()
     if len(company_code) < 2:
@@ -37,27 +34,90 @@ def generate_login_id(company_name, full_name, joining_year=None):
     # Use provided joining_year or current year
     year = joining_year if joining_year else datetime.now().year
     
-    # Find the next serial number for this year
-    prefix = f"{company_code}{name_code}{year}"
+    return f"{company_code}{name_code}{year}"
+
+
+def max_serials_by_prefix(prefixes):
+    """
+    Return {prefix: highest serial in use} for many prefixes in one
+    grouped query. Serials are compared as numbers, so widths may differ
+    (e.g. 9999 and 10000). Prefixes without users are omitted.
+    """
+    from django.db.models import BigIntegerField, Max
+    from django.db.models.functions import Cast, Left, Substr
+    from accounts.models import User
+    
+    prefixes = set(prefixes)
+    if not prefixes:
+        return {}
+    
+    prefix_length = len(next(iter(prefixes)))
+    rows = User.objects.filter(
+        login_id__regex=rf'^.{{{prefix_length}}}[0-9]+$'
+    ).annotate(
+        prefix=Left('login_id', prefix_length)
+    ).filter(
+        prefix__in=prefixes
+    ).values('prefix').annotate(
+        max_serial=Max(Cast(Substr('login_id', prefix_length + 1), BigIntegerField()))
+    ).order_by()
+    
+    return {row['prefix']: row['max_serial'] for row in rows}
+
+
+def allocate_login_serials(prefix_counts):
+    """
+    Reserve consecutive serials for many prefixes at once.
+    prefix_counts: {prefix: number of serials needed}
+    Returns {prefix: first reserved serial}.
     
-    # Get all login_ids that start with this prefix
-    existing_ids = User.objects.filter(
-        login_id__startswith=prefix
-    ).values_list('login_id', flat=True)
+    Counters are locked in prefix order for the rest of the enclosing
+    transaction; new prefixes are seeded from the highest existing login_id.
+    """
+    from django.db import transaction
+    from accounts.models import LoginIdCounter
     
-    # Extract serial numbers and find the max
-    serial_numbers = []
-    for login_id in existing_ids:
-        try:
-            serial = int(login_id[-4:])
-            serial_numbers.append(serial)
-        except (ValueError, IndexError):
-            continue
+    prefixes = sorted(prefix_counts)
+    if not prefixes:
+        return {}
     
-    next_serial = max(serial_numbers, default=0) + 1
-    serial_str = str(next_serial).zfill(4)
+    with transaction.atomic():
+        existing = set(LoginIdCounter.objects.filter(
+            prefix__in=prefixes
+        ).values_list('prefix', flat=True))
+        missing = [prefix for prefix in prefixes if prefix not in existing]
+        if missing:
+            seeds = max_serials_by_prefix(missing)
+            LoginIdCounter.objects.bulk_create([
+                LoginIdCounter(prefix=prefix, next_serial=seeds.get(prefix, 0) + 1)
+                for prefix in missing
+            ], ignore_conflicts=True)
+        
+        counters = list(LoginIdCounter.objects.select_for_update().filter(
+            prefix__in=prefixes
+        ).order_by('prefix'))
+        
+        first_serials = {}
+        for counter in counters:
+            first_serials[counter.prefix] = counter.next_serial
+            counter.next_serial += prefix_counts[counter.prefix]
+        LoginIdCounter.objects.bulk_update(counters, ['next_serial'])
     
-    return f"{prefix}{serial_str}"
+    return first_serials
+
+
+def generate_login_id(company_name, full_name, joining_year=None):
+    """
+    Generate login_id in format: {company_code}{name_code}{year}{serial}
+    Example: OIJODO20220001
+    
+    - serial: 4-digit incremental number for that year, reserved from
+      the prefix's LoginIdCounter
+    See login_id_prefix for the other parts.
+    """
+    prefix = login_id_prefix(company_name, full_name, joining_year)
+    serial = allocate_login_serials({prefix: 1})[prefix]
+    return f"{prefix}{str(serial).zfill(4)}"
 
 
 def generate_random_password(length=12):
@@ -81,3 +141,24 @@ def generate_random_password(length=12):
     secrets.SystemRandom().shuffle(password_chars)
     
     return ''.join(password_chars)
+
+
+@lru_cache(maxsize=None)
+def _seed_hasher():
+    """Hasher instance for settings.SEED_PASSWORD_HASH_POLICY"""
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+    
+    return import_string(settings.PASSWORD_HASHER_POLICIES[settings.SEED_PASSWORD_HASH_POLICY])()
+
+
+def seed_password_hash(password):
+    """
+    Hash a demo/seed password with settings.SEED_PASSWORD_HASH_POLICY.
+    Every call gets a fresh salt, so users sharing a password get
+    different hashes. Users are re-hashed with the active policy on their
+    first sign-in.
+    """
+    from django.contrib.auth.hashers import make_password
+    
+    return make_password(password, hasher=_seed_hasher())
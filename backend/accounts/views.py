@@ -1,3 +1,5 @@
+import codecs
+from django.conf import settings
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -11,6 +13,11 @@ from .serializers import (
     EmployeeListSerializer
 )
 from .models import User
+from .bulk_import import import_employees, iter_employee_rows
+from .last_login import last_login_recorder
+from .user_cache import user_cache
+from dayflow_core.pagination import UserCursorPagination
+from dayflow_core.response_cache import response_cache_stats
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
@@ -39,8 +46,16 @@ def signin(request):
     
     if serializer.is_valid():
         user = serializer.validated_data['user']
+        last_login_recorder.record(user)
         token_data = AuthTokenResponseSerializer.get_tokens_for_user(user)
-        return Response(token_data, status=status.HTTP_200_OK)
+        response = Response(token_data, status=status.HTTP_200_OK)
+        # Expose lookup/hash timings to browser dev tools in development only:
+        # in production they would tell whether a password hash was checked
+        if settings.DEBUG:
+            response['Server-Timing'] = ', '.join(
+                f'{name};dur={duration:.1f}' for name, duration in serializer.timings.items()
+            )
+        return response
     
     errors = serializer.errors
     if 'non_field_errors' in errors and 'INVALID_CREDENTIALS' in str(errors['non_field_errors']):
@@ -92,6 +107,47 @@ def create_employee(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_import_employees(request):
+    """
+    Bulk employee import endpoint (Admin/HR only)
+    Accepts a CSV or JSON file upload ('file', optional 'format'),
+    or a JSON body {"employees": [...]}.
+    Missing company_name defaults to the importer's company.
+    Returns a per-row report with generated login_ids and passwords.
+    """
+    if request.user.role not in ['ADMIN', 'HR']:
+        return Response(
+            {'error': 'Permission denied. Only Admin or HR can create employees.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    upload = request.FILES.get('file')
+    try:
+        if upload:
+            fmt = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+            # CSV is decoded line by line; JSON has to be parsed whole
+            stream = codecs.iterdecode(upload, 'utf-8-sig') if fmt == 'csv' else upload.read()
+            rows = iter_employee_rows(stream, fmt)
+        else:
+            rows = request.data.get('employees')
+            if not isinstance(rows, list):
+                raise ValueError('Provide a file upload or an "employees" list.')
+        report = import_employees(rows, defaults={'company_name': request.user.company_name})
+    except (ValueError, UnicodeDecodeError) as exc:
+        return Response({'error': 'INVALID_IMPORT', 'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    
+    created = sum(1 for result in report if result['status'] == 'created')
+    return Response({
+        'message': f'Imported {created} of {len(report)} employees',
+        'created': created,
+        'failed': len(report) - created,
+        'results': report,
+        'note': 'Please share the generated passwords with the employees. They must change them on first login.'
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def change_password(request):
@@ -99,14 +155,19 @@ def change_password(request):
     Change password endpoint
     For first-time login, old_password is not required
     For subsequent changes, old_password is required
+    Returns a new token pair; tokens issued before the change stop working
     """
     serializer = ChangePasswordSerializer(data=request.data, context={'request': request})
     
     if serializer.is_valid():
-        serializer.save()
+        user = serializer.save()
+        # Earlier tokens are revoked, so hand out a fresh pair
+        token_data = AuthTokenResponseSerializer.get_tokens_for_user(user)
         return Response({
             'message': 'Password changed successfully',
-            'is_first_login': False
+            'is_first_login': False,
+            'access': token_data['access'],
+            'refresh': token_data['refresh']
         }, status=status.HTTP_200_OK)
     
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -117,6 +178,7 @@ def change_password(request):
 def list_employees(request):
     """
     List all employees (Admin/HR only)
+    Cursor paginated, newest first. Query params: cursor, page_size
     """
     # Check if user is Admin or HR
     if request.user.role not in ['ADMIN', 'HR']:
@@ -125,9 +187,11 @@ def list_employees(request):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    employees = User.objects.all().order_by('-date_joined')
-    serializer = EmployeeListSerializer(employees, many=True)
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    employees = User.objects.all()
+    paginator = UserCursorPagination()
+    page = paginator.paginate_queryset(employees, request)
+    serializer = EmployeeListSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['GET'])
@@ -136,8 +200,32 @@ def check_first_login(request):
     """
     Check if user needs to change password (first login)
     """
+    user = request.user
+    # Load both fields in one query when the user was built from token claims
+    deferred = user.get_deferred_fields() & {'is_first_login', 'full_name'}
+    if deferred:
+        user.refresh_from_db(fields=deferred)
+
+    return Response({
+        'is_first_login': user.is_first_login,
+        'login_id': user.login_id,
+        'full_name': user.full_name
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def cache_stats(request):
+    """
+    User and response cache counters for the serving process (Admin only)
+    """
+    if request.user.role != 'ADMIN':
+        return Response(
+            {'error': 'Permission denied. Only Admin can view cache statistics.'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
     return Response({
-        'is_first_login': request.user.is_first_login,
-        'login_id': request.user.login_id,
-        'full_name': request.user.full_name
+        'user_cache': {'enabled': settings.USER_CACHE['ENABLED'], **user_cache.stats()},
+        'response_cache': {'enabled': settings.RESPONSE_CACHE['ENABLED'], **response_cache_stats()},
     }, status=status.HTTP_200_OK)
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import AttendanceRecord
+from .models import AttendanceRecord, AttendanceMonthSummary
+from .utils import mark_month_summaries_stale
 
 @admin.register(AttendanceRecord)
 class AttendanceRecordAdmin(admin.ModelAdmin):
@@ -22,6 +23,33 @@ class AttendanceRecordAdmin(admin.ModelAdmin):
         }),
     )
     
+    def save_model(self, request, obj, form, change):
+        # Edits bypass check-in/out, so rebuild the affected month summaries
+        if change:
+            mark_month_summaries_stale([AttendanceRecord.objects.get(pk=obj.pk)])
+        super().save_model(request, obj, form, change)
+        mark_month_summaries_stale([obj])
+    
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        mark_month_summaries_stale([obj])
+    
+    def delete_queryset(self, request, queryset):
+        records = list(queryset.only('user_id', 'work_date'))
+        super().delete_queryset(request, queryset)
+        mark_month_summaries_stale(records)
+    
     def duration_formatted(self, obj):
         return obj.duration_formatted or 'Not checked out'
     duration_formatted.short_description = 'Duration'
+
+
+@admin.register(AttendanceMonthSummary)
+class AttendanceMonthSummaryAdmin(admin.ModelAdmin):
+    list_display = ['user', 'year', 'month', 'days_present', 'days_on_leave', 'is_stale', 'updated_at']
+    list_filter = ['year', 'month', 'is_stale']
+    search_fields = ['user__full_name', 'user__email', 'user__login_id']
+    readonly_fields = [
+        'id', 'user', 'year', 'month', 'days_present', 'days_on_leave',
+        'total_worked_seconds', 'overtime_seconds', 'updated_at'
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:43
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_work_date(apps, schema_editor):
+    """
+    Fill work_date from check_in_time in the company timezone, and close
+    duplicate open records so the partial unique constraint can be added.
+    """
+    AttendanceRecord = apps.get_model('attendance', 'AttendanceRecord')
+    tz = timezone.get_default_timezone()
+
+    batch = []
+    for record in AttendanceRecord.objects.only('id', 'check_in_time').iterator(chunk_size=2000):
+        record.work_date = timezone.localdate(record.check_in_time, tz)
+        batch.append(record)
+        if len(batch) >= 2000:
+            AttendanceRecord.objects.bulk_update(batch, ['work_date'])
+            batch = []
+    if batch:
+        AttendanceRecord.objects.bulk_update(batch, ['work_date'])
+
+    # Keep the latest open record per (user, work_date); older ones are
+    # closed with zero duration
+    seen = set()
+    open_records = AttendanceRecord.objects.filter(
+        check_out_time__isnull=True
+    ).order_by('user_id', 'work_date', '-check_in_time')
+    for record in open_records.iterator():
+        key = (record.user_id, record.work_date)
+        if key in seen:
+            AttendanceRecord.objects.filter(pk=record.pk).update(
+                check_out_time=record.check_in_time
+            )
+        else:
+            seen.add(key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendancerecord',
+            name='work_date',
+            field=models.DateField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_work_date, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:45
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('attendance', '0003_attendancerecord_open_record_constraint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceMonthSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('days_present', models.IntegerField(default=0)),
+                ('days_on_leave', models.IntegerField(default=0)),
+                ('total_worked_seconds', models.BigIntegerField(default=0)),
+                ('overtime_seconds', models.BigIntegerField(default=0)),
+                ('is_stale', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_month_summaries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Attendance Month Summary',
+                'verbose_name_plural': 'Attendance Month Summaries',
+                'db_table': 'attendance_month_summaries',
+                'unique_together': {('user', 'year', 'month')},
+            },
+        ),
+    ]
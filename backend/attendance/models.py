@@ -1,8 +1,48 @@
 import uuid
+from datetime import datetime, time, timedelta
 from django.db import models
 from django.conf import settings
 from django.utils import timezone
 
+STANDARD_WORK_HOURS = 9  # Hours beyond this count as overtime
+
+
+def day_window(day, tz=None):
+    """
+    Convert a local calendar day into a half-open [start, end) range of
+    aware datetimes, so check_in_time filters can range-scan the
+    (user, check_in_time) index instead of casting every row to a date.
+    Defaults to the current timezone.
+    """
+    tz = tz or timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, time.min), tz)
+    end = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min), tz)
+    return start, end
+
+
+def work_date_for(moment=None):
+    """
+    Company-local calendar date of a moment (default: now).
+    The company timezone is settings.TIME_ZONE.
+    """
+    return timezone.localdate(moment or timezone.now(), timezone.get_default_timezone())
+
+
+class AttendanceRecordQuerySet(models.QuerySet):
+    def for_day(self, user, day, tz=None):
+        """Records checked in on the given local day (user=None for everyone)"""
+        return self.for_days(user, day, day, tz)
+
+    def for_days(self, user, first_day, last_day, tz=None):
+        """Records checked in between two local days, both inclusive"""
+        start, _ = day_window(first_day, tz)
+        _, end = day_window(last_day, tz)
+        queryset = self.filter(check_in_time__gte=start, check_in_time__lt=end)
+        if user is not None:
+            queryset = queryset.filter(user=user)
+        return queryset
+
+
 class AttendanceRecord(models.Model):
     STATUS_CHOICES = [
         ('PRESENT', 'Present'),
@@ -18,11 +58,14 @@ class AttendanceRecord(models.Model):
     )
     check_in_time = models.DateTimeField()
     check_out_time = models.DateTimeField(null=True, blank=True)
+    work_date = models.DateField(editable=False)  # Company-local date of check_in_time
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PRESENT')
     is_on_leave = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = AttendanceRecordQuerySet.as_manager()
+
     class Meta:
         db_table = 'attendance_records'
         verbose_name = 'Attendance Record'
@@ -31,11 +74,24 @@ class AttendanceRecord(models.Model):
         indexes = [
             models.Index(fields=['user', 'check_in_time']),
             models.Index(fields=['check_in_time']),
+            models.Index(fields=['user', 'work_date']),
+        ]
+        constraints = [
+            # At most one open record per user per day; makes check-in race-free
+            models.UniqueConstraint(
+                fields=['user', 'work_date'],
+                condition=models.Q(check_out_time__isnull=True),
+                name='unique_open_attendance_per_day'
+            ),
         ]
 
     def __str__(self):
         return f"{self.user.full_name} - {self.check_in_time.date()} - {self.status}"
 
+    def save(self, *args, **kwargs):
+        self.work_date = work_date_for(self.check_in_time)
+        super().save(*args, **kwargs)
+
     @property
     def duration(self):
         """Calculate duration in seconds if checked out"""
@@ -56,18 +112,45 @@ class AttendanceRecord(models.Model):
     @classmethod
     def get_today_record(cls, user):
         """Get today's attendance record for a user"""
-        today = timezone.now().date()
-        return cls.objects.filter(
-            user=user,
-            check_in_time__date=today
-        ).first()
+        return cls.objects.filter(user=user, work_date=work_date_for()).first()
 
     @classmethod
     def has_open_record(cls, user):
         """Check if user has an open (not checked out) record today"""
-        today = timezone.now().date()
         return cls.objects.filter(
             user=user,
-            check_in_time__date=today,
+            work_date=work_date_for(),
             check_out_time__isnull=True
         ).exists()
+
+
+class AttendanceMonthSummary(models.Model):
+    """
+    Per-user monthly attendance totals.
+    Incremented on check-in/check-out, and rebuilt there from the records
+    when missing or flagged stale (e.g. after an admin edit). Reads of a
+    missing or stale summary aggregate the records without saving.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='attendance_month_summaries'
+    )
+    year = models.IntegerField()
+    month = models.IntegerField()
+    days_present = models.IntegerField(default=0)
+    days_on_leave = models.IntegerField(default=0)
+    total_worked_seconds = models.BigIntegerField(default=0)
+    overtime_seconds = models.BigIntegerField(default=0)
+    is_stale = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'attendance_month_summaries'
+        verbose_name = 'Attendance Month Summary'
+        verbose_name_plural = 'Attendance Month Summaries'
+        unique_together = ['user', 'year', 'month']
+
+    def __str__(self):
+        return f"{self.user.full_name} - {self.year}-{self.month:02d}"
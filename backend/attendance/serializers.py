@@ -1,8 +1,11 @@
 from rest_framework import serializers
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from datetime import datetime, timedelta
-from attendance.models import AttendanceRecord
+from attendance.models import AttendanceRecord, STANDARD_WORK_HOURS, work_date_for
+from attendance.utils import apply_to_month_summary
 from accounts.models import User
+from dayflow_core.response_cache import invalidate_user_responses
 
 
 class AttendanceRecordSerializer(serializers.ModelSerializer):
@@ -50,11 +53,11 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
         return "00:00"
     
     def get_extra_hours(self, obj):
-        """Calculate extra hours beyond 9 hours"""
+        """Calculate extra hours beyond the standard 9 hours"""
         if obj.check_out_time and obj.check_in_time:
             delta = obj.check_out_time - obj.check_in_time
             total_hours = delta.total_seconds() / 3600
-            extra = max(0, total_hours - 9)  # Assuming 9 hours is standard
+            extra = max(0, total_hours - STANDARD_WORK_HOURS)
             hours = int(extra)
             minutes = int((extra % 1) * 60)
             return f"{hours:02d}:{minutes:02d}"
@@ -63,61 +66,94 @@ class AttendanceRecordSerializer(serializers.ModelSerializer):
 
 class CheckInSerializer(serializers.Serializer):
     """Check-in request"""
+    ALREADY_CHECKED_IN = {
+        'error': 'ALREADY_CHECKED_IN',
+        'message': 'You have already checked in today'
+    }
+
     def validate(self, data):
         user = self.context['request'].user
-        today = timezone.now().date()
         
         # Check if already checked in today (with open record)
-        open_record = AttendanceRecord.objects.filter(
-            user=user,
-            check_in_time__date=today,
-            check_out_time__isnull=True
-        ).first()
-        
-        if open_record:
-            raise serializers.ValidationError({
-                'error': 'ALREADY_CHECKED_IN',
-                'message': 'You have already checked in today'
-            })
+        if AttendanceRecord.has_open_record(user):
+            raise serializers.ValidationError(self.ALREADY_CHECKED_IN)
         
         return data
     
     def create(self, validated_data):
+        """
+        Insert the record. The open-record unique constraint rejects a
+        concurrent second check-in that passed validate(); it is reported
+        with the same body as serializer.errors.
+        """
         user = self.context['request'].user
-        record = AttendanceRecord.objects.create(
-            user=user,
-            check_in_time=timezone.now(),
-            status='PRESENT'
-        )
+        try:
+            with transaction.atomic():
+                record = AttendanceRecord.objects.create(
+                    user=user,
+                    check_in_time=timezone.now(),
+                    status='PRESENT'
+                )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {field: [message] for field, message in self.ALREADY_CHECKED_IN.items()}
+            )
+        apply_to_month_summary(record, days_present=1)
         return record
 
 
 class CheckOutSerializer(serializers.Serializer):
     """Check-out request"""
+    NO_OPEN_RECORD = {
+        'error': 'NO_OPEN_RECORD',
+        'message': 'No open check-in record found for today'
+    }
+
     def validate(self, data):
         user = self.context['request'].user
-        today = timezone.now().date()
         
         # Find today's open record
         record = AttendanceRecord.objects.filter(
             user=user,
-            check_in_time__date=today,
+            work_date=work_date_for(),
             check_out_time__isnull=True
         ).first()
         
         if not record:
-            raise serializers.ValidationError({
-                'error': 'NO_OPEN_RECORD',
-                'message': 'No open check-in record found for today'
-            })
+            raise serializers.ValidationError(self.NO_OPEN_RECORD)
         
         data['record'] = record
         return data
     
     def create(self, validated_data):
+        """
+        Close the record with a conditional UPDATE, so of two concurrent
+        check-outs that both passed validate() only one adds the worked
+        time to the month summary; the other gets NO_OPEN_RECORD with the
+        same body as serializer.errors.
+        """
         record = validated_data['record']
-        record.check_out_time = timezone.now()
-        record.save()
+        now = timezone.now()
+        with transaction.atomic():
+            closed = AttendanceRecord.objects.filter(pk=record.pk, check_out_time__isnull=True).update(
+                check_out_time=now,
+                updated_at=now
+            )
+            if closed != 1:
+                raise serializers.ValidationError(
+                    {field: [message] for field, message in self.NO_OPEN_RECORD.items()}
+                )
+            record.check_out_time = now
+            record.updated_at = now
+
+            worked_seconds = int(record.duration)
+            apply_to_month_summary(
+                record,
+                total_worked_seconds=worked_seconds,
+                overtime_seconds=max(0, worked_seconds - STANDARD_WORK_HOURS * 3600)
+            )
+        # Queryset updates do not send post_save
+        invalidate_user_responses(record.user_id)
         return record
 
 
@@ -146,4 +182,6 @@ class EmployeeMonthAttendanceSerializer(serializers.Serializer):
     days_present = serializers.IntegerField()
     days_on_leave = serializers.IntegerField()
     total_days = serializers.IntegerField()
+    total_work_hours = serializers.CharField()
+    total_extra_hours = serializers.CharField()
     records = AttendanceRecordSerializer(many=True)
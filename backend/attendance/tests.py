@@ -0,0 +1,182 @@
+from datetime import date, timedelta
+from zoneinfo import ZoneInfo
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APIRequestFactory
+from accounts.models import User
+from attendance.models import STANDARD_WORK_HOURS, AttendanceMonthSummary, AttendanceRecord, day_window
+from attendance.serializers import CheckInSerializer, CheckOutSerializer
+
+
+def create_user(index, role='EMPLOYEE'):
+    return User.objects.create_user(
+        email=f'user{index}@example.com',
+        password='pass12345',
+        company_name='Odoo',
+        full_name=f'User {index}',
+        phone='1234567890',
+        role=role
+    )
+
+
+class AdminDayRosterQueryTests(TestCase):
+    """The day roster must not issue queries per employee"""
+
+    def setUp(self):
+        self.admin = create_user('admin', role='ADMIN')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def add_employees(self, start, count):
+        now = timezone.now()
+        for index in range(start, start + count):
+            employee = create_user(index)
+            if index % 2 == 0:
+                AttendanceRecord.objects.create(
+                    user=employee,
+                    check_in_time=now - timedelta(hours=1)
+                )
+
+    def test_roster_query_count_is_independent_of_headcount(self):
+        self.add_employees(0, 3)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/attendance/admin/day/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['employees']), 3)
+
+        self.add_employees(3, 12)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/attendance/admin/day/')
+        self.assertEqual(len(response.data['employees']), 15)
+        self.assertEqual(response.data['total_present'] + response.data['total_absent'], 15)
+
+
+class DayWindowTests(TestCase):
+    """Day filters must be index range scans, not per-row date casts"""
+
+    def index_name(self, fields):
+        return next(index.name for index in AttendanceRecord._meta.indexes if index.fields == fields)
+
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables would otherwise always be scanned sequentially
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_for_day_uses_user_check_in_index(self):
+        user = create_user(1)
+        queryset = AttendanceRecord.objects.for_day(user, date(2026, 3, 2))
+        self.assertNotIn('__date', str(queryset.query))
+        self.assertIn(self.index_name(['user', 'check_in_time']), self.explain(queryset))
+
+    def test_for_day_without_user_uses_check_in_index(self):
+        queryset = AttendanceRecord.objects.for_day(None, date(2026, 3, 2))
+        self.assertIn(self.index_name(['check_in_time']), self.explain(queryset))
+
+    def test_day_window_spans_dst_change(self):
+        # Europe/Berlin springs forward on 2026-03-29: that day has 23 hours
+        start, end = day_window(date(2026, 3, 29), ZoneInfo('Europe/Berlin'))
+        utc = ZoneInfo('UTC')
+        self.assertEqual(end.astimezone(utc) - start.astimezone(utc), timedelta(hours=23))
+
+
+class CheckInTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_second_check_in_keeps_error_shape(self):
+        self.assertEqual(self.client.post('/api/attendance/check-in/').status_code, 201)
+        response = self.client.post('/api/attendance/check-in/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {
+            'error': ['ALREADY_CHECKED_IN'],
+            'message': ['You have already checked in today']
+        })
+
+    def test_constraint_backstop_keeps_error_shape(self):
+        # A concurrent check-in that passed validate() hits the constraint
+        AttendanceRecord.objects.create(user=self.user, check_in_time=timezone.now())
+        request = APIRequestFactory().post('/api/attendance/check-in/')
+        request.user = self.user
+        serializer = CheckInSerializer(context={'request': request})
+        with self.assertRaises(ValidationError) as raised:
+            serializer.create({})
+        self.assertEqual(raised.exception.detail, {
+            'error': ['ALREADY_CHECKED_IN'],
+            'message': ['You have already checked in today']
+        })
+
+
+class CheckOutTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        record = AttendanceRecord.objects.create(user=self.user, check_in_time=timezone.now())
+        # Ten hours in, still on today's work date
+        AttendanceRecord.objects.filter(pk=record.pk).update(check_in_time=record.check_in_time - timedelta(hours=10))
+
+    def check_out_serializer(self):
+        request = APIRequestFactory().post('/api/attendance/check-out/')
+        request.user = self.user
+        serializer = CheckOutSerializer(data={}, context={'request': request})
+        self.assertTrue(serializer.is_valid())
+        return serializer
+
+    def test_second_check_out_is_rejected(self):
+        self.assertEqual(self.client.post('/api/attendance/check-out/').status_code, 200)
+        response = self.client.post('/api/attendance/check-out/')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], ['NO_OPEN_RECORD'])
+
+    def test_concurrent_check_outs_count_the_day_once(self):
+        # Both passed validate() before either closed the record
+        first, second = self.check_out_serializer(), self.check_out_serializer()
+        record = first.save()
+        with self.assertRaises(ValidationError) as raised:
+            second.save()
+        self.assertEqual(raised.exception.detail, {
+            'error': ['NO_OPEN_RECORD'],
+            'message': ['No open check-in record found for today']
+        })
+
+        worked_seconds = int(record.duration)
+        summary = AttendanceMonthSummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_worked_seconds, worked_seconds)
+        self.assertEqual(summary.overtime_seconds, worked_seconds - STANDARD_WORK_HOURS * 3600)
+        record.refresh_from_db()
+        self.assertEqual(int(record.duration), worked_seconds)
+
+
+class MonthSummaryTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user(1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_month_view_does_not_write_summaries(self):
+        for year, month in [(1990, 1), (2099, 12)]:
+            response = self.client.get('/api/attendance/me/month/', {'year': year, 'month': month})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['days_present'], 0)
+        self.assertFalse(AttendanceMonthSummary.objects.exists())
+
+    def test_check_in_maintains_summary_read_by_month_view(self):
+        self.client.post('/api/attendance/check-in/')
+        today = timezone.localdate()
+        summary = AttendanceMonthSummary.objects.get(user=self.user)
+        self.assertEqual(summary.days_present, 1)
+
+        AttendanceMonthSummary.objects.filter(pk=summary.pk).update(is_stale=True)
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/attendance/me/month/', {'year': today.year, 'month': today.month})
+        self.assertEqual(response.data['days_present'], 1)
+        self.assertTrue(AttendanceMonthSummary.objects.get(pk=summary.pk).is_stale)
@@ -0,0 +1,197 @@
+from calendar import monthrange
+from datetime import date, timedelta
+from django.db.models import (
+    Case, Count, DurationField, Exists, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum, Value, When
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+from attendance.models import AttendanceRecord, AttendanceMonthSummary, STANDARD_WORK_HOURS
+from accounts.models import User
+from timeoff.models import LeaveDay
+
+ROSTER_RECORD_FIELDS = ['id', 'check_in_time', 'check_out_time', 'status']
+
+
+def build_day_roster(target_date):
+    """
+    Build the admin day roster for all employees in two queries.
+
+    Each employee is left-joined to their latest attendance record for the
+    day (one row per employee, absent employees included) and to their
+    approved leave for the day, and the present/absent/on-leave totals are
+    aggregated in SQL. Employees on leave without a record count as ON_LEAVE.
+    Returns a dict with 'employees' (list of AttendanceRecord instances,
+    unsaved placeholders for employees without a record) and the three totals.
+    """
+    day_records = AttendanceRecord.objects.for_day(None, target_date).filter(
+        user=OuterRef('pk')
+    ).order_by('-check_in_time')
+
+    employees = User.objects.filter(role='EMPLOYEE').annotate(
+        on_leave=Exists(LeaveDay.objects.filter(user=OuterRef('pk'), day=target_date)),
+        **{
+            f'day_record_{field}': Subquery(day_records.values(field)[:1])
+            for field in ROSTER_RECORD_FIELDS
+        }
+    )
+
+    no_record = Q(day_record_id__isnull=True)
+    totals = employees.aggregate(
+        total_present=Count('pk', filter=Q(day_record_status='PRESENT')),
+        total_on_leave=Count('pk', filter=Q(day_record_status='ON_LEAVE') | (no_record & Q(on_leave=True))),
+        total_absent=Count('pk', filter=no_record & Q(on_leave=False)),
+    )
+
+    rows = []
+    for employee in employees:
+        if employee.day_record_id is not None:
+            record = AttendanceRecord(
+                id=employee.day_record_id,
+                user=employee,
+                check_in_time=employee.day_record_check_in_time,
+                check_out_time=employee.day_record_check_out_time,
+                status=employee.day_record_status
+            )
+        else:
+            # Placeholder row so absent employees are still listed
+            record = AttendanceRecord(
+                id=None,
+                user=employee,
+                check_in_time=None,
+                status='ON_LEAVE' if employee.on_leave else 'ABSENT',
+                is_on_leave=employee.on_leave
+            )
+        rows.append(record)
+
+    return {'employees': rows, **totals}
+
+
+def today_status_icon(user_ref='user'):
+    """
+    Expression resolving today's status icon for the user referenced by
+    user_ref, for use in .annotate(). Mirrors the card logic: ON_LEAVE on an
+    approved leave day or if the latest record is a leave, PRESENT while
+    checked in, otherwise ABSENT.
+    """
+    today = timezone.localdate()
+    latest_icon = AttendanceRecord.objects.for_day(None, today).filter(
+        user=OuterRef(user_ref)
+    ).order_by('-check_in_time').annotate(
+        icon=Case(
+            When(is_on_leave=True, then=Value('ON_LEAVE')),
+            When(check_out_time__isnull=True, then=Value('PRESENT')),
+            default=Value('ABSENT')
+        )
+    ).values('icon')[:1]
+
+    return Case(
+        When(
+            Exists(LeaveDay.objects.filter(user=OuterRef(user_ref), day=today)),
+            then=Value('ON_LEAVE')
+        ),
+        default=Coalesce(Subquery(latest_icon), Value('ABSENT'))
+    )
+
+
+def month_bounds(year, month):
+    """First and last day of a month"""
+    return date(year, month, 1), date(year, month, monthrange(year, month)[1])
+
+
+def format_seconds(seconds):
+    """Format a number of seconds as HH:MM"""
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}"
+
+
+def aggregate_month(user, year, month):
+    """
+    Compute a user's monthly totals from their records in one
+    conditional-aggregate query. Only checked-out records add worked time.
+    """
+    first_day, last_day = month_bounds(year, month)
+    worked = ExpressionWrapper(
+        F('check_out_time') - F('check_in_time'),
+        output_field=DurationField()
+    )
+    closed = Q(check_out_time__isnull=False)
+
+    totals = AttendanceRecord.objects.filter(
+        user=user,
+        work_date__range=(first_day, last_day)
+    ).aggregate(
+        days_present=Count('pk', filter=Q(status='PRESENT')),
+        days_on_leave=Count('pk', filter=Q(status='ON_LEAVE')),
+        worked=Sum(worked, filter=closed),
+        overtime=Sum(
+            Greatest(
+                worked - Value(timedelta(hours=STANDARD_WORK_HOURS)),
+                Value(timedelta(0))
+            ),
+            filter=closed
+        ),
+    )
+
+    return {
+        'days_present': totals['days_present'],
+        'days_on_leave': totals['days_on_leave'],
+        'total_worked_seconds': int((totals['worked'] or timedelta(0)).total_seconds()),
+        'overtime_seconds': int((totals['overtime'] or timedelta(0)).total_seconds()),
+    }
+
+
+def refresh_month_summary(user, year, month):
+    """Rebuild a month summary from the records"""
+    summary, _ = AttendanceMonthSummary.objects.update_or_create(
+        user=user,
+        year=year,
+        month=month,
+        defaults={**aggregate_month(user, year, month), 'is_stale': False}
+    )
+    return summary
+
+
+def get_month_summary(user, year, month):
+    """
+    Read a month summary. A missing or stale one is computed from the
+    records without being saved, so reads never write; summaries are only
+    written on the check-in/check-out path (apply_to_month_summary).
+    """
+    summary = AttendanceMonthSummary.objects.filter(
+        user=user,
+        year=year,
+        month=month,
+        is_stale=False
+    ).first()
+    if summary is None:
+        summary = AttendanceMonthSummary(user=user, year=year, month=month, **aggregate_month(user, year, month))
+    return summary
+
+
+def apply_to_month_summary(record, **deltas):
+    """
+    Add deltas (e.g. days_present=1) to the summary of the record's month
+    with a single UPDATE. Missing or stale summaries are rebuilt instead,
+    which already accounts for the saved record.
+    """
+    year, month = record.work_date.year, record.work_date.month
+    updated = AttendanceMonthSummary.objects.filter(
+        user_id=record.user_id,
+        year=year,
+        month=month,
+        is_stale=False
+    ).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + value for field, value in deltas.items()}
+    )
+    if not updated:
+        refresh_month_summary(record.user, year, month)
+
+
+def mark_month_summaries_stale(records):
+    """Flag the month summaries covering the given records for rebuild"""
+    for user_id, work_date in {(r.user_id, r.work_date) for r in records}:
+        AttendanceMonthSummary.objects.filter(
+            user_id=user_id,
+            year=work_date.year,
+            month=work_date.month
+        ).update(is_stale=True)
@@ -4,10 +4,10 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.utils import timezone
 from django.db.models import Q
-from datetime import datetime, timedelta
-from calendar import monthrange
+from datetime import datetime
 
-from attendance.models import AttendanceRecord
+from attendance.models import AttendanceRecord, work_date_for
+from attendance.utils import build_day_roster, format_seconds, get_month_summary, month_bounds
 from attendance.serializers import (
     AttendanceRecordSerializer, CheckInSerializer, CheckOutSerializer,
     CurrentStatusSerializer, AdminDayAttendanceSerializer,
@@ -69,10 +69,9 @@ class CurrentStatusView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        today = timezone.now().date()
         record = AttendanceRecord.objects.filter(
             user=request.user,
-            check_in_time__date=today
+            work_date=work_date_for()
         ).first()
         
         if record and not record.check_out_time:
@@ -132,43 +131,17 @@ class AdminDayAttendanceView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
         else:
-            target_date = timezone.now().date()
+            target_date = timezone.localdate()
         
-        # Get all attendance records for this date
-        records = AttendanceRecord.objects.filter(
-            check_in_time__date=target_date
-        ).select_related('user')
-        
-        # Get all employees
-        all_employees = User.objects.filter(role='EMPLOYEE')
-        
-        # Build response with all employees
-        employee_records = []
-        present_count = 0
-        absent_count = 0
-        leave_count = 0
-        
-        for employee in all_employees:
-            record = records.filter(user=employee).first()
-            if record:
-                employee_records.append(record)
-                if record.status == 'PRESENT':
-                    present_count += 1
-                elif record.status == 'ON_LEAVE':
-                    leave_count += 1
-            else:
-                # Create a placeholder for absent employees
-                absent_count += 1
-                # You might want to create actual absent records here
-        
-        serializer = AttendanceRecordSerializer(employee_records, many=True)
+        roster = build_day_roster(target_date)
+        serializer = AttendanceRecordSerializer(roster['employees'], many=True)
         
         return Response({
             'date': target_date.strftime('%d/%m/%Y'),
             'employees': serializer.data,
-            'total_present': present_count,
-            'total_absent': absent_count,
-            'total_on_leave': leave_count
+            'total_present': roster['total_present'],
+            'total_absent': roster['total_absent'],
+            'total_on_leave': roster['total_on_leave']
         })
 
 
@@ -192,20 +165,17 @@ class EmployeeMonthAttendanceView(APIView):
             )
         
         # Get first and last day of month
-        first_day = datetime(year, month, 1).date()
-        last_day = datetime(year, month, monthrange(year, month)[1]).date()
+        first_day, last_day = month_bounds(year, month)
+        
+        # Statistics come from the maintained month summary
+        summary = get_month_summary(request.user, year, month)
+        total_days = (last_day - first_day).days + 1
         
         # Get all records for this month
         records = AttendanceRecord.objects.filter(
             user=request.user,
-            check_in_time__date__gte=first_day,
-            check_in_time__date__lte=last_day
-        ).order_by('-check_in_time')
-        
-        # Calculate statistics
-        days_present = records.filter(status='PRESENT').count()
-        days_on_leave = records.filter(status='ON_LEAVE').count()
-        total_days = (last_day - first_day).days + 1
+            work_date__range=(first_day, last_day)
+        ).select_related('user').order_by('-check_in_time')
         
         serializer = AttendanceRecordSerializer(records, many=True)
         
@@ -217,8 +187,10 @@ class EmployeeMonthAttendanceView(APIView):
         return Response({
             'month': month_names[month - 1],
             'year': year,
-            'days_present': days_present,
-            'days_on_leave': days_on_leave,
+            'days_present': summary.days_present,
+            'days_on_leave': summary.days_on_leave,
             'total_days': total_days,
+            'total_work_hours': format_seconds(summary.total_worked_seconds),
+            'total_extra_hours': format_seconds(summary.overtime_seconds),
             'records': serializer.data
         })
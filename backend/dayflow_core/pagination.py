@@ -0,0 +1,27 @@
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class DefaultCursorPagination(CursorPagination):
+    """
+    Keyset pagination with opaque cursors.
+    Pages are fetched with an indexed range filter on the ordering field,
+    so deep pages cost the same as the first one.
+    Query params: cursor, page_size (capped at MAX_PAGE_SIZE)
+    """
+    ordering = ('-created_at', 'id')
+    page_size_query_param = 'page_size'
+    max_page_size = settings.REST_FRAMEWORK.get('MAX_PAGE_SIZE', 200)
+
+
+class UserCursorPagination(DefaultCursorPagination):
+    """Newest users first, for User querysets"""
+    ordering = ('-date_joined', 'id')
+
+
+class EmployeeProfileCursorPagination(DefaultCursorPagination):
+    """
+    Newest users first, for EmployeeProfile querysets.
+    The view must annotate date_joined=F('user__date_joined').
+    """
+    ordering = ('-date_joined', 'user_id')
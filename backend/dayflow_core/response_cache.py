@@ -0,0 +1,141 @@
+import hashlib
+import json
+import threading
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+GLOBAL_SCOPE = 'all'
+
+_stats = dict.fromkeys(['hits', 'misses', 'not_modified', 'invalidations'], 0)
+_stats_lock = threading.Lock()
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _cache():
+    return caches[settings.RESPONSE_CACHE['CACHE_ALIAS']]
+
+
+def _generation_key(scope):
+    return f'resp-gen:{scope}'
+
+
+def _generations(*scopes):
+    """
+    Current generation token per scope. Tokens are random, so a generation
+    evicted from the cache is replaced by a new one instead of reviving
+    entries cached under an older token.
+    """
+    cache = _cache()
+    keys = [_generation_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, uuid.uuid4().hex, None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def _bump(scope):
+    _cache().set(_generation_key(scope), uuid.uuid4().hex, None)
+    _count('invalidations')
+
+
+def invalidate_user_responses(user_id):
+    """Expire every cached response about this user once the transaction commits"""
+    transaction.on_commit(lambda: _bump(user_id))
+
+
+def invalidate_all_responses():
+    """Expire every cached response (for shared data such as time off types)"""
+    transaction.on_commit(lambda: _bump(GLOBAL_SCOPE))
+
+
+def response_cache_stats():
+    """Counters for this process since start"""
+    with _stats_lock:
+        lookups = _stats['hits'] + _stats['misses']
+        return {
+            **_stats,
+            'hit_rate': round(_stats['hits'] / lookups, 4) if lookups else None,
+        }
+
+
+def make_etag(data):
+    payload = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    return '"%s"' % hashlib.md5(payload, usedforsecurity=False).hexdigest()
+
+
+def cache_response(resource, owner_kwarg=None, daily=False):
+    """
+    Cache a GET view's 200 response data per viewer and owner, with
+    ETag / If-None-Match support.
+
+    resource: name for the cached endpoint
+    owner_kwarg: URL kwarg holding the id of the user the response is about
+                 (default: the requesting user)
+    daily: also key on today's date, for responses that depend on it
+
+    Entries are keyed on the viewer's id and role, so one user's response is
+    never served to another. They expire when the owner's generation is
+    bumped by invalidate_user_responses() (wired to model signals), or
+    after RESPONSE_CACHE['TIMEOUT'] seconds.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if not settings.RESPONSE_CACHE['ENABLED'] or request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            owner_id = kwargs[owner_kwarg] if owner_kwarg else request.user.pk
+            owner_generation, global_generation = _generations(owner_id, GLOBAL_SCOPE)
+            key = ':'.join([
+                'resp',
+                resource,
+                str(owner_id),
+                str(request.user.pk),
+                request.user.role,
+                owner_generation,
+                global_generation,
+                timezone.localdate().isoformat() if daily else '',
+                hashlib.md5(
+                    request.META.get('QUERY_STRING', '').encode(), usedforsecurity=False
+                ).hexdigest(),
+            ])
+
+            cache = _cache()
+            entry = cache.get(key)
+            if entry is not None:
+                _count('hits')
+            else:
+                _count('misses')
+                response = view(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                entry = (make_etag(response.data), response.data)
+                cache.set(key, entry, settings.RESPONSE_CACHE['TIMEOUT'])
+
+            etag, data = entry
+            if etag in request.META.get('HTTP_IF_NONE_MATCH', ''):
+                _count('not_modified')
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = Response(data)
+            response['ETag'] = etag
+            # Browsers may keep the body but must revalidate with If-None-Match
+            response['Cache-Control'] = 'private, no-cache'
+            return response
+
+        return wrapper
+    return decorator
@@ -1,6 +1,7 @@
 from pathlib import Path
 from datetime import timedelta
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -23,6 +24,7 @@ INSTALLED_APPS = [
     'attendance',
     'profiles',
     'timeoff',
+    'payroll',
 ]
 
 MIDDLEWARE = [
@@ -74,6 +76,44 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# Password hashing policy: the first hasher of the policy hashes new
+# passwords; hashes made under any other policy still verify and are
+# re-hashed with the active policy on the user's next sign-in.
+# 'fast' (MD5) is for local seeding only and requires DEBUG.
+PASSWORD_HASHER_POLICIES = {
+    'pbkdf2': 'accounts.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'accounts.hashers.TunedScryptPasswordHasher',
+    'argon2': 'accounts.hashers.TunedArgon2PasswordHasher',  # requires argon2-cffi
+    'fast': 'django.contrib.auth.hashers.MD5PasswordHasher',
+}
+PASSWORD_HASH_POLICY = config('PASSWORD_HASH_POLICY', default='pbkdf2')
+SEED_PASSWORD_HASH_POLICY = config('SEED_PASSWORD_HASH_POLICY', default=PASSWORD_HASH_POLICY)
+
+for _policy in (PASSWORD_HASH_POLICY, SEED_PASSWORD_HASH_POLICY):
+    if _policy not in PASSWORD_HASHER_POLICIES:
+        raise ImproperlyConfigured(f"Unknown password hash policy '{_policy}'")
+    if _policy == 'fast' and not DEBUG:
+        raise ImproperlyConfigured("The 'fast' password hash policy is only allowed with DEBUG=True")
+
+PASSWORD_HASHERS = [PASSWORD_HASHER_POLICIES[PASSWORD_HASH_POLICY]] + [
+    hasher for policy, hasher in PASSWORD_HASHER_POLICIES.items()
+    if policy != PASSWORD_HASH_POLICY and (policy != 'fast' or DEBUG)
+] + [
+    # Legacy Django hashers, verify-only
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+
+# Work factors for the tuned hashers (Django defaults when unset)
+_optional_int = lambda value: int(value) if value else None
+PASSWORD_HASHER_PARAMS = {
+    'pbkdf2_iterations': config('PBKDF2_ITERATIONS', default=None, cast=_optional_int),
+    'scrypt_work_factor': config('SCRYPT_WORK_FACTOR', default=None, cast=_optional_int),
+    'argon2_time_cost': config('ARGON2_TIME_COST', default=None, cast=_optional_int),
+    'argon2_memory_cost': config('ARGON2_MEMORY_COST', default=None, cast=_optional_int),
+    'argon2_parallelism': config('ARGON2_PARALLELISM', default=None, cast=_optional_int),
+}
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -97,11 +137,14 @@ CORS_ALLOWED_ORIGINS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.StatelessJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    'DEFAULT_PAGINATION_CLASS': 'dayflow_core.pagination.DefaultCursorPagination',
+    'PAGE_SIZE': config('API_PAGE_SIZE', default=50, cast=int),
+    'MAX_PAGE_SIZE': config('API_MAX_PAGE_SIZE', default=200, cast=int),
 }
 
 SIMPLE_JWT = {
@@ -109,7 +152,7 @@ SIMPLE_JWT = {
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'ROTATE_REFRESH_TOKENS': False,
     'BLACKLIST_AFTER_ROTATION': False,
-    'UPDATE_LAST_LOGIN': True,
+    'UPDATE_LAST_LOGIN': False,  # Recorded by accounts.last_login instead
     'ALGORITHM': 'HS256',
     'SIGNING_KEY': SECRET_KEY,
     'AUTH_HEADER_TYPES': ('Bearer',),
@@ -118,3 +161,47 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
+
+# Build the user from token claims on read-only requests instead of
+# loading it from the database (see accounts.authentication)
+JWT_STATELESS_READS = config('JWT_STATELESS_READS', default=True, cast=bool)
+
+# Cache backend: in-process locmem by default. Use a shared backend such as
+# django.core.cache.backends.redis.RedisCache (CACHE_LOCATION=redis://...)
+# when running several processes, so invalidations reach all of them.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='dayflow'),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+    }
+}
+if CACHES['default']['BACKEND'].endswith('LocMemCache'):
+    CACHES['default']['OPTIONS'] = {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=10000, cast=int)}
+
+# Cached GET responses with ETag support (see dayflow_core.response_cache)
+RESPONSE_CACHE = {
+    'ENABLED': config('RESPONSE_CACHE_ENABLED', default=True, cast=bool),
+    'CACHE_ALIAS': 'default',
+    'TIMEOUT': config('RESPONSE_CACHE_TIMEOUT', default=60, cast=int),
+}
+
+# Cache of authenticated users (see accounts.user_cache). CACHE_ALIAS names
+# the shared level; point it at a Redis cache when running several processes.
+USER_CACHE = {
+    'ENABLED': config('USER_CACHE_ENABLED', default=False, cast=bool),
+    'CACHE_ALIAS': config('USER_CACHE_ALIAS', default='default'),
+    'LOCAL_TTL': config('USER_CACHE_LOCAL_TTL', default=5, cast=int),
+    'SHARED_TTL': config('USER_CACHE_SHARED_TTL', default=60, cast=int),
+    'MAX_ENTRIES': config('USER_CACHE_MAX_ENTRIES', default=1024, cast=int),
+}
+
+# Sign-in last_login writes (see accounts.last_login): 'buffered' flushes
+# in batches every FLUSH_INTERVAL seconds, 'sync' writes per sign-in, 'off'
+LAST_LOGIN = {
+    'MODE': config('LAST_LOGIN_MODE', default='buffered'),
+    'FLUSH_INTERVAL': config('LAST_LOGIN_FLUSH_INTERVAL', default=30, cast=int),
+}
+
+if LAST_LOGIN['MODE'] not in ('buffered', 'sync', 'off'):
+    raise ImproperlyConfigured(f"Unknown LAST_LOGIN_MODE '{LAST_LOGIN['MODE']}'")
@@ -0,0 +1,130 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.models import User
+from dayflow_core.response_cache import cache_response, invalidate_all_responses, invalidate_user_responses
+
+
+def create_user(index, role='EMPLOYEE'):
+    return User.objects.create_user(
+        email=f'user{index}@example.com',
+        password='pass12345',
+        company_name='Odoo',
+        full_name=f'User {index}',
+        phone='1234567890',
+        role=role
+    )
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': True, 'CACHE_ALIAS': 'default', 'TIMEOUT': 60})
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.calls = []
+
+        @cache_response('test-resource', owner_kwarg='user_id')
+        def view(request, user_id):
+            self.calls.append((request.user.pk, request.user.role, user_id))
+            return Response({'viewer': str(request.user.pk), 'role': request.user.role, 'owner': str(user_id)})
+
+        self.view = view
+        self.owner = create_user(1)
+        self.admin = create_user(2, role='ADMIN')
+        self.hr = create_user(3, role='HR')
+
+    def get(self, viewer, owner=None):
+        request = APIRequestFactory().get('/')
+        request.user = viewer
+        response = self.view(request, user_id=(owner or self.owner).pk)
+        return response.data
+
+    def test_repeated_read_is_served_from_cache(self):
+        first = self.get(self.admin)
+        self.assertEqual(self.get(self.admin), first)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_entries_are_per_viewer(self):
+        self.get(self.admin)
+        data = self.get(self.hr)
+        self.assertEqual(data['viewer'], str(self.hr.pk))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_entries_are_per_role(self):
+        self.get(self.admin)
+        # Same user after a demotion
+        self.admin.role = 'EMPLOYEE'
+        data = self.get(self.admin)
+        self.assertEqual(data['role'], 'EMPLOYEE')
+        self.assertEqual(len(self.calls), 2)
+
+    def test_entries_are_per_owner(self):
+        other = create_user(4)
+        self.get(self.admin)
+        data = self.get(self.admin, owner=other)
+        self.assertEqual(data['owner'], str(other.pk))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_owner_generation_bump_expires_entries(self):
+        self.get(self.admin)
+        self.get(self.hr)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_user_responses(self.owner.pk)
+        self.get(self.admin)
+        self.get(self.hr)
+        self.assertEqual(len(self.calls), 4)
+
+    def test_other_owner_bump_keeps_entries(self):
+        self.get(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_user_responses(self.admin.pk)
+        self.get(self.admin)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_global_generation_bump_expires_entries(self):
+        self.get(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_all_responses()
+        self.get(self.admin)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_bump_waits_for_commit(self):
+        self.get(self.admin)
+        with self.captureOnCommitCallbacks(execute=False):
+            invalidate_user_responses(self.owner.pk)
+            self.get(self.admin)
+        self.assertEqual(len(self.calls), 1)
+
+
+@override_settings(RESPONSE_CACHE={'ENABLED': True, 'CACHE_ALIAS': 'default', 'TIMEOUT': 60})
+class CachedEndpointTests(TestCase):
+    url = '/api/profile/me/full/'
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_profile_is_not_shared_between_users(self):
+        first, second = create_user(1), create_user(2)
+        self.assertEqual(self.client_for(first).get(self.url).data['email'], first.email)
+        self.assertEqual(self.client_for(second).get(self.url).data['email'], second.email)
+
+    def test_write_expires_cached_profile(self):
+        user = create_user(1)
+        client = self.client_for(user)
+        etag = client.get(self.url)['ETag']
+        self.assertEqual(client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post('/api/profile/me/skills/', {'name': 'Python'})
+        self.assertEqual(response.status_code, 201)
+
+        response = client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([skill['name'] for skill in response.data['skills']], ['Python'])
@@ -10,6 +10,7 @@ urlpatterns = [
     path('api/attendance/', include('attendance.urls')),
     path('api/profile/', include('profiles.urls')),
     path('api/timeoff/', include('timeoff.urls')),
+    path('api/payroll/', include('payroll.urls')),
 ]
 
 if settings.DEBUG:
@@ -1,8 +1,21 @@
 from rest_framework import serializers
-from django.utils import timezone
 from accounts.models import User
 from employees.models import EmployeeProfile
 from attendance.models import AttendanceRecord
+from attendance.utils import today_status_icon
+
+
+def resolve_status_icon(profile):
+    """
+    Read the status_icon annotation set by the employee views.
+    Falls back to a single annotated lookup for un-annotated instances.
+    """
+    if hasattr(profile, 'status_icon'):
+        return profile.status_icon
+    return EmployeeProfile.objects.filter(pk=profile.pk).annotate(
+        status_icon=today_status_icon()
+    ).values_list('status_icon', flat=True).first() or 'ABSENT'
+
 
 class EmployeeCardSerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source='user.id', read_only=True)
@@ -17,26 +30,10 @@ class EmployeeCardSerializer(serializers.ModelSerializer):
 
     def get_status_icon(self, obj):
         """
-        Determine status based on today's attendance record
+        Today's status, annotated onto the queryset by the view
         Returns: PRESENT (checked in), ON_LEAVE, or ABSENT
         """
-        today = timezone.now().date()
-        record = AttendanceRecord.objects.filter(
-            user=obj.user,
-            check_in_time__date=today
-        ).first()
-
-        if record:
-            if record.is_on_leave:
-                return 'ON_LEAVE'
-            # If checked in but not checked out yet, show PRESENT
-            if record.check_out_time is None:
-                return 'PRESENT'
-            # If already checked out, show ABSENT (not currently in office)
-            return 'ABSENT'
-        
-        # No record for today means absent
-        return 'ABSENT'
+        return resolve_status_icon(obj)
 
 class EmployeeDetailSerializer(serializers.ModelSerializer):
     id = serializers.UUIDField(source='user.id', read_only=True)
@@ -59,22 +56,7 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
 
     def get_status_icon(self, obj):
         """Get current status for today"""
-        today = timezone.now().date()
-        record = AttendanceRecord.objects.filter(
-            user=obj.user,
-            check_in_time__date=today
-        ).first()
-
-        if record:
-            if record.is_on_leave:
-                return 'ON_LEAVE'
-            # If checked in but not checked out yet, show PRESENT
-            if record.check_out_time is None:
-                return 'PRESENT'
-            # If already checked out, show ABSENT (not currently in office)
-            return 'ABSENT'
-        
-        return 'ABSENT'
+        return resolve_status_icon(obj)
 
     def get_recent_attendance(self, obj):
         """Get last 5 attendance records"""
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts.models import User
+from attendance.models import AttendanceRecord
+from dayflow_core.response_cache import invalidate_user_responses
+from employees.models import EmployeeProfile
+
+
+@receiver([post_save, post_delete], sender=EmployeeProfile)
+@receiver([post_save, post_delete], sender=AttendanceRecord)
+def employee_detail_changed(sender, instance, **kwargs):
+    """Expire cached employee details (attendance drives the status icon)"""
+    invalidate_user_responses(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    invalidate_user_responses(instance.pk)
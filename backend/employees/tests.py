@@ -0,0 +1,39 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from accounts.models import User
+from employees.models import EmployeeProfile
+
+
+def create_user(index, role='EMPLOYEE'):
+    user = User.objects.create_user(
+        email=f'user{index}@example.com',
+        password='pass12345',
+        company_name='Odoo',
+        full_name=f'User {index}',
+        phone='1234567890',
+        role=role
+    )
+    EmployeeProfile.objects.get_or_create(user=user)
+    return user
+
+
+class EmployeeListQueryTests(TestCase):
+    """The employee list must not issue queries per employee"""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(create_user('admin', role='ADMIN'))
+
+    def test_list_query_count_is_independent_of_headcount(self):
+        for index in range(3):
+            create_user(index)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/employees/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 4)
+
+        for index in range(3, 15):
+            create_user(index)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/employees/')
+        self.assertEqual(len(response.data['results']), 16)
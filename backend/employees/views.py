@@ -1,21 +1,29 @@
 from rest_framework import status, generics
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q
+from django.db.models import F, Q
+from django.utils.decorators import method_decorator
 from employees.models import EmployeeProfile
+from attendance.utils import today_status_icon
+from dayflow_core.pagination import EmployeeProfileCursorPagination
+from dayflow_core.response_cache import cache_response
 from employees.serializers import EmployeeCardSerializer, EmployeeDetailSerializer
 
 class EmployeeListView(generics.ListAPIView):
     """
     GET /api/employees/
     List all employees with optional search
-    Query params: search (filters by name or email)
+    Query params: search (filters by name or email), cursor, page_size
     """
     serializer_class = EmployeeCardSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = EmployeeProfileCursorPagination
 
     def get_queryset(self):
-        queryset = EmployeeProfile.objects.select_related('user').all()
+        queryset = EmployeeProfile.objects.select_related('user').annotate(
+            status_icon=today_status_icon(),
+            date_joined=F('user__date_joined')
+        )
         
         # Everyone can see all employees (for status visibility)
         # Role-based permissions are handled at the action level
@@ -33,6 +41,7 @@ class EmployeeListView(generics.ListAPIView):
         
         return queryset
 
+@method_decorator(cache_response('employee-detail', owner_kwarg='user_id', daily=True), name='get')
 class EmployeeDetailView(generics.RetrieveAPIView):
     """
     GET /api/employees/<uuid:user_id>/
@@ -43,7 +52,9 @@ class EmployeeDetailView(generics.RetrieveAPIView):
     lookup_field = 'user_id'
 
     def get_queryset(self):
-        queryset = EmployeeProfile.objects.select_related('user').all()
+        queryset = EmployeeProfile.objects.select_related('user').annotate(
+            status_icon=today_status_icon()
+        )
         
         # Regular employees can only view their own profile
         if self.request.user.role not in ['ADMIN', 'HR']:
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import PayrollRun, Payslip
+
+@admin.register(PayrollRun)
+class PayrollRunAdmin(admin.ModelAdmin):
+    list_display = ['year', 'month', 'employee_count', 'total_gross', 'total_net', 'attendance_based', 'created_by', 'created_at']
+    list_filter = ['year', 'attendance_based']
+    readonly_fields = ['id', 'created_at']
+
+@admin.register(Payslip)
+class PayslipAdmin(admin.ModelAdmin):
+    list_display = ['user', 'run', 'payable_days', 'gross_salary', 'total_deductions', 'net_salary']
+    list_filter = ['run__year', 'run__month']
+    search_fields = ['user__full_name', 'user__email', 'user__login_id']
+    list_select_related = ['user', 'run']
+    readonly_fields = ['id', 'created_at']
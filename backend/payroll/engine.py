@@ -0,0 +1,179 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count
+
+from attendance.models import AttendanceRecord
+from attendance.utils import month_bounds
+from payroll.models import PayrollRun, Payslip
+from profiles.models import SalaryStructure
+from profiles.salary import HUNDRED, SALARY_INPUT_FIELDS, cents, salary_components
+from timeoff.models import TimeOffRequest
+from timeoff.workdays import WorkingDayCalculator
+
+PAYSLIP_BATCH_SIZE = 1000
+
+# Earnings prorated by payable days; tax deductions are charged in full
+PRORATED_EARNINGS = [
+    ('basic_salary', 'basic_salary'),
+    ('hra', 'hra_calculated'),
+    ('hra_fixed', 'hra_fixed'),
+    ('standard_allowance', 'standard_allowance_calculated'),
+    ('performance_bonus', 'performance_bonus'),
+    ('leave_travel_allowance', 'leave_travel_allowance'),
+]
+
+
+class PayrollRunExists(Exception):
+    pass
+
+
+def present_days_by_user(first_day, last_day):
+    """{user_id: days with a PRESENT record} in one grouped query"""
+    rows = AttendanceRecord.objects.filter(
+        work_date__range=(first_day, last_day),
+        status='PRESENT'
+    ).values('user_id').annotate(days=Count('work_date', distinct=True)).order_by()
+    return {row['user_id']: Decimal(row['days']) for row in rows}
+
+
+def leave_days_by_user(first_day, last_day):
+    """
+    {user_id: (paid_days, unpaid_days)} of approved leave falling in the
+    period. Requests crossing the period boundary count the share of their
+    allocation_days given by the working days inside it, per the
+    employee's work calendar.
+    """
+    paid = defaultdict(Decimal)
+    unpaid = defaultdict(Decimal)
+    calculator = WorkingDayCalculator()
+    requests = TimeOffRequest.objects.filter(
+        status='APPROVED',
+        start_date__lte=last_day,
+        end_date__gte=first_day
+    ).values_list(
+        'employee_id', 'employee__company_name', 'timeoff_type__code',
+        'start_date', 'end_date', 'start_half_day', 'end_half_day', 'allocation_days'
+    )
+
+    for user_id, company_name, code, start, end, start_half, end_half, allocation_days in requests:
+        if first_day <= start and end <= last_day:
+            days = allocation_days
+        else:
+            total = calculator.working_days(start, end, company_name, start_half, end_half)
+            inside = calculator.working_days(
+                max(start, first_day), min(end, last_day), company_name,
+                start_half and start >= first_day, end_half and end <= last_day
+            )
+            days = (allocation_days * inside / total).quantize(Decimal('0.1')) if total else Decimal('0')
+        (unpaid if code == 'UNPAID' else paid)[user_id] += days
+
+    return {
+        user_id: (paid[user_id], unpaid[user_id])
+        for user_id in paid.keys() | unpaid.keys()
+    }
+
+
+def compute_payslip(structure, present_days, paid_leave_days, unpaid_leave_days, attendance_based=True):
+    """
+    Payslip field values for one SalaryStructure values() row.
+
+    Payable days are the days present plus paid leave (attendance_based),
+    or the working days minus unpaid leave, capped to the month's working
+    days. Earnings are prorated by payable/working days, PF follows the
+    prorated basic, and professional/income tax are deducted in full.
+    Net pay is never negative.
+    """
+    working_days = Decimal(structure['monthly_working_days'])
+    if attendance_based:
+        payable_days = present_days + paid_leave_days
+    else:
+        payable_days = working_days - unpaid_leave_days
+    payable_days = max(Decimal('0'), min(payable_days, working_days))
+    ratio = payable_days / working_days if working_days > 0 else Decimal('1')
+
+    full_month = {**structure, **salary_components(**structure)}
+    slip = {
+        field: cents(full_month[source] * ratio)
+        for field, source in PRORATED_EARNINGS
+    }
+    slip['gross_salary'] = sum(slip[field] for field, _ in PRORATED_EARNINGS)
+    slip['pf_contribution'] = cents(slip['basic_salary'] * structure['pf_percentage'] / HUNDRED)
+    slip['professional_tax'] = structure['professional_tax']
+    slip['income_tax'] = structure['income_tax']
+    slip['total_deductions'] = slip['pf_contribution'] + slip['professional_tax'] + slip['income_tax']
+    slip['net_salary'] = max(slip['gross_salary'] - slip['total_deductions'], Decimal('0.00'))
+
+    return {
+        'working_days': working_days,
+        'present_days': present_days,
+        'paid_leave_days': paid_leave_days,
+        'unpaid_leave_days': unpaid_leave_days,
+        'payable_days': payable_days,
+        **slip,
+    }
+
+
+def run_payroll(year, month, created_by=None, attendance_based=True, replace=False):
+    """
+    Close payroll for a month: compute a payslip for every active user with
+    a salary structure and store the run with bulk_create.
+
+    Structures, attendance and leave are each read in a single query, then
+    every component is computed once per employee in exact Decimal
+    arithmetic. Raises PayrollRunExists if the month was already run,
+    unless replace=True, which recomputes it.
+    """
+    first_day, last_day = month_bounds(year, month)
+    structures = list(
+        SalaryStructure.objects.filter(user__is_active=True).values(
+            'user_id', 'monthly_working_days', *SALARY_INPUT_FIELDS
+        )
+    )
+    present = present_days_by_user(first_day, last_day)
+    leave = leave_days_by_user(first_day, last_day)
+    no_leave = (Decimal('0'), Decimal('0'))
+
+    with transaction.atomic():
+        existing = PayrollRun.objects.select_for_update().filter(year=year, month=month)
+        if existing.exists():
+            if not replace:
+                raise PayrollRunExists(f'Payroll for {year}-{month:02d} has already been run.')
+            existing.delete()
+
+        try:
+            run = PayrollRun.objects.create(
+                year=year,
+                month=month,
+                attendance_based=attendance_based,
+                created_by=created_by
+            )
+        except IntegrityError:
+            # Another close for the same month committed first
+            raise PayrollRunExists(f'Payroll for {year}-{month:02d} has already been run.')
+
+        payslips = []
+        for structure in structures:
+            user_id = structure['user_id']
+            paid_leave_days, unpaid_leave_days = leave.get(user_id, no_leave)
+            payslips.append(Payslip(
+                run=run,
+                user_id=user_id,
+                **compute_payslip(
+                    structure,
+                    present.get(user_id, Decimal('0')),
+                    paid_leave_days,
+                    unpaid_leave_days,
+                    attendance_based
+                )
+            ))
+        Payslip.objects.bulk_create(payslips, batch_size=PAYSLIP_BATCH_SIZE)
+
+        run.employee_count = len(payslips)
+        run.total_gross = sum((slip.gross_salary for slip in payslips), Decimal('0.00'))
+        run.total_deductions = sum((slip.total_deductions for slip in payslips), Decimal('0.00'))
+        run.total_net = sum((slip.net_salary for slip in payslips), Decimal('0.00'))
+        run.save(update_fields=['employee_count', 'total_gross', 'total_deductions', 'total_net'])
+
+    return run
@@ -0,0 +1,42 @@
+import time
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from payroll.engine import PayrollRunExists, run_payroll
+
+class Command(BaseCommand):
+    help = 'Close payroll for a month and store a payslip per employee'
+
+    def add_arguments(self, parser):
+        today = date.today()
+        parser.add_argument('--year', type=int, default=today.year, help='Year (default: current)')
+        parser.add_argument('--month', type=int, default=today.month, help='Month 1-12 (default: current)')
+        parser.add_argument(
+            '--no-attendance',
+            action='store_true',
+            help='Pay full working days minus unpaid leave instead of days present',
+        )
+        parser.add_argument(
+            '--replace',
+            action='store_true',
+            help='Recompute the month if it has already been run',
+        )
+
+    def handle(self, *args, **kwargs):
+        if not 1 <= kwargs['month'] <= 12:
+            raise CommandError('--month must be between 1 and 12.')
+
+        started = time.monotonic()
+        try:
+            run = run_payroll(
+                kwargs['year'],
+                kwargs['month'],
+                attendance_based=not kwargs['no_attendance'],
+                replace=kwargs['replace']
+            )
+        except PayrollRunExists as exc:
+            raise CommandError(f'{exc} Use --replace to recompute it.')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{run}: {run.employee_count} payslips, gross {run.total_gross:,.2f}, '
+            f'net {run.total_net:,.2f} in {time.monotonic() - started:.2f}s'
+        ))
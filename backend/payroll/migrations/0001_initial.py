@@ -0,0 +1,75 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:59
+
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('year', models.IntegerField()),
+                ('month', models.IntegerField()),
+                ('attendance_based', models.BooleanField(default=True)),
+                ('employee_count', models.PositiveIntegerField(default=0)),
+                ('total_gross', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('total_deductions', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('total_net', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payroll_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Payroll Run',
+                'verbose_name_plural': 'Payroll Runs',
+                'db_table': 'payroll_runs',
+                'ordering': ['-year', '-month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Payslip',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('working_days', models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5)),
+                ('present_days', models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5)),
+                ('paid_leave_days', models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5)),
+                ('unpaid_leave_days', models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5)),
+                ('payable_days', models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5)),
+                ('basic_salary', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('hra', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('hra_fixed', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('standard_allowance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('performance_bonus', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('leave_travel_allowance', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('gross_salary', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('pf_contribution', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('professional_tax', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('income_tax', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('total_deductions', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('net_salary', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payslips', to='payroll.payrollrun')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payslips', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Payslip',
+                'verbose_name_plural': 'Payslips',
+                'db_table': 'payslips',
+                'ordering': ['run', 'user__login_id'],
+                'indexes': [models.Index(fields=['user', 'run'], name='payslips_user_id_50be52_idx')],
+                'unique_together': {('run', 'user')},
+            },
+        ),
+    ]
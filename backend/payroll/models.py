@@ -0,0 +1,91 @@
+import uuid
+from decimal import Decimal
+from django.db import models
+from django.conf import settings
+
+MONEY = {'max_digits': 12, 'decimal_places': 2, 'default': Decimal('0.00')}
+DAYS = {'max_digits': 5, 'decimal_places': 1, 'default': Decimal('0.0')}
+
+
+class PayrollRun(models.Model):
+    """
+    Monthly payroll close: one payslip per employee with a salary structure
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    year = models.IntegerField()
+    month = models.IntegerField()
+    attendance_based = models.BooleanField(default=True)  # Prorate by days present
+    employee_count = models.PositiveIntegerField(default=0)
+    total_gross = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    total_deductions = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    total_net = models.DecimalField(max_digits=14, decimal_places=2, default=Decimal('0.00'))
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='payroll_runs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'payroll_runs'
+        verbose_name = 'Payroll Run'
+        verbose_name_plural = 'Payroll Runs'
+        ordering = ['-year', '-month']
+        unique_together = ['year', 'month']
+
+    def __str__(self):
+        return f"Payroll {self.year}-{self.month:02d}"
+
+
+class Payslip(models.Model):
+    """
+    One employee's pay for a payroll run, with the salary structure as it
+    was at the close and the attendance/leave days it was prorated by
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    run = models.ForeignKey(PayrollRun, on_delete=models.CASCADE, related_name='payslips')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='payslips'
+    )
+
+    # Days
+    working_days = models.DecimalField(**DAYS)
+    present_days = models.DecimalField(**DAYS)
+    paid_leave_days = models.DecimalField(**DAYS)
+    unpaid_leave_days = models.DecimalField(**DAYS)
+    payable_days = models.DecimalField(**DAYS)
+
+    # Earnings (prorated)
+    basic_salary = models.DecimalField(**MONEY)
+    hra = models.DecimalField(**MONEY)
+    hra_fixed = models.DecimalField(**MONEY)
+    standard_allowance = models.DecimalField(**MONEY)
+    performance_bonus = models.DecimalField(**MONEY)
+    leave_travel_allowance = models.DecimalField(**MONEY)
+    gross_salary = models.DecimalField(**MONEY)
+
+    # Deductions
+    pf_contribution = models.DecimalField(**MONEY)
+    professional_tax = models.DecimalField(**MONEY)
+    income_tax = models.DecimalField(**MONEY)
+    total_deductions = models.DecimalField(**MONEY)
+
+    net_salary = models.DecimalField(**MONEY)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'payslips'
+        verbose_name = 'Payslip'
+        verbose_name_plural = 'Payslips'
+        ordering = ['run', 'user__login_id']
+        unique_together = ['run', 'user']
+        indexes = [
+            models.Index(fields=['user', 'run']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.full_name} - {self.run}"
@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from payroll.models import PayrollRun, Payslip
+
+
+class PayrollRunSerializer(serializers.ModelSerializer):
+    created_by_name = serializers.CharField(source='created_by.full_name', read_only=True, default=None)
+
+    class Meta:
+        model = PayrollRun
+        fields = [
+            'id', 'year', 'month', 'attendance_based', 'employee_count',
+            'total_gross', 'total_deductions', 'total_net',
+            'created_by_name', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class PayrollRunCreateSerializer(serializers.Serializer):
+    year = serializers.IntegerField(min_value=2000, max_value=2100)
+    month = serializers.IntegerField(min_value=1, max_value=12)
+    attendance_based = serializers.BooleanField(default=True)
+    replace = serializers.BooleanField(default=False)
+
+
+class PayslipSerializer(serializers.ModelSerializer):
+    employee_id = serializers.UUIDField(source='user_id', read_only=True)
+    employee_name = serializers.CharField(source='user.full_name', read_only=True)
+    login_id = serializers.CharField(source='user.login_id', read_only=True)
+    year = serializers.IntegerField(source='run.year', read_only=True)
+    month = serializers.IntegerField(source='run.month', read_only=True)
+
+    class Meta:
+        model = Payslip
+        fields = [
+            'id', 'employee_id', 'employee_name', 'login_id', 'year', 'month',
+            'working_days', 'present_days', 'paid_leave_days', 'unpaid_leave_days', 'payable_days',
+            'basic_salary', 'hra', 'hra_fixed', 'standard_allowance', 'performance_bonus',
+            'leave_travel_allowance', 'gross_salary',
+            'pf_contribution', 'professional_tax', 'income_tax', 'total_deductions',
+            'net_salary'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,151 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import User
+from attendance.models import AttendanceRecord
+from payroll.engine import PayrollRunExists, leave_days_by_user, run_payroll
+from payroll.models import PayrollRun, Payslip
+from profiles.models import SalaryStructure
+from timeoff.models import TimeOffRequest, TimeOffType
+
+
+def create_user(index, role='EMPLOYEE'):
+    return User.objects.create_user(
+        email=f'user{index}@example.com',
+        password='pass12345',
+        company_name='Odoo',
+        full_name=f'User {index}',
+        phone='1234567890',
+        role=role
+    )
+
+
+def create_structure(user, **fields):
+    # 50% HRA, 50% standard allowance, 12% PF and 200 professional tax by default
+    return SalaryStructure.objects.create(
+        user=user,
+        basic_salary=fields.pop('basic_salary', Decimal('50000.00')),
+        income_tax=fields.pop('income_tax', Decimal('893.94')),
+        monthly_working_days=22,
+        **fields
+    )
+
+
+def mark_present(user, days):
+    for day in days:
+        check_in = timezone.make_aware(datetime.combine(day, time(9)))
+        AttendanceRecord.objects.create(
+            user=user,
+            check_in_time=check_in,
+            check_out_time=check_in + timedelta(hours=9),
+            status='PRESENT'
+        )
+
+
+def approve_leave(user, code, start_date, end_date, days):
+    timeoff_type, _ = TimeOffType.objects.get_or_create(
+        code=code,
+        defaults={'name': code.title(), 'default_annual_allocation_days': Decimal('20.0')}
+    )
+    return TimeOffRequest.objects.create(
+        employee=user,
+        timeoff_type=timeoff_type,
+        start_date=start_date,
+        end_date=end_date,
+        allocation_days=Decimal(days),
+        status='APPROVED',
+        requested_by=user
+    )
+
+
+class RunPayrollTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user(1)
+        self.structure = create_structure(self.user)
+
+    def payslip(self):
+        return Payslip.objects.get(user=self.user)
+
+    def test_earnings_and_pf_are_prorated_by_days_present(self):
+        # 10 weekdays of March 2026
+        mark_present(self.user, [date(2026, 3, day) for day in (2, 3, 4, 5, 6, 9, 10, 11, 12, 13)])
+        run = run_payroll(2026, 3)
+
+        slip = self.payslip()
+        self.assertEqual(slip.payable_days, Decimal('10.0'))
+        self.assertEqual(slip.basic_salary, Decimal('22727.27'))
+        self.assertEqual(slip.hra, Decimal('11363.64'))
+        self.assertEqual(slip.standard_allowance, Decimal('11363.64'))
+        self.assertEqual(slip.gross_salary, Decimal('45454.55'))
+        self.assertEqual(slip.pf_contribution, Decimal('2727.27'))
+        self.assertEqual(slip.total_deductions, Decimal('3821.21'))
+        self.assertEqual(slip.net_salary, Decimal('41633.34'))
+        self.assertEqual((run.employee_count, run.total_net), (1, Decimal('41633.34')))
+
+    def test_paid_leave_counts_as_payable(self):
+        mark_present(self.user, [date(2026, 3, day) for day in (2, 3, 4, 5, 6, 9, 10, 11)])
+        approve_leave(self.user, 'PAID', date(2026, 3, 12), date(2026, 3, 13), '2.0')
+        run_payroll(2026, 3)
+        slip = self.payslip()
+        self.assertEqual((slip.paid_leave_days, slip.payable_days), (Decimal('2.0'), Decimal('10.0')))
+        self.assertEqual(slip.net_salary, Decimal('41633.34'))
+
+    def test_without_attendance_only_unpaid_leave_is_deducted(self):
+        approve_leave(self.user, 'UNPAID', date(2026, 3, 2), date(2026, 3, 3), '2.0')
+        run_payroll(2026, 3, attendance_based=False)
+
+        slip = self.payslip()
+        self.assertEqual(slip.present_days, Decimal('0.0'))
+        self.assertEqual(slip.unpaid_leave_days, Decimal('2.0'))
+        self.assertEqual(slip.payable_days, Decimal('20.0'))
+        # 20/22 of 50000
+        self.assertEqual(slip.basic_salary, Decimal('45454.55'))
+        self.assertEqual(slip.pf_contribution, Decimal('5454.55'))
+
+    def test_second_run_for_month_is_rejected(self):
+        run_payroll(2026, 3)
+        with self.assertRaises(PayrollRunExists):
+            run_payroll(2026, 3)
+        self.assertEqual(PayrollRun.objects.count(), 1)
+
+    def test_replace_recomputes_run(self):
+        first = run_payroll(2026, 3, attendance_based=False)
+        self.assertEqual(self.payslip().basic_salary, Decimal('50000.00'))
+
+        SalaryStructure.objects.filter(pk=self.structure.pk).update(basic_salary=Decimal('44000.00'))
+        second = run_payroll(2026, 3, attendance_based=False, replace=True)
+
+        self.assertFalse(PayrollRun.objects.filter(pk=first.pk).exists())
+        self.assertEqual(list(PayrollRun.objects.values_list('pk', flat=True)), [second.pk])
+        self.assertEqual(self.payslip().basic_salary, Decimal('44000.00'))
+
+
+class LeaveDaysTests(TestCase):
+
+    def test_leave_across_month_boundary_is_split_by_working_days(self):
+        user = create_user(1)
+        # Monday 30 March to Friday 3 April: 2 working days in March, 3 in April
+        approve_leave(user, 'UNPAID', date(2026, 3, 30), date(2026, 4, 3), '5.0')
+
+        self.assertEqual(
+            leave_days_by_user(date(2026, 3, 1), date(2026, 3, 31)),
+            {user.pk: (Decimal('0'), Decimal('2.0'))}
+        )
+        self.assertEqual(
+            leave_days_by_user(date(2026, 4, 1), date(2026, 4, 30)),
+            {user.pk: (Decimal('0'), Decimal('3.0'))}
+        )
+
+    def test_weekend_days_do_not_shift_the_split(self):
+        user = create_user(1)
+        # Friday 27 March to Wednesday 1 April: 3 working days in March, 1 in April
+        approve_leave(user, 'PAID', date(2026, 3, 27), date(2026, 4, 1), '4.0')
+
+        self.assertEqual(
+            leave_days_by_user(date(2026, 3, 1), date(2026, 3, 31)),
+            {user.pk: (Decimal('3.0'), Decimal('0'))}
+        )
@@ -0,0 +1,11 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    # Employee endpoints
+    path('me/', views.MyPayslipsView.as_view(), name='my_payslips'),
+    
+    # Admin/HR endpoints
+    path('runs/', views.PayrollRunListCreateView.as_view(), name='payroll_runs'),
+    path('runs/<uuid:run_id>/payslips/', views.PayrollRunPayslipsView.as_view(), name='payroll_run_payslips'),
+]
@@ -0,0 +1,64 @@
+from rest_framework import status, generics
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+
+from payroll.engine import PayrollRunExists, run_payroll
+from payroll.models import PayrollRun, Payslip
+from payroll.serializers import PayrollRunSerializer, PayrollRunCreateSerializer, PayslipSerializer
+from timeoff.permissions import IsAdminOrHR
+
+
+class PayrollRunListCreateView(APIView):
+    """
+    GET /api/payroll/runs/
+    List payroll runs, newest month first (Admin/HR only)
+
+    POST /api/payroll/runs/
+    Close payroll for a month: {"year", "month", "attendance_based", "replace"}
+    """
+    permission_classes = [IsAuthenticated, IsAdminOrHR]
+
+    def get(self, request):
+        runs = PayrollRun.objects.select_related('created_by')
+        return Response(PayrollRunSerializer(runs, many=True).data)
+
+    def post(self, request):
+        serializer = PayrollRunCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            run = run_payroll(created_by=request.user, **serializer.validated_data)
+        except PayrollRunExists as exc:
+            return Response(
+                {'error': 'PAYROLL_ALREADY_RUN', 'detail': f'{exc} Pass "replace": true to recompute it.'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        return Response(PayrollRunSerializer(run).data, status=status.HTTP_201_CREATED)
+
+
+class PayrollRunPayslipsView(generics.ListAPIView):
+    """
+    GET /api/payroll/runs/<run_id>/payslips/
+    Payslips of a payroll run (Admin/HR only)
+    Cursor paginated. Query params: cursor, page_size
+    """
+    serializer_class = PayslipSerializer
+    permission_classes = [IsAuthenticated, IsAdminOrHR]
+
+    def get_queryset(self):
+        return Payslip.objects.filter(run_id=self.kwargs['run_id']).select_related('user', 'run')
+
+
+class MyPayslipsView(generics.ListAPIView):
+    """
+    GET /api/payroll/me/
+    The logged-in employee's payslips, newest first
+    """
+    serializer_class = PayslipSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Payslip.objects.filter(user=self.request.user).select_related('user', 'run')
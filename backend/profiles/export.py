@@ -0,0 +1,82 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from accounts.models import User
+from profiles.serializers import (
+    BankDetailSerializer, FullProfileSerializer, ProfileDetailSerializer,
+    ResumeDetailSerializer, SalaryStructureSerializer
+)
+from profiles.utils import full_profile_queryset
+
+EXPORT_FORMATS = ['json', 'csv']
+EXPORT_CHUNK_SIZE = 500
+
+USER_COLUMNS = ['id', 'full_name', 'login_id', 'email', 'phone', 'company_name', 'role']
+
+# Flattened CSV columns per nested section of the full profile
+SECTION_COLUMNS = {
+    'profile': ProfileDetailSerializer.Meta.fields,
+    'resume': ResumeDetailSerializer.Meta.fields,
+    'bank': BankDetailSerializer.Meta.fields,
+    'salary': SalaryStructureSerializer.Meta.fields,
+}
+
+
+def export_users(role=None, department=None, search=None):
+    """Users selected for export, with every profile section loaded"""
+    users = User.objects.all()
+    if role:
+        users = users.filter(role=role)
+    if department:
+        users = users.filter(profile_detail__department__iexact=department)
+    if search:
+        users = users.filter(Q(full_name__icontains=search) | Q(email__icontains=search))
+    return full_profile_queryset(users).order_by('login_id')
+
+
+def iter_profiles(users, context):
+    """
+    Serialize full profiles one at a time. The users are read in chunks
+    of EXPORT_CHUNK_SIZE, each with its own prefetch queries, so memory use
+    does not grow with the number of users.
+    """
+    for user in users.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield FullProfileSerializer(user, context=context).data
+
+
+def stream_json(profiles):
+    """Yield a JSON array of profiles piece by piece"""
+    yield '['
+    for index, profile in enumerate(profiles):
+        yield (',\n' if index else '\n') + json.dumps(profile, cls=DjangoJSONEncoder)
+    yield '\n]\n'
+
+
+class _Echo:
+    """File-like object handing csv.writer rows straight back"""
+    def write(self, value):
+        return value
+
+
+def stream_csv(profiles):
+    """Yield CSV lines: one row per user, sections flattened as section_field"""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(
+        USER_COLUMNS
+        + [f'{section}_{field}' for section, fields in SECTION_COLUMNS.items() for field in fields]
+        + ['skills', 'certifications']
+    )
+    for profile in profiles:
+        row = [profile[column] for column in USER_COLUMNS]
+        for section, fields in SECTION_COLUMNS.items():
+            values = profile.get(section) or {}
+            row.extend(values.get(field, '') for field in fields)
+        row.append('; '.join(f"{skill['name']} ({skill['level']})" for skill in profile['skills']))
+        row.append('; '.join(
+            f"{cert['title']} - {cert['issuer']}" if cert['issuer'] else cert['title']
+            for cert in profile['certifications']
+        ))
+        yield writer.writerow(row)
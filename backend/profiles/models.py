@@ -1,6 +1,10 @@
 import uuid
+from decimal import Decimal
 from django.db import models
 from django.conf import settings
+from profiles.salary import (
+    SALARY_INPUT_FIELDS, SalaryComponent, salary_component_expressions, salary_components
+)
 
 class ProfileDetail(models.Model):
     """
@@ -161,6 +165,18 @@ class BankDetail(models.Model):
         return f"Bank: {self.user.full_name}"
 
 
+class SalaryStructureQuerySet(models.QuerySet):
+    def with_components(self):
+        """
+        Annotate the calculated components (gross_salary, net_salary, ...)
+        so they can be filtered, ordered and aggregated in SQL.
+        """
+        queryset = self
+        for name, expression in salary_component_expressions():
+            queryset = queryset.annotate(**{name: expression})
+        return queryset
+
+
 class SalaryStructure(models.Model):
     """
     Salary structure with auto-calculated components
@@ -195,6 +211,8 @@ class SalaryStructure(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SalaryStructureQuerySet.as_manager()
+
     class Meta:
         db_table = 'salary_structures'
         verbose_name = 'Salary Structure'
@@ -204,47 +222,15 @@ class SalaryStructure(models.Model):
         return f"Salary: {self.user.full_name}"
     
     @property
-    def hra_calculated(self):
-        """Calculate HRA based on percentage of basic salary"""
-        return float(self.basic_salary) * float(self.hra_percentage) / 100
-    
-    @property
-    def standard_allowance_calculated(self):
-        """Calculate standard allowance based on percentage of basic salary"""
-        return float(self.basic_salary) * float(self.standard_allowance_percentage) / 100
-    
-    @property
-    def gross_salary(self):
-        """Calculate gross salary"""
-        return (
-            float(self.basic_salary) +
-            self.hra_calculated +
-            float(self.hra_fixed) +
-            self.standard_allowance_calculated +
-            float(self.performance_bonus) +
-            float(self.leave_travel_allowance)
-        )
-    
-    @property
-    def pf_contribution(self):
-        """Calculate PF contribution"""
-        return float(self.basic_salary) * float(self.pf_percentage) / 100
-    
-    @property
-    def total_deductions(self):
-        """Calculate total deductions"""
-        return (
-            self.pf_contribution +
-            float(self.professional_tax) +
-            float(self.income_tax)
-        )
-    
-    @property
-    def net_salary(self):
-        """Calculate net take-home salary"""
-        return self.gross_salary - self.total_deductions
-    
-    @property
-    def annual_salary(self):
-        """Calculate annual salary"""
-        return self.net_salary * 12
+    def components(self):
+        """All calculated components as exact Decimals (see profiles.salary)"""
+        return salary_components(**{field: Decimal(str(getattr(self, field))) for field in SALARY_INPUT_FIELDS})
+    
+    # Calculated components; annotated by SalaryStructure.objects.with_components()
+    hra_calculated = SalaryComponent()
+    standard_allowance_calculated = SalaryComponent()
+    gross_salary = SalaryComponent()
+    pf_contribution = SalaryComponent()
+    total_deductions = SalaryComponent()
+    net_salary = SalaryComponent()
+    annual_salary = SalaryComponent()
@@ -0,0 +1,100 @@
+from decimal import Decimal, ROUND_HALF_UP
+from django.db import models
+from django.db.models import ExpressionWrapper, F, Value
+from django.db.models.functions import Round
+
+CENT = Decimal('0.01')
+HUNDRED = Decimal('100')
+
+# SalaryStructure fields the computed components depend on
+SALARY_INPUT_FIELDS = [
+    'basic_salary', 'hra_percentage', 'hra_fixed', 'standard_allowance_percentage',
+    'performance_bonus', 'leave_travel_allowance', 'pf_percentage',
+    'professional_tax', 'income_tax',
+]
+
+
+def cents(value):
+    """Round a Decimal to whole cents (half up)"""
+    return Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def salary_components(
+    basic_salary, hra_percentage, hra_fixed, standard_allowance_percentage,
+    performance_bonus, leave_travel_allowance, pf_percentage,
+    professional_tax, income_tax, **_
+):
+    """
+    Monthly salary components in exact Decimal arithmetic.
+    Percentage-based amounts are rounded to cents once; the totals are
+    exact sums of the rounded parts. Extra keyword arguments are ignored,
+    so a SalaryStructure values() row can be passed directly.
+    """
+    hra = cents(basic_salary * hra_percentage / HUNDRED)
+    standard_allowance = cents(basic_salary * standard_allowance_percentage / HUNDRED)
+    gross = basic_salary + hra + hra_fixed + standard_allowance + performance_bonus + leave_travel_allowance
+    pf = cents(basic_salary * pf_percentage / HUNDRED)
+    deductions = pf + professional_tax + income_tax
+    net = gross - deductions
+
+    return {
+        'hra_calculated': hra,
+        'standard_allowance_calculated': standard_allowance,
+        'gross_salary': gross,
+        'pf_contribution': pf,
+        'total_deductions': deductions,
+        'net_salary': net,
+        'annual_salary': net * 12,
+    }
+
+
+def salary_component_expressions():
+    """
+    The salary_components() formulas as database expressions, in
+    dependency order, for SalaryStructureQuerySet.with_components().
+    NUMERIC arithmetic keeps them exact; ROUND(x, 2) rounds half away
+    from zero, matching cents() for the non-negative amounts involved.
+    """
+    money = models.DecimalField(max_digits=14, decimal_places=2)
+
+    def percent_of_basic(percentage_field):
+        return Round(
+            ExpressionWrapper(F('basic_salary') * F(percentage_field) / Value(HUNDRED), output_field=money),
+            2
+        )
+
+    return [
+        ('hra_calculated', percent_of_basic('hra_percentage')),
+        ('standard_allowance_calculated', percent_of_basic('standard_allowance_percentage')),
+        ('gross_salary', ExpressionWrapper(
+            F('basic_salary') + F('hra_calculated') + F('hra_fixed')
+            + F('standard_allowance_calculated') + F('performance_bonus') + F('leave_travel_allowance'),
+            output_field=money
+        )),
+        ('pf_contribution', percent_of_basic('pf_percentage')),
+        ('total_deductions', ExpressionWrapper(
+            F('pf_contribution') + F('professional_tax') + F('income_tax'),
+            output_field=money
+        )),
+        ('net_salary', ExpressionWrapper(F('gross_salary') - F('total_deductions'), output_field=money)),
+        ('annual_salary', ExpressionWrapper(F('net_salary') * Value(Decimal('12')), output_field=money)),
+    ]
+
+
+class SalaryComponent:
+    """
+    Computed salary component attribute. Reads the with_components()
+    annotation of the same name when present, otherwise computes it.
+    """
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        if self.name in instance.__dict__:
+            return instance.__dict__[self.name]
+        return instance.components[self.name]
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.name] = value
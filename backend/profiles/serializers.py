@@ -5,6 +5,7 @@ from profiles.models import (
     ResumeDetail, BankDetail, SalaryStructure
 )
 from accounts.models import User
+from profiles.utils import get_section
 
 
 class SkillSerializer(serializers.ModelSerializer):
@@ -102,14 +103,13 @@ class FullProfileSerializer(serializers.Serializer):
     certifications = CertificationSerializer(many=True, read_only=True)
     
     def to_representation(self, instance):
-        """Build complete profile representation"""
+        """
+        Build complete profile representation without writing.
+        Pass a user from profiles.utils.full_profile_queryset() to read every
+        section in three queries; missing sections are shown empty.
+        """
         user = instance if isinstance(instance, User) else instance.user
         
-        # Get or create related models
-        profile, _ = ProfileDetail.objects.get_or_create(user=user)
-        resume, _ = ResumeDetail.objects.get_or_create(user=user)
-        bank, _ = BankDetail.objects.get_or_create(user=user)
-        
         data = {
             'id': str(user.id),
             'full_name': user.full_name,
@@ -118,9 +118,9 @@ class FullProfileSerializer(serializers.Serializer):
             'phone': user.phone,
             'company_name': user.company_name,
             'role': user.role,
-            'profile': ProfileDetailSerializer(profile).data,
-            'resume': ResumeDetailSerializer(resume).data,
-            'bank': BankDetailSerializer(bank).data,
+            'profile': ProfileDetailSerializer(get_section(user, 'profile_detail')).data,
+            'resume': ResumeDetailSerializer(get_section(user, 'resume_detail')).data,
+            'bank': BankDetailSerializer(get_section(user, 'bank_detail')).data,
             'skills': SkillSerializer(user.skills.all(), many=True).data,
             'certifications': CertificationSerializer(user.certifications.all(), many=True).data,
         }
@@ -138,7 +138,7 @@ class FullProfileSerializer(serializers.Serializer):
     
     @transaction.atomic
     def update(self, instance, validated_data):
-        """Update all profile sections"""
+        """Update all profile sections, creating missing rows on first write"""
         user = instance if isinstance(instance, User) else instance.user
         
         # Update profile detail
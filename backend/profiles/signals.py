@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from dayflow_core.response_cache import invalidate_user_responses
+from profiles.models import (
+    BankDetail, Certification, ProfileDetail, ResumeDetail, SalaryStructure, Skill
+)
+
+
+@receiver([post_save, post_delete], sender=ProfileDetail)
+@receiver([post_save, post_delete], sender=ResumeDetail)
+@receiver([post_save, post_delete], sender=BankDetail)
+@receiver([post_save, post_delete], sender=SalaryStructure)
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=Certification)
+def profile_section_changed(sender, instance, **kwargs):
+    """Expire cached profile responses of the section's user"""
+    invalidate_user_responses(instance.user_id)
@@ -0,0 +1,64 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from accounts.models import User
+from profiles.models import SalaryStructure
+from profiles.salary import SALARY_INPUT_FIELDS, salary_components
+
+COMPONENTS = [
+    'hra_calculated', 'standard_allowance_calculated', 'gross_salary', 'pf_contribution',
+    'total_deductions', 'net_salary', 'annual_salary',
+]
+
+
+def create_user(index, role='EMPLOYEE'):
+    return User.objects.create_user(
+        email=f'user{index}@example.com',
+        password='pass12345',
+        company_name='Odoo',
+        full_name=f'User {index}',
+        phone='1234567890',
+        role=role
+    )
+
+
+class SalaryComponentTests(TestCase):
+
+    def setUp(self):
+        self.structure = SalaryStructure.objects.create(
+            user=create_user(1),
+            basic_salary=Decimal('33333.33'),
+            hra_percentage=Decimal('41.67'),
+            hra_fixed=Decimal('123.45'),
+            standard_allowance_percentage=Decimal('16.67'),
+            performance_bonus=Decimal('333.33'),
+            leave_travel_allowance=Decimal('2777.78'),
+            pf_percentage=Decimal('12.50'),
+            professional_tax=Decimal('200.00'),
+            income_tax=Decimal('1234.56')
+        )
+
+    def test_annotations_match_python_formulas(self):
+        annotated = SalaryStructure.objects.with_components().get(pk=self.structure.pk)
+        expected = salary_components(**{field: getattr(self.structure, field) for field in SALARY_INPUT_FIELDS})
+        computed = SalaryStructure.objects.get(pk=self.structure.pk)
+        for name in COMPONENTS:
+            with self.subTest(component=name):
+                self.assertEqual(Decimal(annotated.__dict__[name]), expected[name])
+                self.assertEqual(getattr(computed, name), expected[name])
+
+    def test_components_are_exact_cents(self):
+        components = self.structure.components
+        # 33333.33 * 41.67% = 13889.998611 and * 16.67% = 5556.666111
+        self.assertEqual(components['hra_calculated'], Decimal('13890.00'))
+        self.assertEqual(components['standard_allowance_calculated'], Decimal('5556.67'))
+        self.assertEqual(components['gross_salary'], Decimal('56014.56'))
+        self.assertEqual(components['pf_contribution'], Decimal('4166.67'))
+        self.assertEqual(components['net_salary'], Decimal('50413.33'))
+        self.assertEqual(components['annual_salary'], Decimal('604959.96'))
+
+    def test_annotations_filter_and_aggregate_in_sql(self):
+        queryset = SalaryStructure.objects.with_components()
+        self.assertTrue(queryset.filter(net_salary=Decimal('50413.33')).exists())
+        self.assertFalse(queryset.filter(net_salary__gt=Decimal('50413.33')).exists())
@@ -17,4 +17,8 @@ urlpatterns = [
     
     # Salary (Admin/HR only)
     path('me/salary/', views.MySalaryView.as_view(), name='my-salary'),
+    
+    # Bulk export (Admin/HR only)
+    path('export/', views.ProfileExportView.as_view(), name='profile-export'),
+    path('salary-report/', views.SalaryReportView.as_view(), name='salary-report'),
 ]
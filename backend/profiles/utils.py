@@ -0,0 +1,25 @@
+from django.core.exceptions import ObjectDoesNotExist
+from accounts.models import User
+
+FULL_PROFILE_SECTIONS = ['profile_detail', 'resume_detail', 'bank_detail', 'salary_structure']
+
+
+def full_profile_queryset(users=None):
+    """
+    Users with every full-profile section loaded: one query joining the
+    one-to-one sections, plus one prefetch each for skills and certifications.
+    """
+    if users is None:
+        users = User.objects.all()
+    return users.select_related(*FULL_PROFILE_SECTIONS).prefetch_related('skills', 'certifications')
+
+
+def get_section(user, related_name):
+    """
+    The user's one-to-one profile section, or an unsaved empty instance
+    when the row does not exist yet (nothing is written).
+    """
+    try:
+        return getattr(user, related_name)
+    except ObjectDoesNotExist:
+        return user._meta.get_field(related_name).related_model(user=user)
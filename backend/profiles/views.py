@@ -3,12 +3,20 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 from django.db import transaction
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
 
 from profiles.models import Skill, Certification, SalaryStructure
 from profiles.serializers import (
     FullProfileSerializer, SkillSerializer, CertificationSerializer,
     SalaryStructureSerializer
 )
+from profiles.salary import cents
+from profiles.utils import full_profile_queryset
+from profiles.export import EXPORT_FORMATS, export_users, iter_profiles, stream_csv, stream_json
+from dayflow_core.response_cache import cache_response
 
 
 class MyFullProfileView(APIView):
@@ -18,32 +26,31 @@ class MyFullProfileView(APIView):
     """
     permission_classes = [IsAuthenticated]
     
+    def get_user(self):
+        return full_profile_queryset().get(pk=self.request.user.pk)
+    
+    @method_decorator(cache_response('my-full-profile'))
     def get(self, request):
-        serializer = FullProfileSerializer(request.user, context={'request': request})
+        serializer = FullProfileSerializer(self.get_user(), context={'request': request})
         return Response(serializer.data)
     
     def put(self, request):
-        serializer = FullProfileSerializer(
-            request.user, 
-            data=request.data, 
-            partial=False,
-            context={'request': request}
-        )
-        if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return self.update(request, partial=False)
     
     def patch(self, request):
+        return self.update(request, partial=True)
+    
+    def update(self, request, partial):
         serializer = FullProfileSerializer(
             request.user, 
             data=request.data, 
-            partial=True,
+            partial=partial,
             context={'request': request}
         )
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            # Re-read so the response reflects the saved sections
+            return Response(FullProfileSerializer(self.get_user(), context={'request': request}).data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
@@ -53,6 +60,7 @@ class SkillListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = None  # Small per-user lists, returned whole
     
     def get_queryset(self):
         return Skill.objects.filter(user=self.request.user)
@@ -78,6 +86,7 @@ class CertificationListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = CertificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = None  # Small per-user lists, returned whole
     
     def get_queryset(self):
         return Certification.objects.filter(user=self.request.user)
@@ -135,3 +144,98 @@ class MySalaryView(APIView):
             serializer.save()
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class ProfileExportView(APIView):
+    """
+    GET /api/profile/export/
+    Stream full profiles of all employees (Admin/HR only)
+    Query params: export_format (json|csv, default json), role, department, search
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        if request.user.role not in ['ADMIN', 'HR']:
+            return Response(
+                {'error': 'Only Admin/HR can export profiles'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # 'format' is taken by DRF's format override
+        export_format = request.query_params.get('export_format', 'json').lower()
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        users = export_users(
+            role=request.query_params.get('role'),
+            department=request.query_params.get('department'),
+            search=request.query_params.get('search')
+        )
+        profiles = iter_profiles(users, context={'request': request})
+        
+        if export_format == 'csv':
+            response = StreamingHttpResponse(stream_csv(profiles), content_type='text/csv')
+        else:
+            response = StreamingHttpResponse(stream_json(profiles), content_type='application/json')
+        response['Content-Disposition'] = f'attachment; filename="profiles.{export_format}"'
+        return response
+
+
+class SalaryReportView(APIView):
+    """
+    GET /api/profile/salary-report/
+    Payroll cost by department and the highest net salaries (Admin/HR only)
+    Query params: top (number of top earners, default 10, max 100)
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        if request.user.role not in ['ADMIN', 'HR']:
+            return Response(
+                {'error': 'Only Admin/HR can view salary reports'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        try:
+            top = min(max(int(request.query_params.get('top', 10)), 1), 100)
+        except ValueError:
+            return Response({'error': 'top must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        structures = SalaryStructure.objects.filter(user__is_active=True).with_components()
+        totals = {
+            'employees': Count('pk'),
+            'gross_total': Sum('gross_salary'),
+            'deductions_total': Sum('total_deductions'),
+            'net_total': Sum('net_salary'),
+        }
+        
+        by_department = structures.values(
+            department=Coalesce('user__profile_detail__department', Value(''))
+        ).annotate(**totals).order_by('-gross_total')
+        
+        top_earners = structures.order_by('-net_salary').values(
+            'user_id', 'user__full_name', 'user__login_id', 'gross_salary', 'net_salary'
+        )[:top]
+        
+        def money(row, *fields):
+            # Amounts as strings, like the serializers' DecimalFields
+            return {**row, **{field: str(cents(row[field] or 0)) for field in fields}}
+        
+        return Response({
+            'overall': money(structures.aggregate(**totals), 'gross_total', 'deductions_total', 'net_total'),
+            'by_department': [
+                money(row, 'gross_total', 'deductions_total', 'net_total') for row in by_department
+            ],
+            'top_net_salaries': [
+                {
+                    'employee_id': row['user_id'],
+                    'employee_name': row['user__full_name'],
+                    'login_id': row['user__login_id'],
+                    **money(row, 'gross_salary', 'net_salary'),
+                }
+                for row in top_earners
+            ],
+        })
@@ -0,0 +1,255 @@
+import time
+from calendar import monthrange
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from accounts.models import User
+from dayflow_core.response_cache import invalidate_all_responses
+from timeoff.ledger import snapshot_balances
+from timeoff.models import TimeOffBalance, TimeOffLedgerEntry, TimeOffType
+
+HALF_DAY = Decimal('0.5')
+
+# New primary keys generated inside INSERT ... SELECT (stored as 32 hex
+# characters on SQLite, as Django does for UUIDField)
+NEW_UUID_SQL = {
+    'postgresql': 'gen_random_uuid()',
+    'sqlite': 'lower(hex(randomblob(16)))',
+}
+
+
+def round_half_day(value):
+    return (value / HALF_DAY).quantize(Decimal('1'), rounding=ROUND_HALF_UP) * HALF_DAY
+
+
+def entitlement(timeoff_type, months):
+    """The type's entitlement for months of service in a year, in half days"""
+    return round_half_day(timeoff_type.default_annual_allocation_days * months / 12)
+
+
+def accrued_through(timeoff_type, year, as_of):
+    """Last month of year (0-12) whose entitlement has accrued by as_of"""
+    if timeoff_type.accrual_method == 'ANNUAL' or as_of.year > year:
+        return 12
+    if as_of.year < year:
+        return 0
+    return as_of.month
+
+
+def accrued_entitlement(timeoff_type, year, through, joined):
+    """
+    Entitlement accrued through month `through` by an employee who joined
+    on `joined`: pro-rata from the joining month, or the whole period for
+    earlier or unknown joining dates (as _entitlement_sql, for one user)
+    """
+    if through == 0:
+        return Decimal('0.0')
+    if joined is None:
+        return entitlement(timeoff_type, through)
+    for month in range(1, through + 1):
+        if joined <= date(year, month, monthrange(year, month)[1]):
+            return entitlement(timeoff_type, through - month + 1)
+    return Decimal('0.0')
+
+
+def carried_forward(timeoff_type, previous):
+    """Unused days of the previous year's balance (or None), capped per type"""
+    cap = timeoff_type.carry_forward_max_days
+    if not cap or previous is None:
+        return Decimal('0.0')
+    return min(max(previous.available_days, Decimal('0.0')), cap)
+
+
+def new_balances(timeoff_type, year, users, as_of=None):
+    """
+    Unsaved balances of a type for a year, one per user, as run_accrual
+    would create them: the entitlement accrued by as_of (default: today),
+    pro-rata from the joining month and only through as_of's month for
+    monthly types, plus the days carried forward from the previous year.
+    Every balance created outside run_accrual goes through here, so a
+    monthly type is never granted its whole year up front.
+    One query for the previous year's balances.
+    """
+    as_of = as_of or timezone.localdate()
+    through = accrued_through(timeoff_type, year, as_of)
+    previous = {
+        balance.user_id: balance
+        for balance in TimeOffBalance.objects.filter(
+            user__in=[user.pk for user in users],
+            timeoff_type=timeoff_type,
+            year=year - 1
+        ).with_pending()
+    }
+
+    balances = []
+    for user in users:
+        entitled = accrued_entitlement(timeoff_type, year, through, user.date_of_joining)
+        carried = carried_forward(timeoff_type, previous.get(user.pk))
+        balances.append(TimeOffBalance(
+            user=user,
+            timeoff_type=timeoff_type,
+            year=year,
+            allocated_days=entitled + carried,
+            used_days=Decimal('0.0'),
+            carried_forward_days=carried,
+            accrued_days=entitled,
+            accrued_through_month=through
+        ))
+    return balances
+
+
+def _entitlement_sql(timeoff_type, year, through, joined):
+    """
+    SQL CASE for the entitlement accrued through month `through` by an
+    employee who joined on `joined` (a date column): pro-rata from the
+    joining month, or the whole period for earlier or unknown joining dates.
+    """
+    if through == 0:
+        return '0', []
+    branches = []
+    params = [entitlement(timeoff_type, through)]
+    for month in range(1, through + 1):
+        branches.append(f'WHEN {joined} <= %s THEN %s')
+        params += [date(year, month, monthrange(year, month)[1]), entitlement(timeoff_type, through - month + 1)]
+    return f"CASE WHEN {joined} IS NULL THEN %s {' '.join(branches)} ELSE 0 END", params
+
+
+def _carry_sql(timeoff_type, previous):
+    """SQL CASE for the unused days of the `previous` balance, capped per type"""
+    cap = timeoff_type.carry_forward_max_days
+    if not cap:
+        return '0', []
+    unused = f'({previous}.allocated_days - {previous}.used_days)'
+    return (
+        f'CASE WHEN {previous}.id IS NULL OR {unused} <= 0 THEN 0 '
+        f'WHEN {unused} > CAST(%s AS NUMERIC) THEN %s ELSE {unused} END',
+        [cap, cap]
+    )
+
+
+def create_balances(timeoff_type, year, as_of):
+    """
+    Create the year's balance of this type for every active user who has
+    joined by the end of the year, in one INSERT ... SELECT. Users who
+    already have one are skipped (ON CONFLICT DO NOTHING).
+    Returns the number of balances created.
+    """
+    balances = TimeOffBalance._meta.db_table
+    through = accrued_through(timeoff_type, year, as_of)
+    entitled, entitled_params = _entitlement_sql(timeoff_type, year, through, 'u.date_of_joining')
+    carry, carry_params = _carry_sql(timeoff_type, 'prev')
+    type_id = TimeOffBalance._meta.get_field('timeoff_type').get_db_prep_value(timeoff_type.pk, connection)
+    now = timezone.now()
+
+    sql = f"""
+        INSERT INTO {balances} (
+            id, user_id, timeoff_type_id, year, allocated_days, used_days,
+            carried_forward_days, accrued_days, accrued_through_month, created_at, updated_at
+        )
+        SELECT {NEW_UUID_SQL[connection.vendor]}, u.id, %s, %s, ({entitled}) + ({carry}), 0,
+               {carry}, {entitled}, %s, %s, %s
+        FROM {User._meta.db_table} u
+        LEFT JOIN {balances} prev
+            ON prev.user_id = u.id AND prev.timeoff_type_id = %s AND prev.year = %s
+        WHERE u.is_active = %s AND (u.date_of_joining IS NULL OR u.date_of_joining <= %s)
+        ON CONFLICT (user_id, timeoff_type_id, year) DO NOTHING
+    """
+    params = [
+        type_id, year, *entitled_params, *carry_params,
+        *carry_params, *entitled_params, through, now, now,
+        type_id, year - 1,
+        True, date(year, 12, 31),
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.rowcount
+
+
+def accrue_balances(timeoff_type, year, as_of):
+    """
+    Bring the year's balances of a monthly type up to the entitlement
+    accrued by as_of: one INSERT ... SELECT records an ACCRUAL ledger entry
+    for the difference to what was accrued before, then one UPDATE moves
+    accrued_days and accrued_through_month on. Manual adjustments and
+    carried-over days are kept and repeating the run changes nothing.
+    Returns the number of balances updated.
+    """
+    balances = TimeOffBalance._meta.db_table
+    users = User._meta.db_table
+    through = accrued_through(timeoff_type, year, as_of)
+    type_id = TimeOffBalance._meta.get_field('timeoff_type').get_db_prep_value(timeoff_type.pk, connection)
+    now = timezone.now()
+
+    entitled, entitled_params = _entitlement_sql(timeoff_type, year, through, 'u.date_of_joining')
+    insert = f"""
+        INSERT INTO {TimeOffLedgerEntry._meta.db_table} (
+            id, balance_id, entry_type, days, note, is_applied, created_at
+        )
+        SELECT {NEW_UUID_SQL[connection.vendor]}, b.id, 'ACCRUAL', ({entitled}) - b.accrued_days, %s, %s, %s
+        FROM {balances} b
+        JOIN {users} u ON u.id = b.user_id
+        WHERE b.timeoff_type_id = %s
+            AND b.year = %s
+            AND b.accrued_through_month < %s
+            AND ({entitled}) <> b.accrued_days
+    """
+    insert_params = [
+        *entitled_params, f'Accrued through {year}-{through:02d}', False, now,
+        type_id, year, through, *entitled_params,
+    ]
+
+    entitled, entitled_params = _entitlement_sql(timeoff_type, year, through, f'{users}.date_of_joining')
+    update = f"""
+        UPDATE {balances} SET
+            accrued_days = {entitled},
+            accrued_through_month = %s,
+            updated_at = %s
+        FROM {users}
+        WHERE {users}.id = {balances}.user_id
+            AND {balances}.timeoff_type_id = %s
+            AND {balances}.year = %s
+            AND {balances}.accrued_through_month < %s
+    """
+    update_params = [*entitled_params, through, now, type_id, year, through]
+
+    with connection.cursor() as cursor:
+        cursor.execute(insert, insert_params)
+        cursor.execute(update, update_params)
+        return cursor.rowcount
+
+
+def run_accrual(year, as_of=None):
+    """
+    Bring every active type's balances for a year up to date: create the
+    missing ones (carrying unused days forward from the previous year, up
+    to carry_forward_max_days) and accrue monthly types through as_of
+    (default: today). Joiners get a pro-rata share from their joining month.
+
+    The previous year's ledger is first folded into its balances, so the
+    carried days see all of it. Each type then runs as its own transaction
+    of one INSERT ... SELECT and, for monthly types, one ledger INSERT and
+    one UPDATE, so the run is idempotent and an interrupted run is resumed
+    by running it again.
+    Returns a list of {'code', 'created', 'accrued', 'seconds'} per type.
+    """
+    as_of = as_of or timezone.localdate()
+    snapshot_balances(year - 1)
+    report = []
+    for timeoff_type in TimeOffType.objects.filter(is_active=True):
+        started = time.monotonic()
+        with transaction.atomic():
+            created = create_balances(timeoff_type, year, as_of)
+            accrued = accrue_balances(timeoff_type, year, as_of) if timeoff_type.accrual_method == 'MONTHLY' else 0
+        report.append({
+            'code': timeoff_type.code,
+            'created': created,
+            'accrued': accrued,
+            'seconds': round(time.monotonic() - started, 3),
+        })
+
+    # Raw SQL sends no post_save; balances appear in many cached responses
+    invalidate_all_responses()
+    return report
@@ -1,24 +1,67 @@
 from django.contrib import admin
-from .models import TimeOffType, TimeOffBalance, TimeOffRequest
+from .models import Holiday, LeaveDay, TimeOffLedgerEntry, TimeOffType, TimeOffBalance, TimeOffRequest, WorkCalendar
 
 @admin.register(TimeOffType)
 class TimeOffTypeAdmin(admin.ModelAdmin):
-    list_display = ['code', 'name', 'default_annual_allocation_days', 'is_active', 'created_at']
-    list_filter = ['is_active', 'code']
+    list_display = [
+        'code', 'name', 'default_annual_allocation_days', 'accrual_method',
+        'carry_forward_max_days', 'is_active', 'created_at'
+    ]
+    list_filter = ['is_active', 'code', 'accrual_method']
     search_fields = ['name', 'code']
     readonly_fields = ['id', 'created_at']
 
 @admin.register(TimeOffBalance)
 class TimeOffBalanceAdmin(admin.ModelAdmin):
-    list_display = ['user', 'timeoff_type', 'year', 'allocated_days', 'used_days', 'available_days']
+    """Existing balances change through ledger entries; the day counts are read-only here"""
+    list_display = [
+        'user', 'timeoff_type', 'year', 'current_allocated_days', 'carried_forward_days',
+        'current_used_days', 'available_days'
+    ]
     list_filter = ['year', 'timeoff_type']
     search_fields = ['user__full_name', 'user__email', 'user__login_id']
-    readonly_fields = ['id', 'created_at', 'updated_at']
+    readonly_fields = ['id', 'snapshot_at', 'created_at', 'updated_at']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_pending()
+
+    def get_readonly_fields(self, request, obj=None):
+        if obj is None:
+            return self.readonly_fields
+        return self.readonly_fields + ['allocated_days', 'used_days', 'accrued_days', 'carried_forward_days']
+
+    def current_allocated_days(self, obj):
+        return obj.current_allocated_days
+    current_allocated_days.short_description = 'Allocated Days'
+
+    def current_used_days(self, obj):
+        return obj.current_used_days
+    current_used_days.short_description = 'Used Days'
     
     def available_days(self, obj):
         return obj.available_days
     available_days.short_description = 'Available Days'
 
+@admin.register(TimeOffLedgerEntry)
+class TimeOffLedgerEntryAdmin(admin.ModelAdmin):
+    """Append-only: entries can be added (e.g. adjustments) but not changed or deleted"""
+    list_display = ['balance', 'entry_type', 'days', 'request', 'created_by', 'is_applied', 'created_at']
+    list_filter = ['entry_type', 'is_applied', 'balance__year', 'balance__timeoff_type']
+    search_fields = ['balance__user__full_name', 'balance__user__email', 'balance__user__login_id', 'note']
+    fields = ['balance', 'entry_type', 'days', 'request', 'reverses', 'note']
+    raw_id_fields = ['balance', 'request', 'reverses']
+    list_select_related = ['balance__user', 'balance__timeoff_type', 'request', 'created_by']
+
+    def save_model(self, request, obj, form, change):
+        obj.created_by = request.user
+        super().save_model(request, obj, form, change)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
 @admin.register(TimeOffRequest)
 class TimeOffRequestAdmin(admin.ModelAdmin):
     list_display = [
@@ -32,7 +75,10 @@ class TimeOffRequestAdmin(admin.ModelAdmin):
     
     fieldsets = (
         ('Request Information', {
-            'fields': ('employee', 'timeoff_type', 'start_date', 'end_date', 'allocation_days')
+            'fields': (
+                'employee', 'timeoff_type', 'start_date', 'end_date',
+                'start_half_day', 'end_half_day', 'allocation_days'
+            )
         }),
         ('Status', {
             'fields': ('status', 'requested_by', 'approved_by', 'rejection_reason')
@@ -45,3 +91,30 @@ class TimeOffRequestAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         }),
     )
+
+class HolidayInline(admin.TabularInline):
+    model = Holiday
+    extra = 1
+    fields = ['date', 'name', 'is_half_day']
+
+@admin.register(WorkCalendar)
+class WorkCalendarAdmin(admin.ModelAdmin):
+    list_display = ['name', 'company_name', 'weekend_days', 'updated_at']
+    search_fields = ['name', 'company_name']
+    readonly_fields = ['id', 'created_at', 'updated_at']
+    inlines = [HolidayInline]
+
+@admin.register(LeaveDay)
+class LeaveDayAdmin(admin.ModelAdmin):
+    """Maintained from approved requests; read-only here"""
+    list_display = ['user', 'timeoff_type', 'day', 'request']
+    list_filter = ['timeoff_type', 'day']
+    search_fields = ['user__full_name', 'user__email', 'user__login_id']
+    date_hierarchy = 'day'
+    list_select_related = ['user', 'timeoff_type']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class TimeoffConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'timeoff'
+
+    def ready(self):
+        from timeoff import signals  # noqa: F401
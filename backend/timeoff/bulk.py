@@ -0,0 +1,168 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import User
+from dayflow_core.response_cache import invalidate_user_responses
+from timeoff.accrual import new_balances
+from timeoff.ledger import usage_entry
+from timeoff.models import TimeOffBalance, TimeOffLedgerEntry, TimeOffRequest
+from timeoff.utils import sync_leave_days, validate_balance_for_request
+
+BULK_REVIEW_MAX = 1000
+BULK_BATCH_SIZE = 500
+
+BULK_ACTIONS = {
+    'approve': 'APPROVED',
+    'reject': 'REJECTED',
+}
+
+
+def _outcome(request_id, action, error=None, detail=None, status=None):
+    if error:
+        return {'id': request_id, 'action': action, 'error': error, 'detail': detail}
+    return {'id': request_id, 'action': action, 'status': status}
+
+
+def _lock_balances(keys, types):
+    """
+    Lock the balances for the (user_id, timeoff_type_id, year) keys in id
+    order, creating missing ones with the entitlement accrued so far
+    (see accrual.new_balances).
+    Returns {key: balance}.
+    """
+    user_ids = {user_id for user_id, _, _ in keys}
+    type_ids = {type_id for _, type_id, _ in keys}
+    years = {year for _, _, year in keys}
+
+    def fetch():
+        rows = TimeOffBalance.objects.select_for_update().with_pending().filter(
+            user_id__in=user_ids,
+            timeoff_type_id__in=type_ids,
+            year__in=years
+        ).order_by('id')
+        return {
+            (row.user_id, row.timeoff_type_id, row.year): row
+            for row in rows
+            if (row.user_id, row.timeoff_type_id, row.year) in keys
+        }
+
+    balances = fetch()
+    missing = keys - balances.keys()
+    if missing:
+        users = User.objects.only('id', 'date_of_joining').in_bulk({user_id for user_id, _, _ in missing})
+        groups = defaultdict(list)
+        for user_id, type_id, year in missing:
+            groups[type_id, year].append(users[user_id])
+        TimeOffBalance.objects.bulk_create(
+            [
+                balance
+                for (type_id, year), group in groups.items()
+                for balance in new_balances(types[type_id], year, group)
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True
+        )
+        balances = fetch()
+
+    for key, balance in balances.items():
+        balance.timeoff_type = types[key[1]]
+    return balances
+
+
+def bulk_review(actions, reviewer):
+    """
+    Approve or reject many pending requests in one transaction.
+
+    actions: list of {'id', 'action', 'rejection_reason'} in the order HR
+    decided them. Requests and then balances are locked in id order, so
+    concurrent bulk reviews cannot deadlock. Approvals are checked against
+    the locked balance of their (user, type, year) with
+    validate_balance_for_request in input order. The approvals' USAGE
+    ledger entries and LeaveDay rows are then inserted in bulk and the
+    requests written with one bulk_update.
+
+    Returns one outcome per action: {'id', 'action', 'status'} when applied,
+    or {'id', 'action', 'error', 'detail'} when skipped.
+    """
+    outcomes = []
+    now = timezone.now()
+
+    with transaction.atomic():
+        requests = {
+            timeoff_request.id: timeoff_request
+            for timeoff_request in TimeOffRequest.objects.select_for_update(of=('self',))
+            .select_related('timeoff_type')
+            .filter(id__in={item['id'] for item in actions})
+            .order_by('id')
+        }
+
+        approvals = [
+            requests[item['id']] for item in actions
+            if item['action'] == 'approve'
+            and item['id'] in requests
+            and requests[item['id']].status == 'PENDING'
+        ]
+        balances = _lock_balances(
+            {
+                (timeoff_request.employee_id, timeoff_request.timeoff_type_id, timeoff_request.start_date.year)
+                for timeoff_request in approvals
+            },
+            {timeoff_request.timeoff_type_id: timeoff_request.timeoff_type for timeoff_request in approvals}
+        ) if approvals else {}
+
+        reviewed = []
+        usage = []
+        seen = set()
+        for item in actions:
+            request_id, action = item['id'], item['action']
+            timeoff_request = requests.get(request_id)
+
+            if request_id in seen:
+                outcomes.append(_outcome(request_id, action, 'DUPLICATE_ID', 'Request listed more than once.'))
+                continue
+            seen.add(request_id)
+
+            if timeoff_request is None:
+                outcomes.append(_outcome(request_id, action, 'NOT_FOUND', 'Time off request not found.'))
+                continue
+            if timeoff_request.status != 'PENDING':
+                outcomes.append(_outcome(
+                    request_id, action, 'INVALID_STATUS',
+                    f'Cannot {action} request with status: {timeoff_request.status}'
+                ))
+                continue
+
+            if action == 'approve':
+                key = (timeoff_request.employee_id, timeoff_request.timeoff_type_id, timeoff_request.start_date.year)
+                balance = balances[key]
+                error = validate_balance_for_request(balance, timeoff_request.allocation_days)
+                if error:
+                    outcomes.append(_outcome(request_id, action, 'INSUFFICIENT_BALANCE', error))
+                    continue
+                # Later approvals against the same balance see this one
+                balance.pending_usage_days -= timeoff_request.allocation_days
+                usage.append(usage_entry(balance, timeoff_request, reviewer))
+            else:
+                timeoff_request.rejection_reason = item.get('rejection_reason', '')
+
+            timeoff_request.status = BULK_ACTIONS[action]
+            timeoff_request.approved_by = reviewer
+            timeoff_request.updated_at = now
+            reviewed.append(timeoff_request)
+            outcomes.append(_outcome(request_id, action, status=timeoff_request.status))
+
+        if usage:
+            TimeOffLedgerEntry.objects.bulk_create(usage, batch_size=BULK_BATCH_SIZE)
+        if reviewed:
+            TimeOffRequest.objects.bulk_update(
+                reviewed, ['status', 'approved_by', 'rejection_reason', 'updated_at'], batch_size=BULK_BATCH_SIZE
+            )
+            sync_leave_days([r for r in reviewed if r.status == 'APPROVED'])
+
+        # bulk_update does not send post_save
+        for employee_id in {timeoff_request.employee_id for timeoff_request in reviewed}:
+            invalidate_user_responses(employee_id)
+
+    return outcomes
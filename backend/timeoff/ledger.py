@@ -0,0 +1,113 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from timeoff.models import (
+    LEDGER_ALLOCATION_TYPES, LEDGER_USAGE_TYPES, TimeOffBalance, TimeOffLedgerEntry, pending_ledger_days
+)
+
+SNAPSHOT_BATCH_SIZE = 1000
+
+
+class BalanceNotFound(Exception):
+    pass
+
+
+def lock_balance(balance):
+    """
+    Re-read a balance with its pending ledger totals, locking the row.
+    Only usage needs this, so that two approvals against the same balance
+    check the available days one at a time; accruals, adjustments and
+    reversals are plain inserts.
+    """
+    return TimeOffBalance.objects.select_for_update().with_pending().get(pk=balance.pk)
+
+
+def usage_entry(balance, timeoff_request, created_by=None):
+    """Unsaved USAGE entry for an approved request"""
+    return TimeOffLedgerEntry(
+        balance=balance,
+        entry_type='USAGE',
+        days=-timeoff_request.allocation_days,
+        request=timeoff_request,
+        created_by=created_by
+    )
+
+
+def record_usage(balance, timeoff_request, created_by=None):
+    """Record the request's days as used (call with the balance locked)"""
+    entry = usage_entry(balance, timeoff_request, created_by)
+    entry.save()
+    return entry
+
+
+def reverse_request_usage(timeoff_request, created_by=None, note=''):
+    """
+    Give an approved request's days back with a REVERSAL entry. Requests
+    approved before the ledger existed have no USAGE entry to link to; their
+    usage is in the snapshot, so the reversal is recorded unlinked.
+    Raises BalanceNotFound when such a request's balance no longer exists;
+    creating a fresh one would give back days it was never charged.
+    """
+    usage = TimeOffLedgerEntry.objects.filter(
+        request=timeoff_request,
+        entry_type='USAGE',
+        reversal__isnull=True
+    ).select_related('balance').first()
+
+    if usage is not None:
+        balance = usage.balance
+    else:
+        balance = TimeOffBalance.objects.filter(
+            user_id=timeoff_request.employee_id,
+            timeoff_type_id=timeoff_request.timeoff_type_id,
+            year=timeoff_request.start_date.year
+        ).first()
+        if balance is None:
+            raise BalanceNotFound(
+                f'No {timeoff_request.timeoff_type.name} balance for {timeoff_request.start_date.year} '
+                f'to give the days back to.'
+            )
+
+    entry = TimeOffLedgerEntry(
+        balance=balance,
+        entry_type='REVERSAL',
+        days=timeoff_request.allocation_days,
+        request=timeoff_request,
+        reverses=usage,
+        note=note,
+        created_by=created_by
+    )
+    entry.save()
+    return entry
+
+
+def snapshot_balances(year=None):
+    """
+    Fold unapplied ledger entries into their balances' allocated_days and
+    used_days, SNAPSHOT_BATCH_SIZE balances per transaction: the balances
+    are locked (which also holds off new entries for them), moved on by
+    their pending sums in one UPDATE, and the entries marked applied.
+    Reads give the same values before and after.
+    Returns the number of entries folded.
+    """
+    pending = TimeOffLedgerEntry.objects.filter(is_applied=False)
+    if year is not None:
+        pending = pending.filter(balance__year=year)
+    balance_ids = list(pending.order_by('balance_id').values_list('balance_id', flat=True).distinct())
+
+    folded = 0
+    for offset in range(0, len(balance_ids), SNAPSHOT_BATCH_SIZE):
+        batch = balance_ids[offset:offset + SNAPSHOT_BATCH_SIZE]
+        now = timezone.now()
+        with transaction.atomic():
+            list(TimeOffBalance.objects.select_for_update().filter(pk__in=batch).order_by('pk').values_list('pk'))
+            TimeOffBalance.objects.filter(pk__in=batch).update(
+                allocated_days=F('allocated_days') + pending_ledger_days(LEDGER_ALLOCATION_TYPES),
+                used_days=F('used_days') - pending_ledger_days(LEDGER_USAGE_TYPES),
+                snapshot_at=now,
+                updated_at=now
+            )
+            folded += TimeOffLedgerEntry.objects.filter(balance_id__in=batch, is_applied=False).update(is_applied=True)
+
+    return folded
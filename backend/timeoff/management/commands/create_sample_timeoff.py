@@ -4,6 +4,7 @@ from datetime import date, timedelta
 from decimal import Decimal
 from accounts.models import User
 from timeoff.models import TimeOffType, TimeOffBalance, TimeOffRequest
+from timeoff.ledger import record_usage
 from timeoff.utils import initialize_balances_for_user
 
 class Command(BaseCommand):
@@ -98,15 +99,14 @@ class Command(BaseCommand):
                     requested_by=user
                 )
                 
-                # If approved, update balance
+                # If approved, record the usage against the balance
                 if req_data['status'] == 'APPROVED':
                     balance = TimeOffBalance.objects.get(
                         user=user,
                         timeoff_type=req_data['timeoff_type'],
                         year=current_year
                     )
-                    balance.used_days += allocation_days
-                    balance.save()
+                    record_usage(balance, request, user)
                 
                 created_count += 1
                 self.stdout.write(self.style.SUCCESS(
@@ -1,10 +1,14 @@
-from django.core.management.base import BaseCommand
+import time
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from accounts.models import User
-from timeoff.utils import initialize_balances_for_user
+from timeoff.accrual import run_accrual
 
 class Command(BaseCommand):
-    help = 'Initialize time off balances for all users for the current year'
+    help = (
+        'Create and accrue time off balances for all active users for a year, '
+        'carrying unused days forward from the previous year. Safe to re-run.'
+    )
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -12,30 +16,34 @@ class Command(BaseCommand):
             type=int,
             help='Year to initialize balances for (default: current year)',
         )
+        parser.add_argument(
+            '--as-of',
+            help='Accrue monthly types through this date, YYYY-MM-DD (default: today)',
+        )
 
     def handle(self, *args, **kwargs):
         year = kwargs.get('year') or timezone.now().year
-        
+        as_of = None
+        if kwargs.get('as_of'):
+            try:
+                as_of = datetime.strptime(kwargs['as_of'], '%Y-%m-%d').date()
+            except ValueError:
+                raise CommandError('--as-of must be a date in YYYY-MM-DD format.')
+
         self.stdout.write(f'Initializing time off balances for year {year}...')
-        
-        users = User.objects.filter(is_active=True)
-        total_users = users.count()
-        
-        if total_users == 0:
-            self.stdout.write(self.style.WARNING('No active users found.'))
+
+        started = time.monotonic()
+        report = run_accrual(year, as_of)
+
+        if not report:
+            self.stdout.write(self.style.WARNING('No active time off types found.'))
             return
-        
-        initialized_count = 0
-        
-        for user in users:
-            balances = initialize_balances_for_user(user, year)
-            initialized_count += 1
+
+        for row in report:
             self.stdout.write(
-                self.style.SUCCESS(
-                    f"Initialized {len(balances)} balances for {user.full_name}"
-                )
+                f"  {row['code']}: {row['created']} created, {row['accrued']} accrued in {row['seconds']:.2f}s"
             )
-        
+
         self.stdout.write(self.style.SUCCESS(
-            f'\nSuccessfully initialized balances for {initialized_count} users!'
+            f'\nSuccessfully initialized balances in {time.monotonic() - started:.2f}s'
         ))
@@ -0,0 +1,23 @@
+import time
+from django.core.management.base import BaseCommand
+from timeoff.workdays import recompute_pending_allocations
+
+class Command(BaseCommand):
+    help = 'Recompute pending time off requests in working days, e.g. after holidays change'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report how many requests would change without saving',
+        )
+
+    def handle(self, *args, **kwargs):
+        started = time.monotonic()
+        checked, changed = recompute_pending_allocations(dry_run=kwargs['dry_run'])
+
+        verb = 'would change' if kwargs['dry_run'] else 'updated'
+        self.stdout.write(self.style.SUCCESS(
+            f'{checked} pending requests checked, {changed} {verb} '
+            f'in {time.monotonic() - started:.2f}s'
+        ))
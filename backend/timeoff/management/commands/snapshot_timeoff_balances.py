@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from timeoff.ledger import snapshot_balances
+
+class Command(BaseCommand):
+    help = (
+        'Fold recorded time off ledger entries into the balance snapshots, '
+        'keeping balance reads to a few pending entries. Run periodically, e.g. nightly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Only snapshot balances for this year (default: all years)',
+        )
+
+    def handle(self, *args, **kwargs):
+        started = time.monotonic()
+        folded = snapshot_balances(kwargs.get('year'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{folded} ledger entries folded into balances in {time.monotonic() - started:.2f}s'
+        ))
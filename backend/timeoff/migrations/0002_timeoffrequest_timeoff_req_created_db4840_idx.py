@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeoff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeoffrequest',
+            index=models.Index(fields=['-created_at', 'id'], name='timeoff_req_created_db4840_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:04
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+from datetime import timedelta
+
+
+def backfill_leave_days(apps, schema_editor):
+    """Expand every approved request into its LeaveDay rows"""
+    TimeOffRequest = apps.get_model('timeoff', 'TimeOffRequest')
+    LeaveDay = apps.get_model('timeoff', 'LeaveDay')
+
+    batch = []
+    approved = TimeOffRequest.objects.filter(status='APPROVED').values_list(
+        'id', 'employee_id', 'timeoff_type_id', 'start_date', 'end_date'
+    )
+    for request_id, user_id, type_id, start_date, end_date in approved.iterator(chunk_size=2000):
+        for offset in range((end_date - start_date).days + 1):
+            batch.append(LeaveDay(
+                request_id=request_id,
+                user_id=user_id,
+                timeoff_type_id=type_id,
+                day=start_date + timedelta(days=offset)
+            ))
+        if len(batch) >= 2000:
+            LeaveDay.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        LeaveDay.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('timeoff', '0002_timeoffrequest_timeoff_req_created_db4840_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaveDay',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_days', to='timeoff.timeoffrequest')),
+                ('timeoff_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_days', to='timeoff.timeofftype')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leave_days', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Leave Day',
+                'verbose_name_plural': 'Leave Days',
+                'db_table': 'timeoff_leave_days',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['day', 'user'], name='timeoff_lea_day_effd07_idx'), models.Index(fields=['user', 'day'], name='timeoff_lea_user_id_b91ef0_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaveday',
+            constraint=models.UniqueConstraint(fields=('request', 'day'), name='unique_leave_day_per_request'),
+        ),
+        migrations.RunPython(backfill_leave_days, migrations.RunPython.noop),
+    ]
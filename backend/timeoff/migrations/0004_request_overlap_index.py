@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeoff', '0003_leave_days'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='timeoffrequest',
+            index=models.Index(fields=['employee', 'start_date', 'end_date'], name='timeoff_req_employe_39a150_idx'),
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeoff', '0004_request_overlap_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkCalendar',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('company_name', models.CharField(blank=True, max_length=255, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('weekend_days', models.CharField(default='5,6', help_text='Comma-separated weekdays off (0 = Monday, 6 = Sunday)', max_length=13)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Work Calendar',
+                'verbose_name_plural': 'Work Calendars',
+                'db_table': 'timeoff_work_calendars',
+                'ordering': ['company_name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='timeoffrequest',
+            name='end_half_day',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='timeoffrequest',
+            name='start_half_day',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('name', models.CharField(max_length=255)),
+                ('is_half_day', models.BooleanField(default=False)),
+                ('calendar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='holidays', to='timeoff.workcalendar')),
+            ],
+            options={
+                'verbose_name': 'Holiday',
+                'verbose_name_plural': 'Holidays',
+                'db_table': 'timeoff_holidays',
+                'ordering': ['date'],
+                'unique_together': {('calendar', 'date')},
+            },
+        ),
+    ]
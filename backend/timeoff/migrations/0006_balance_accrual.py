@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:11
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_accrued_days(apps, schema_editor):
+    """Existing balances were granted in full at creation"""
+    TimeOffBalance = apps.get_model('timeoff', 'TimeOffBalance')
+    TimeOffBalance.objects.update(accrued_days=F('allocated_days'), accrued_through_month=12)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeoff', '0005_work_calendars'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeoffbalance',
+            name='accrued_days',
+            field=models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='timeoffbalance',
+            name='accrued_through_month',
+            field=models.PositiveSmallIntegerField(default=12),
+        ),
+        migrations.AddField(
+            model_name='timeoffbalance',
+            name='carried_forward_days',
+            field=models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5),
+        ),
+        migrations.AddField(
+            model_name='timeofftype',
+            name='accrual_method',
+            field=models.CharField(choices=[('ANNUAL', 'Annual (granted at year start)'), ('MONTHLY', 'Monthly')], default='ANNUAL', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='timeofftype',
+            name='carry_forward_max_days',
+            field=models.DecimalField(decimal_places=1, default=Decimal('0.0'), max_digits=5, validators=[django.core.validators.MinValueValidator(Decimal('0.0'))]),
+        ),
+        migrations.RunPython(backfill_accrued_days, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('timeoff', '0006_balance_accrual'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timeoffbalance',
+            name='snapshot_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='timeoffrequest',
+            name='status',
+            field=models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected'), ('CANCELLED', 'Cancelled')], default='PENDING', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='TimeOffLedgerEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('entry_type', models.CharField(choices=[('ACCRUAL', 'Accrual'), ('USAGE', 'Usage'), ('ADJUSTMENT', 'Adjustment'), ('REVERSAL', 'Reversal')], max_length=20)),
+                ('days', models.DecimalField(decimal_places=1, max_digits=5)),
+                ('note', models.TextField(blank=True)),
+                ('is_applied', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('balance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ledger_entries', to='timeoff.timeoffbalance')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='timeoff_ledger_entries', to=settings.AUTH_USER_MODEL)),
+                ('request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='ledger_entries', to='timeoff.timeoffrequest')),
+                ('reverses', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='reversal', to='timeoff.timeoffledgerentry')),
+            ],
+            options={
+                'verbose_name': 'Time Off Ledger Entry',
+                'verbose_name_plural': 'Time Off Ledger Entries',
+                'db_table': 'timeoff_ledger_entries',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(condition=models.Q(('is_applied', False)), fields=['balance'], name='ledger_unapplied_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.30 on 2026-10-17 23:36
+
+from django.db import migrations
+
+from timeoff.workdays import DEFAULT_WEEKEND, BusinessDayIndex
+
+
+def drop_non_working_leave_days(apps, schema_editor):
+    """
+    Remove LeaveDay rows on weekends and full-day holidays of the
+    employee's work calendar; leave is not charged for them.
+    """
+    WorkCalendar = apps.get_model('timeoff', 'WorkCalendar')
+    Holiday = apps.get_model('timeoff', 'Holiday')
+    LeaveDay = apps.get_model('timeoff', 'LeaveDay')
+
+    calendars = {}
+    for calendar in WorkCalendar.objects.all():
+        weekend = {int(day) for day in calendar.weekend_days.split(',') if day.strip()}
+        holidays = dict(Holiday.objects.filter(calendar=calendar).values_list('date', 'is_half_day'))
+        calendars[calendar.company_name.casefold()] = (weekend, holidays)
+    default = calendars.get('', (DEFAULT_WEEKEND, {}))
+
+    indexes = {}
+    stale = []
+    leave_days = LeaveDay.objects.values_list('id', 'day', 'user__company_name')
+    for leave_day_id, day, company_name in leave_days.iterator(chunk_size=2000):
+        company = (company_name or '').casefold()
+        if company not in calendars:
+            company = ''
+        key = (company, day.year)
+        if key not in indexes:
+            weekend, holidays = calendars.get(company, default)
+            indexes[key] = BusinessDayIndex(day.year, weekend, holidays)
+        if not indexes[key].weight(day):
+            stale.append(leave_day_id)
+
+    for offset in range(0, len(stale), 2000):
+        LeaveDay.objects.filter(pk__in=stale[offset:offset + 2000]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timeoff', '0007_ledger_entries'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_non_working_leave_days, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,8 @@ import uuid
 from decimal import Decimal
 from datetime import timedelta
 from django.db import models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
 from django.conf import settings
 from django.core.validators import MinValueValidator
 
@@ -15,6 +17,11 @@ class TimeOffType(models.Model):
         ('UNPAID', 'Unpaid Leave'),
     ]
 
+    ACCRUAL_CHOICES = [
+        ('ANNUAL', 'Annual (granted at year start)'),
+        ('MONTHLY', 'Monthly'),
+    ]
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     code = models.CharField(max_length=20, choices=CODE_CHOICES, unique=True)
     name = models.CharField(max_length=255)
@@ -23,6 +30,13 @@ class TimeOffType(models.Model):
         decimal_places=1,
         validators=[MinValueValidator(Decimal('0.0'))]
     )
+    accrual_method = models.CharField(max_length=10, choices=ACCRUAL_CHOICES, default='ANNUAL')
+    carry_forward_max_days = models.DecimalField(
+        max_digits=5,
+        decimal_places=1,
+        default=Decimal('0.0'),
+        validators=[MinValueValidator(Decimal('0.0'))]
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -35,9 +49,44 @@ class TimeOffType(models.Model):
     def __str__(self):
         return f"{self.name} ({self.code})"
 
+# Ledger entry types adding to a balance's allocation and to its usage
+LEDGER_ALLOCATION_TYPES = ['ACCRUAL', 'ADJUSTMENT']
+LEDGER_USAGE_TYPES = ['USAGE', 'REVERSAL']
+
+def pending_ledger_days(entry_types):
+    """
+    Sum of a balance's ledger entries of entry_types not yet folded into its
+    snapshot (0 if none), as a subquery on the balance's pk
+    """
+    entries = TimeOffLedgerEntry.objects.filter(
+        balance=OuterRef('pk'),
+        is_applied=False,
+        entry_type__in=entry_types
+    ).order_by().values('balance').annotate(total=Sum('days')).values('total')
+    return Coalesce(
+        Subquery(entries, output_field=models.DecimalField(max_digits=6, decimal_places=1)),
+        Value(Decimal('0.0')),
+        output_field=models.DecimalField(max_digits=6, decimal_places=1)
+    )
+
+class TimeOffBalanceQuerySet(models.QuerySet):
+    def with_pending(self):
+        """
+        Annotate the ledger entries not yet folded into each balance's
+        snapshot, so the current_* values need no further queries
+        """
+        return self.annotate(
+            pending_allocated_days=pending_ledger_days(LEDGER_ALLOCATION_TYPES),
+            pending_usage_days=pending_ledger_days(LEDGER_USAGE_TYPES)
+        )
+
 class TimeOffBalance(models.Model):
     """
     Tracks remaining time off days per user, type, and year
+
+    allocated_days and used_days are a snapshot; ledger entries recorded
+    since are added on read (see current_allocated_days / current_used_days)
+    until snapshot_balances() folds them in.
     """
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(
@@ -62,9 +111,18 @@ class TimeOffBalance(models.Model):
         default=Decimal('0.0'),
         validators=[MinValueValidator(Decimal('0.0'))]
     )
+    # Part of allocated_days carried over from the previous year
+    carried_forward_days = models.DecimalField(max_digits=5, decimal_places=1, default=Decimal('0.0'))
+    # Part of allocated_days accrued from the type's entitlement so far,
+    # and the last month it covers
+    accrued_days = models.DecimalField(max_digits=5, decimal_places=1, default=Decimal('0.0'))
+    accrued_through_month = models.PositiveSmallIntegerField(default=12)
+    snapshot_at = models.DateTimeField(null=True, blank=True)  # Last ledger fold
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TimeOffBalanceQuerySet.as_manager()
+
     class Meta:
         db_table = 'timeoff_balances'
         verbose_name = 'Time Off Balance'
@@ -75,10 +133,93 @@ class TimeOffBalance(models.Model):
     def __str__(self):
         return f"{self.user.full_name} - {self.timeoff_type.code} {self.year}"
 
+    def _load_pending(self):
+        """Fetch the with_pending() annotations for an un-annotated instance"""
+        if not hasattr(self, 'pending_allocated_days'):
+            self.pending_allocated_days, self.pending_usage_days = TimeOffBalance.objects.with_pending().filter(
+                pk=self.pk
+            ).values_list('pending_allocated_days', 'pending_usage_days').first() or (Decimal('0.0'), Decimal('0.0'))
+
+    @property
+    def current_allocated_days(self):
+        """Snapshot allocation plus accruals and adjustments since"""
+        self._load_pending()
+        return self.allocated_days + self.pending_allocated_days
+
+    @property
+    def current_used_days(self):
+        """Snapshot usage plus usage (negative entries) and reversals since"""
+        self._load_pending()
+        return self.used_days - self.pending_usage_days
+
     @property
     def available_days(self):
         """Calculate available days"""
-        return self.allocated_days - self.used_days
+        return self.current_allocated_days - self.current_used_days
+
+class WorkCalendar(models.Model):
+    """
+    Working week and holidays of a company. The calendar with an empty
+    company_name is the default for companies without their own.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    company_name = models.CharField(max_length=255, blank=True, unique=True)
+    name = models.CharField(max_length=255)
+    weekend_days = models.CharField(
+        max_length=13,
+        default='5,6',
+        help_text='Comma-separated weekdays off (0 = Monday, 6 = Sunday)'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # Also bumped on holiday changes
+
+    class Meta:
+        db_table = 'timeoff_work_calendars'
+        verbose_name = 'Work Calendar'
+        verbose_name_plural = 'Work Calendars'
+        ordering = ['company_name']
+
+    def __str__(self):
+        return f"{self.name} ({self.company_name or 'default'})"
+
+    @property
+    def weekend(self):
+        """Weekdays off as a set of ints"""
+        return {int(day) for day in self.weekend_days.split(',') if day.strip()}
+
+    def clean(self):
+        from django.core.exceptions import ValidationError
+
+        try:
+            weekend = self.weekend
+        except ValueError:
+            weekend = None
+        if weekend is None or not weekend <= set(range(7)) or len(weekend) == 7:
+            raise ValidationError({'weekend_days': 'Use comma-separated weekdays from 0 (Monday) to 6 (Sunday).'})
+
+class Holiday(models.Model):
+    """
+    Public holiday in a work calendar, optionally a half day
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    calendar = models.ForeignKey(
+        WorkCalendar,
+        on_delete=models.CASCADE,
+        related_name='holidays'
+    )
+    date = models.DateField()
+    name = models.CharField(max_length=255)
+    is_half_day = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'timeoff_holidays'
+        verbose_name = 'Holiday'
+        verbose_name_plural = 'Holidays'
+        ordering = ['date']
+        unique_together = ['calendar', 'date']
+
+    def __str__(self):
+        return f"{self.name} ({self.date})"
 
 class TimeOffRequest(models.Model):
     """
@@ -88,6 +229,7 @@ class TimeOffRequest(models.Model):
         ('PENDING', 'Pending'),
         ('APPROVED', 'Approved'),
         ('REJECTED', 'Rejected'),
+        ('CANCELLED', 'Cancelled'),
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -103,6 +245,8 @@ class TimeOffRequest(models.Model):
     )
     start_date = models.DateField()
     end_date = models.DateField()
+    start_half_day = models.BooleanField(default=False)  # Leave starts at midday
+    end_half_day = models.BooleanField(default=False)  # Leave ends at midday
     allocation_days = models.DecimalField(
         max_digits=5,
         decimal_places=1,
@@ -143,22 +287,25 @@ class TimeOffRequest(models.Model):
         indexes = [
             models.Index(fields=['employee', 'status']),
             models.Index(fields=['status', 'created_at']),
+            # Keyset pagination order for the admin list
+            models.Index(fields=['-created_at', 'id']),
+            # Date-range overlap probe per employee
+            models.Index(fields=['employee', 'start_date', 'end_date']),
         ]
 
     def __str__(self):
         return f"{self.employee.full_name} - {self.timeoff_type.code} ({self.start_date} to {self.end_date})"
 
     @staticmethod
-    def calculate_days(start_date, end_date):
+    def calculate_days(start_date, end_date, company_name='', start_half_day=False, end_half_day=False):
         """
-        Calculate number of days between start and end date (inclusive)
-        Can be extended to exclude weekends/holidays
+        Calculate number of working days between start and end date (inclusive)
+        in the company's work calendar: weekends and holidays are skipped and
+        half days count 0.5
         """
-        if end_date < start_date:
-            raise ValueError("End date must be after start date")
-        
-        delta = end_date - start_date
-        return Decimal(str(delta.days + 1))  # +1 to include both start and end dates
+        from timeoff.workdays import working_days
+
+        return working_days(start_date, end_date, company_name, start_half_day, end_half_day)
 
     def clean(self):
         """Validate the request"""
@@ -169,8 +316,119 @@ class TimeOffRequest(models.Model):
         
         # Auto-calculate allocation_days if not provided
         if not self.allocation_days:
-            self.allocation_days = self.calculate_days(self.start_date, self.end_date)
+            self.allocation_days = self.calculate_days(
+                self.start_date, self.end_date, self.employee.company_name,
+                self.start_half_day, self.end_half_day
+            )
 
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+
+class LeaveDay(models.Model):
+    """
+    One row per charged day (working days in the employee's work calendar)
+    of an approved time off request, kept in sync on approve/reject and on
+    calendar changes, so "who is out on day X" is an indexed lookup.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    request = models.ForeignKey(
+        TimeOffRequest,
+        on_delete=models.CASCADE,
+        related_name='leave_days'
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='leave_days'
+    )
+    timeoff_type = models.ForeignKey(
+        TimeOffType,
+        on_delete=models.CASCADE,
+        related_name='leave_days'
+    )
+    day = models.DateField()
+
+    class Meta:
+        db_table = 'timeoff_leave_days'
+        verbose_name = 'Leave Day'
+        verbose_name_plural = 'Leave Days'
+        ordering = ['day']
+        indexes = [
+            models.Index(fields=['day', 'user']),
+            models.Index(fields=['user', 'day']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['request', 'day'], name='unique_leave_day_per_request'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.full_name} - {self.timeoff_type.code} {self.day}"
+
+class TimeOffLedgerEntry(models.Model):
+    """
+    Append-only record of a change to a balance. days is the signed effect
+    on the available days: accruals and reversals add, usage subtracts,
+    adjustments may do either. Entries are inserted, never updated, apart
+    from is_applied, which marks them as folded into the balance snapshot.
+    """
+    ENTRY_TYPE_CHOICES = [
+        ('ACCRUAL', 'Accrual'),
+        ('USAGE', 'Usage'),
+        ('ADJUSTMENT', 'Adjustment'),
+        ('REVERSAL', 'Reversal'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    balance = models.ForeignKey(
+        TimeOffBalance,
+        on_delete=models.CASCADE,
+        related_name='ledger_entries'
+    )
+    entry_type = models.CharField(max_length=20, choices=ENTRY_TYPE_CHOICES)
+    days = models.DecimalField(max_digits=5, decimal_places=1)
+    request = models.ForeignKey(
+        TimeOffRequest,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='ledger_entries'
+    )
+    reverses = models.OneToOneField(
+        'self',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='reversal'
+    )
+    note = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='timeoff_ledger_entries'
+    )
+    is_applied = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'timeoff_ledger_entries'
+        verbose_name = 'Time Off Ledger Entry'
+        verbose_name_plural = 'Time Off Ledger Entries'
+        ordering = ['created_at']
+        indexes = [
+            # Entries still to be added on read / folded into the snapshot
+            models.Index(fields=['balance'], condition=models.Q(is_applied=False), name='ledger_unapplied_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entry_type} {self.days} ({self.balance_id})"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Ledger entries are append-only; record an ADJUSTMENT or REVERSAL instead.')
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError('Ledger entries are append-only; record an ADJUSTMENT or REVERSAL instead.')
@@ -3,6 +3,8 @@ from django.db import transaction
 from django.utils import timezone
 from decimal import Decimal
 from timeoff.models import TimeOffType, TimeOffBalance, TimeOffRequest
+from timeoff.bulk import BULK_ACTIONS, BULK_REVIEW_MAX
+from timeoff.utils import find_overlapping_request, overlap_error
 
 class TimeOffTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -13,6 +15,18 @@ class TimeOffBalanceSerializer(serializers.ModelSerializer):
     type_id = serializers.UUIDField(source='timeoff_type.id', read_only=True)
     type_code = serializers.CharField(source='timeoff_type.code', read_only=True)
     type_name = serializers.CharField(source='timeoff_type.name', read_only=True)
+    allocated_days = serializers.DecimalField(
+        source='current_allocated_days',
+        max_digits=5,
+        decimal_places=1,
+        read_only=True
+    )
+    used_days = serializers.DecimalField(
+        source='current_used_days',
+        max_digits=5,
+        decimal_places=1,
+        read_only=True
+    )
     available_days = serializers.DecimalField(
         max_digits=5,
         decimal_places=1,
@@ -23,9 +37,9 @@ class TimeOffBalanceSerializer(serializers.ModelSerializer):
         model = TimeOffBalance
         fields = [
             'id', 'type_id', 'type_code', 'type_name', 'year',
-            'allocated_days', 'used_days', 'available_days'
+            'allocated_days', 'carried_forward_days', 'used_days', 'available_days'
         ]
-        read_only_fields = ['id', 'used_days']
+        read_only_fields = ['id', 'used_days', 'carried_forward_days']
 
 class TimeOffRequestListSerializer(serializers.ModelSerializer):
     """
@@ -42,8 +56,8 @@ class TimeOffRequestListSerializer(serializers.ModelSerializer):
         model = TimeOffRequest
         fields = [
             'id', 'employee_id', 'employee_name', 'timeoff_type_name', 'timeoff_type_code',
-            'start_date', 'end_date', 'allocation_days', 'status',
-            'approved_by_name', 'rejection_reason', 'attachment_url',
+            'start_date', 'end_date', 'start_half_day', 'end_half_day',
+            'allocation_days', 'status', 'approved_by_name', 'rejection_reason', 'attachment_url',
             'created_at', 'updated_at'
         ]
 
@@ -72,7 +86,7 @@ class TimeOffRequestCreateSerializer(serializers.ModelSerializer):
         model = TimeOffRequest
         fields = [
             'timeoff_type', 'start_date', 'end_date',
-            'allocation_days', 'attachment'
+            'start_half_day', 'end_half_day', 'allocation_days', 'attachment'
         ]
 
     def validate(self, data):
@@ -85,9 +99,21 @@ class TimeOffRequestCreateSerializer(serializers.ModelSerializer):
                 'end_date': 'End date must be after or equal to start date.'
             })
 
-        # Auto-calculate allocation_days if not provided
+        # Reject overlap with the employee's pending or approved leave
+        overlapping = find_overlapping_request(self.context['request'].user, start_date, end_date)
+        if overlapping:
+            raise serializers.ValidationError({'start_date': overlap_error(overlapping)})
+
+        # Auto-calculate allocation_days in working days if not provided
         if not data.get('allocation_days'):
-            data['allocation_days'] = TimeOffRequest.calculate_days(start_date, end_date)
+            data['allocation_days'] = TimeOffRequest.calculate_days(
+                start_date, end_date, self.context['request'].user.company_name,
+                data.get('start_half_day', False), data.get('end_half_day', False)
+            )
+            if not data['allocation_days']:
+                raise serializers.ValidationError({
+                    'end_date': 'The selected dates contain no working days.'
+                })
 
         return data
 
@@ -105,7 +131,17 @@ class TimeOffRequestCreateSerializer(serializers.ModelSerializer):
         validated_data['requested_by'] = user
         validated_data['status'] = 'PENDING'
 
-        return TimeOffRequest.objects.create(**validated_data)
+        with transaction.atomic():
+            # Re-check under the employee lock so concurrent submissions
+            # cannot both pass validate()
+            overlapping = find_overlapping_request(
+                user, validated_data['start_date'], validated_data['end_date'], lock=True
+            )
+            if overlapping:
+                # Same shape as the validate() error in serializer.errors
+                raise serializers.ValidationError({'start_date': [overlap_error(overlapping)]})
+
+            return TimeOffRequest.objects.create(**validated_data)
 
 class TimeOffRequestDetailSerializer(serializers.ModelSerializer):
     """
@@ -124,8 +160,8 @@ class TimeOffRequestDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'employee_id', 'employee_name',
             'timeoff_type', 'timeoff_type_name', 'timeoff_type_code',
-            'start_date', 'end_date', 'allocation_days',
-            'status', 'requested_by_name', 'approved_by_name',
+            'start_date', 'end_date', 'start_half_day', 'end_half_day',
+            'allocation_days', 'status', 'requested_by_name', 'approved_by_name',
             'rejection_reason', 'attachment_url',
             'created_at', 'updated_at'
         ]
@@ -144,3 +180,19 @@ class MyTimeOffResponseSerializer(serializers.Serializer):
     """
     balances = TimeOffBalanceSerializer(many=True, read_only=True)
     requests = TimeOffRequestListSerializer(many=True, read_only=True)
+
+class BulkReviewItemSerializer(serializers.Serializer):
+    """One decision in a bulk review"""
+    id = serializers.UUIDField()
+    action = serializers.ChoiceField(choices=list(BULK_ACTIONS))
+    rejection_reason = serializers.CharField(required=False, allow_blank=True, default='')
+
+class BulkReviewSerializer(serializers.Serializer):
+    """
+    Request serializer for bulk approve/reject
+    """
+    actions = serializers.ListField(
+        child=BulkReviewItemSerializer(),
+        allow_empty=False,
+        max_length=BULK_REVIEW_MAX
+    )
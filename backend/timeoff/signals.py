@@ -0,0 +1,65 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from dayflow_core.response_cache import invalidate_all_responses, invalidate_user_responses
+from timeoff.models import Holiday, TimeOffBalance, TimeOffLedgerEntry, TimeOffRequest, TimeOffType, WorkCalendar
+from timeoff.utils import resync_calendar_leave_days, sync_leave_days
+
+
+@receiver([post_save, post_delete], sender=TimeOffBalance)
+def balance_changed(sender, instance, **kwargs):
+    invalidate_user_responses(instance.user_id)
+
+
+@receiver(post_save, sender=TimeOffLedgerEntry)
+def ledger_entry_added(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_user_responses(instance.balance.user_id)
+
+
+@receiver([post_save, post_delete], sender=TimeOffRequest)
+def request_changed(sender, instance, **kwargs):
+    invalidate_user_responses(instance.employee_id)
+
+
+@receiver(post_save, sender=TimeOffRequest)
+def request_saved(sender, instance, created, raw=False, **kwargs):
+    # Approvals through the API update in bulk and sync the calendar
+    # themselves; this covers saves from the admin, reject and seed commands
+    if raw or (created and instance.status != 'APPROVED'):
+        return
+    sync_leave_days([instance])
+
+
+@receiver([post_save, post_delete], sender=TimeOffType)
+def type_changed(sender, instance, **kwargs):
+    # Type names appear in every user's balances and requests
+    invalidate_all_responses()
+
+
+@receiver(pre_save, sender=Holiday)
+def holiday_saving(sender, instance, raw=False, **kwargs):
+    # A moved holiday frees its old date
+    if not raw:
+        instance._previous_date = Holiday.objects.filter(pk=instance.pk).values_list('date', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Holiday)
+def holiday_changed(sender, instance, raw=False, **kwargs):
+    # Working-day indexes are keyed on the calendar's updated_at
+    if raw:
+        return
+    WorkCalendar.objects.filter(pk=instance.calendar_id).update(updated_at=timezone.now())
+    # Leave on the holiday's date (old and new when moved) is charged differently now
+    calendar = WorkCalendar.objects.filter(pk=instance.calendar_id).first()
+    if calendar is not None:
+        dates = [instance.date, getattr(instance, '_previous_date', None) or instance.date]
+        resync_calendar_leave_days(calendar, min(dates), max(dates))
+
+
+@receiver([post_save, post_delete], sender=WorkCalendar)
+def calendar_changed(sender, instance, raw=False, **kwargs):
+    # The weekend, or which calendar the company's employees use, changed
+    if not raw:
+        resync_calendar_leave_days(instance)
@@ -0,0 +1,332 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient, APIRequestFactory
+
+from accounts.bulk_import import import_employees
+from accounts.models import User
+from timeoff.accrual import entitlement, new_balances
+from timeoff.bulk import bulk_review
+from timeoff.models import (
+    Holiday, LeaveDay, TimeOffBalance, TimeOffLedgerEntry, TimeOffRequest, TimeOffType, WorkCalendar
+)
+from timeoff.serializers import TimeOffRequestCreateSerializer
+from timeoff.utils import get_or_create_balance
+
+
+def create_user(index, role='EMPLOYEE'):
+    return User.objects.create_user(
+        email=f'user{index}@example.com',
+        password='pass12345',
+        company_name='Odoo',
+        full_name=f'User {index}',
+        phone='1234567890',
+        role=role
+    )
+
+
+def create_type(code='PAID', allocation='3.0', accrual_method='ANNUAL'):
+    return TimeOffType.objects.create(
+        code=code,
+        name=code.title(),
+        default_annual_allocation_days=Decimal(allocation),
+        accrual_method=accrual_method
+    )
+
+
+def create_request(employee, timeoff_type, start_date, end_date, days):
+    return TimeOffRequest.objects.create(
+        employee=employee,
+        timeoff_type=timeoff_type,
+        start_date=start_date,
+        end_date=end_date,
+        allocation_days=Decimal(days),
+        requested_by=employee
+    )
+
+
+def approve_url(timeoff_request):
+    return f'/api/timeoff/admin/{timeoff_request.pk}/approve/'
+
+
+class ApprovalTests(TestCase):
+
+    def setUp(self):
+        self.admin = create_user(1, role='ADMIN')
+        self.employee = create_user(2)
+        self.timeoff_type = create_type()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_second_approval_over_balance_is_rejected(self):
+        first = create_request(self.employee, self.timeoff_type, date(2026, 3, 2), date(2026, 3, 3), '2.0')
+        second = create_request(self.employee, self.timeoff_type, date(2026, 3, 9), date(2026, 3, 10), '2.0')
+
+        self.assertEqual(self.client.post(approve_url(first)).status_code, 200)
+        response = self.client.post(approve_url(second))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['error'], 'INSUFFICIENT_BALANCE')
+
+        second.refresh_from_db()
+        self.assertEqual(second.status, 'PENDING')
+        balance = TimeOffBalance.objects.get(user=self.employee, timeoff_type=self.timeoff_type, year=2026)
+        self.assertEqual(balance.available_days, Decimal('1.0'))
+
+
+class OverlapTests(TestCase):
+    url = '/api/timeoff/me/'
+
+    def setUp(self):
+        self.employee = create_user(1)
+        self.timeoff_type = create_type(allocation='20.0')
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+        # Monday 9 to Friday 13 March
+        self.existing = create_request(self.employee, self.timeoff_type, date(2026, 3, 9), date(2026, 3, 13), '5.0')
+
+    def submit(self, start_date, end_date):
+        return self.client.post(self.url, {
+            'timeoff_type': str(self.timeoff_type.pk),
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+        })
+
+    def assert_overlap_rejected(self, response, status_name='pending'):
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['start_date'],
+            [f'Overlaps your {status_name} request from 2026-03-09 to 2026-03-13.']
+        )
+
+    def test_overlapping_pending_request_is_rejected(self):
+        for start_date, end_date in [
+            (date(2026, 3, 12), date(2026, 3, 17)),  # Starts inside
+            (date(2026, 3, 5), date(2026, 3, 9)),  # Ends on the first day
+            (date(2026, 3, 10), date(2026, 3, 11)),  # Inside
+            (date(2026, 3, 6), date(2026, 3, 16)),  # Encloses
+        ]:
+            with self.subTest(start_date=start_date, end_date=end_date):
+                self.assert_overlap_rejected(self.submit(start_date, end_date))
+        self.assertEqual(TimeOffRequest.objects.count(), 1)
+
+    def test_overlapping_approved_request_is_rejected(self):
+        TimeOffRequest.objects.filter(pk=self.existing.pk).update(status='APPROVED')
+        self.assert_overlap_rejected(self.submit(date(2026, 3, 13), date(2026, 3, 16)), 'approved')
+
+    def test_touching_ranges_are_accepted(self):
+        self.assertEqual(self.submit(date(2026, 3, 5), date(2026, 3, 8)).status_code, 201)
+        self.assertEqual(self.submit(date(2026, 3, 14), date(2026, 3, 17)).status_code, 201)
+
+    def test_rejected_and_cancelled_requests_do_not_block(self):
+        for status_name in ['REJECTED', 'CANCELLED']:
+            with self.subTest(status=status_name):
+                TimeOffRequest.objects.filter(employee=self.employee).update(status=status_name)
+                self.assertEqual(self.submit(date(2026, 3, 9), date(2026, 3, 13)).status_code, 201)
+
+    def test_create_rechecks_after_validation(self):
+        request = APIRequestFactory().post(self.url)
+        request.user = self.employee
+        serializer = TimeOffRequestCreateSerializer(
+            data={'timeoff_type': str(self.timeoff_type.pk), 'start_date': '2026-03-16', 'end_date': '2026-03-17'},
+            context={'request': request}
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        # A concurrent submission commits in between
+        create_request(self.employee, self.timeoff_type, date(2026, 3, 17), date(2026, 3, 18), '2.0')
+
+        with self.assertRaises(ValidationError) as raised:
+            serializer.save()
+        self.assertEqual(
+            raised.exception.detail['start_date'],
+            ['Overlaps your pending request from 2026-03-17 to 2026-03-18.']
+        )
+        self.assertEqual(TimeOffRequest.objects.count(), 2)
+
+
+class CancelTests(TestCase):
+
+    def setUp(self):
+        self.admin = create_user(1, role='ADMIN')
+        self.employee = create_user(2)
+        self.timeoff_type = create_type()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def cancel(self, timeoff_request):
+        return self.client.post(f'/api/timeoff/admin/{timeoff_request.pk}/cancel/')
+
+    def legacy_approved_request(self):
+        # Approved before the ledger existed: no USAGE entry
+        timeoff_request = create_request(self.employee, self.timeoff_type, date(2026, 3, 2), date(2026, 3, 3), '2.0')
+        TimeOffRequest.objects.filter(pk=timeoff_request.pk).update(status='APPROVED')
+        return timeoff_request
+
+    def test_cancel_gives_days_back(self):
+        timeoff_request = create_request(self.employee, self.timeoff_type, date(2026, 3, 2), date(2026, 3, 3), '2.0')
+        self.client.post(approve_url(timeoff_request))
+        self.assertEqual(self.cancel(timeoff_request).status_code, 200)
+        balance = TimeOffBalance.objects.get(user=self.employee, timeoff_type=self.timeoff_type, year=2026)
+        self.assertEqual(balance.available_days, Decimal('3.0'))
+
+    def test_cancel_legacy_request_reverses_into_its_balance(self):
+        timeoff_request = self.legacy_approved_request()
+        TimeOffBalance.objects.create(
+            user=self.employee, timeoff_type=self.timeoff_type, year=2026,
+            allocated_days=Decimal('3.0'), used_days=Decimal('2.0')
+        )
+        self.assertEqual(self.cancel(timeoff_request).status_code, 200)
+        reversal = TimeOffLedgerEntry.objects.get(request=timeoff_request)
+        self.assertEqual((reversal.entry_type, reversal.reverses), ('REVERSAL', None))
+
+    def test_cancel_legacy_request_without_balance_is_a_conflict(self):
+        timeoff_request = self.legacy_approved_request()
+        response = self.cancel(timeoff_request)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['error'], 'BALANCE_NOT_FOUND')
+        timeoff_request.refresh_from_db()
+        self.assertEqual(timeoff_request.status, 'APPROVED')
+        self.assertFalse(TimeOffLedgerEntry.objects.exists())
+
+
+class LeaveDayTests(TestCase):
+
+    def setUp(self):
+        self.admin = create_user(1, role='ADMIN')
+        self.employee = create_user(2)
+        self.timeoff_type = create_type(allocation='20.0')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def approve_week(self):
+        # Monday to Sunday
+        timeoff_request = create_request(self.employee, self.timeoff_type, date(2026, 3, 2), date(2026, 3, 8), '5.0')
+        self.assertEqual(self.client.post(approve_url(timeoff_request)).status_code, 200)
+        return timeoff_request
+
+    def leave_days(self):
+        return list(LeaveDay.objects.filter(user=self.employee).values_list('day', flat=True))
+
+    def test_only_charged_days_are_materialized(self):
+        self.approve_week()
+        self.assertEqual(self.leave_days(), [date(2026, 3, day) for day in range(2, 7)])
+
+    def test_holiday_changes_resync_approved_leave(self):
+        self.approve_week()
+        calendar = WorkCalendar.objects.create(company_name='Odoo', name='Odoo')
+        holiday = Holiday.objects.create(calendar=calendar, date=date(2026, 3, 4), name='Holiday')
+        self.assertNotIn(date(2026, 3, 4), self.leave_days())
+
+        holiday.date = date(2026, 3, 5)
+        holiday.save()
+        self.assertIn(date(2026, 3, 4), self.leave_days())
+        self.assertNotIn(date(2026, 3, 5), self.leave_days())
+
+        holiday.delete()
+        self.assertEqual(len(self.leave_days()), 5)
+
+    def test_weekend_change_resyncs_approved_leave(self):
+        self.approve_week()
+        calendar = WorkCalendar.objects.create(name='Default', weekend_days='4,5')
+        self.assertEqual(self.leave_days(), [date(2026, 3, day) for day in (2, 3, 4, 5, 8)])
+        calendar.delete()
+        self.assertEqual(self.leave_days(), [date(2026, 3, day) for day in range(2, 7)])
+
+
+class NewBalanceTests(TestCase):
+
+    def setUp(self):
+        self.employee = create_user(1)
+        self.monthly = create_type('SICK', allocation='12.0', accrual_method='MONTHLY')
+        self.annual = create_type('PAID', allocation='20.0')
+
+    def assert_accrued(self, balance, days, through):
+        self.assertEqual(balance.allocated_days, Decimal(days))
+        self.assertEqual(balance.accrued_days, Decimal(days))
+        self.assertEqual(balance.accrued_through_month, through)
+
+    def test_monthly_type_accrues_through_current_month(self):
+        [balance] = new_balances(self.monthly, 2026, [self.employee], as_of=date(2026, 4, 15))
+        self.assert_accrued(balance, '4.0', 4)
+
+    def test_joiners_get_pro_rata_share(self):
+        self.employee.date_of_joining = date(2026, 3, 10)
+        [monthly] = new_balances(self.monthly, 2026, [self.employee], as_of=date(2026, 4, 15))
+        [annual] = new_balances(self.annual, 2026, [self.employee], as_of=date(2026, 4, 15))
+        self.assert_accrued(monthly, '2.0', 4)
+        self.assert_accrued(annual, '16.5', 12)
+
+    def test_unused_days_carry_forward_up_to_cap(self):
+        self.annual.carry_forward_max_days = Decimal('3.0')
+        TimeOffBalance.objects.create(
+            user=self.employee, timeoff_type=self.annual, year=2025, allocated_days=Decimal('20.0'), used_days=Decimal('15.0')
+        )
+        [balance] = new_balances(self.annual, 2026, [self.employee], as_of=date(2026, 1, 5))
+        self.assertEqual(balance.carried_forward_days, Decimal('3.0'))
+        self.assertEqual(balance.allocated_days, Decimal('23.0'))
+
+    def test_lazily_created_balances_follow_accrual(self):
+        today = timezone.localdate()
+        balance = get_or_create_balance(self.employee, self.monthly, today.year)
+        self.assert_accrued(balance, entitlement(self.monthly, today.month), today.month)
+
+    def test_bulk_review_creates_accrued_balance(self):
+        today = timezone.localdate()
+        timeoff_request = create_request(self.employee, self.monthly, today, today, '0.5')
+        bulk_review([{'id': timeoff_request.pk, 'action': 'approve'}], create_user(2, role='HR'))
+        balance = TimeOffBalance.objects.get(user=self.employee, timeoff_type=self.monthly, year=today.year)
+        self.assert_accrued(balance, entitlement(self.monthly, today.month), today.month)
+
+    def test_bulk_import_creates_accrued_balances(self):
+        import_employees([{
+            'email': 'new1@example.com',
+            'full_name': 'New Person',
+            'phone': '1234567890',
+            'company_name': 'Odoo',
+        }])
+        # Joined today: one month so far
+        balance = TimeOffBalance.objects.get(user__email='new1@example.com', timeoff_type=self.monthly)
+        self.assert_accrued(balance, '1.0', timezone.localdate().month)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class ConcurrentApprovalTests(TransactionTestCase):
+    """Two approvals racing for a balance that covers only one"""
+
+    def setUp(self):
+        self.admin = create_user(1, role='ADMIN')
+        self.employee = create_user(2)
+        self.timeoff_type = create_type()
+        self.requests = [
+            create_request(self.employee, self.timeoff_type, date(2026, 3, 2), date(2026, 3, 3), '2.0'),
+            create_request(self.employee, self.timeoff_type, date(2026, 3, 9), date(2026, 3, 10), '2.0'),
+        ]
+        self.start = threading.Barrier(len(self.requests))
+
+    def approve(self, timeoff_request):
+        try:
+            client = APIClient()
+            client.force_authenticate(self.admin)
+            self.start.wait()
+            return client.post(approve_url(timeoff_request)).status_code
+        finally:
+            connection.close()
+
+    def test_only_one_approval_is_charged(self):
+        with ThreadPoolExecutor(max_workers=len(self.requests)) as pool:
+            statuses = list(pool.map(self.approve, self.requests))
+
+        self.assertEqual(sorted(statuses), [200, 400])
+        self.assertEqual(
+            TimeOffRequest.objects.filter(employee=self.employee, status='APPROVED').count(), 1
+        )
+        self.assertEqual(
+            TimeOffLedgerEntry.objects.filter(balance__user=self.employee, entry_type='USAGE').count(), 1
+        )
+        balance = TimeOffBalance.objects.get(user=self.employee, timeoff_type=self.timeoff_type, year=2026)
+        self.assertEqual(balance.available_days, Decimal('1.0'))
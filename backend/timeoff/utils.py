@@ -1,18 +1,31 @@
-from decimal import Decimal
-from timeoff.models import TimeOffBalance
+from django.db.models.functions import Lower
+from accounts.models import User
+from timeoff.accrual import new_balances
+from timeoff.models import LeaveDay, TimeOffBalance, TimeOffRequest, WorkCalendar
+from timeoff.workdays import WorkingDayCalculator
+
+LEAVE_DAY_BATCH_SIZE = 1000
+CALENDAR_MAX_DAYS = 92
 
 def get_or_create_balance(user, timeoff_type, year):
     """
     Get or create a TimeOffBalance for a user, type, and year.
-    If creating, uses the default allocation from TimeOffType.
+    If creating, uses the entitlement accrued so far (see accrual.new_balances).
     """
+    balance = TimeOffBalance.objects.filter(user=user, timeoff_type=timeoff_type, year=year).first()
+    if balance is None:
+        balance = _create_balance(new_balances(timeoff_type, year, [user])[0])
+    return balance
+
+def _create_balance(new):
+    """Insert an unsaved balance, or return the one created concurrently"""
     balance, created = TimeOffBalance.objects.get_or_create(
-        user=user,
-        timeoff_type=timeoff_type,
-        year=year,
+        user=new.user,
+        timeoff_type=new.timeoff_type,
+        year=new.year,
         defaults={
-            'allocated_days': timeoff_type.default_annual_allocation_days,
-            'used_days': Decimal('0.0')
+            field: getattr(new, field)
+            for field in ['allocated_days', 'used_days', 'carried_forward_days', 'accrued_days', 'accrued_through_month']
         }
     )
     return balance
@@ -32,6 +45,95 @@ def validate_balance_for_request(balance, requested_days):
     
     return None
 
+def find_overlapping_request(employee, start_date, end_date, lock=False):
+    """
+    The employee's earliest pending or approved request overlapping
+    start_date..end_date (inclusive), or None. A single probe of the
+    (employee, start_date, end_date) index.
+    With lock=True (inside a transaction) the employee row is locked first,
+    so concurrent creators for the same employee check and insert one at a
+    time and cannot both pass.
+    """
+    if lock:
+        User.objects.select_for_update().filter(pk=employee.pk).values_list('pk', flat=True).first()
+    return TimeOffRequest.objects.filter(
+        employee=employee,
+        status__in=['PENDING', 'APPROVED'],
+        start_date__lte=end_date,
+        end_date__gte=start_date
+    ).only('id', 'start_date', 'end_date', 'status').order_by('start_date').first()
+
+def overlap_error(overlapping):
+    """Validation message for a request overlapping an existing one"""
+    return (
+        f"Overlaps your {overlapping.status.lower()} request from "
+        f"{overlapping.start_date} to {overlapping.end_date}."
+    )
+
+def sync_leave_days(requests, calculator=None):
+    """
+    Rebuild the LeaveDay rows of the given requests: one per day charged
+    for approved requests (working days in the employee's work calendar,
+    see WorkingDayCalculator.working_dates), none otherwise. One DELETE and
+    one bulk INSERT for any number of requests.
+    """
+    LeaveDay.objects.filter(request__in=[r.pk for r in requests]).delete()
+    approved = [r for r in requests if r.status == 'APPROVED']
+    if not approved:
+        return
+
+    calculator = calculator or WorkingDayCalculator()
+    companies = dict(
+        User.objects.filter(pk__in={r.employee_id for r in approved}).values_list('pk', 'company_name')
+    )
+    LeaveDay.objects.bulk_create(
+        [
+            LeaveDay(
+                request_id=r.pk,
+                user_id=r.employee_id,
+                timeoff_type_id=r.timeoff_type_id,
+                day=day
+            )
+            for r in approved
+            for day in calculator.working_dates(r.start_date, r.end_date, companies[r.employee_id])
+        ],
+        batch_size=LEAVE_DAY_BATCH_SIZE
+    )
+
+def resync_calendar_leave_days(calendar, start_date=None, end_date=None):
+    """
+    Rebuild the LeaveDay rows of approved requests by employees the work
+    calendar applies to (only those overlapping start_date..end_date when
+    given), after its weekend or holidays changed or it was added or
+    removed. The default calendar applies to companies without their own.
+    Returns the number of requests synced.
+    """
+    approved = TimeOffRequest.objects.filter(status='APPROVED')
+    if calendar.company_name:
+        approved = approved.filter(employee__company_name__iexact=calendar.company_name)
+    else:
+        own_calendars = WorkCalendar.objects.exclude(company_name='').annotate(
+            company=Lower('company_name')
+        ).values_list('company', flat=True)
+        approved = approved.annotate(company=Lower('employee__company_name')).exclude(company__in=list(own_calendars))
+    if start_date is not None:
+        approved = approved.filter(start_date__lte=end_date, end_date__gte=start_date)
+
+    calculator = WorkingDayCalculator()
+    approved = approved.only('id', 'employee_id', 'timeoff_type_id', 'start_date', 'end_date', 'status')
+    batch = []
+    synced = 0
+    for timeoff_request in approved.iterator(chunk_size=LEAVE_DAY_BATCH_SIZE):
+        batch.append(timeoff_request)
+        if len(batch) >= LEAVE_DAY_BATCH_SIZE:
+            sync_leave_days(batch, calculator)
+            synced += len(batch)
+            batch = []
+    if batch:
+        sync_leave_days(batch, calculator)
+        synced += len(batch)
+    return synced
+
 def initialize_balances_for_user(user, year):
     """
     Initialize time off balances for a user for a given year.
@@ -43,15 +145,6 @@ def initialize_balances_for_user(user, year):
     balances = []
     
     for timeoff_type in active_types:
-        balance, created = TimeOffBalance.objects.get_or_create(
-            user=user,
-            timeoff_type=timeoff_type,
-            year=year,
-            defaults={
-                'allocated_days': timeoff_type.default_annual_allocation_days,
-                'used_days': Decimal('0.0')
-            }
-        )
-        balances.append(balance)
+        balances.append(get_or_create_balance(user, timeoff_type, year))
     
     return balances
@@ -6,19 +6,25 @@ from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from django.db.models import Q
+from django.utils import timezone
+from django.utils.decorators import method_decorator
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from timeoff.models import TimeOffType, TimeOffBalance, TimeOffRequest
+from timeoff.models import LeaveDay, TimeOffType, TimeOffBalance, TimeOffRequest
 from timeoff.serializers import (
     TimeOffBalanceSerializer,
     TimeOffRequestListSerializer,
     TimeOffRequestCreateSerializer,
     TimeOffRequestDetailSerializer,
-    MyTimeOffResponseSerializer
+    MyTimeOffResponseSerializer,
+    BulkReviewSerializer
 )
 from timeoff.permissions import IsAdminOrHR
-from timeoff.utils import get_or_create_balance, validate_balance_for_request
+from dayflow_core.response_cache import cache_response, invalidate_user_responses
+from timeoff.bulk import bulk_review
+from timeoff.ledger import BalanceNotFound, lock_balance, record_usage, reverse_request_usage
+from timeoff.utils import CALENDAR_MAX_DAYS, get_or_create_balance, sync_leave_days, validate_balance_for_request
 
 class MyTimeOffView(APIView):
     """
@@ -30,6 +36,7 @@ class MyTimeOffView(APIView):
     """
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(cache_response('my-timeoff', daily=True))
     def get(self, request):
         user = request.user
         year = request.query_params.get('year')
@@ -45,7 +52,7 @@ class MyTimeOffView(APIView):
         balances = TimeOffBalance.objects.filter(
             user=user,
             year=year
-        ).select_related('timeoff_type')
+        ).select_related('timeoff_type').with_pending()
 
         # Get requests
         requests_qs = TimeOffRequest.objects.filter(
@@ -88,7 +95,7 @@ class MyTimeOffView(APIView):
                 balances = TimeOffBalance.objects.filter(
                     user=request.user,
                     year=year
-                ).select_related('timeoff_type')
+                ).select_related('timeoff_type').with_pending()
 
                 # Return created request and updated balances
                 request_serializer = TimeOffRequestDetailSerializer(
@@ -109,6 +116,7 @@ class AdminTimeOffListView(generics.ListAPIView):
     """
     GET /api/timeoff/admin/
     List all time off requests (Admin/HR only)
+    Cursor paginated, newest first. Query params: cursor, page_size
     """
     serializer_class = TimeOffRequestListSerializer
     permission_classes = [IsAuthenticated, IsAdminOrHR]
@@ -154,51 +162,60 @@ def approve_timeoff_request(request, request_id):
     POST /api/timeoff/admin/<uuid:request_id>/approve/
     Approve a time off request
     """
-    timeoff_request = get_object_or_404(TimeOffRequest, id=request_id)
-
-    if timeoff_request.status != 'PENDING':
-        return Response(
-            {
-                'error': 'INVALID_STATUS',
-                'detail': f'Cannot approve request with status: {timeoff_request.status}'
-            },
-            status=status.HTTP_400_BAD_REQUEST
+    with transaction.atomic():
+        # Lock the request so concurrent approvers see each other's decision
+        timeoff_request = get_object_or_404(
+            TimeOffRequest.objects.select_for_update(of=('self',)).select_related('employee', 'timeoff_type'),
+            id=request_id
         )
 
-    with transaction.atomic():
-        # Get or create balance for the year
+        if timeoff_request.status != 'PENDING':
+            return Response(
+                {
+                    'error': 'INVALID_STATUS',
+                    'detail': f'Cannot approve request with status: {timeoff_request.status}'
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Get or create balance for the year, locked so concurrent approvals
+        # against it check the available days one at a time
         year = timeoff_request.start_date.year
-        balance = get_or_create_balance(
+        balance = lock_balance(get_or_create_balance(
             timeoff_request.employee,
             timeoff_request.timeoff_type,
             year
-        )
+        ))
 
-        # Validate balance
-        validation_error = validate_balance_for_request(balance, timeoff_request.allocation_days)
-        if validation_error:
+        error = validate_balance_for_request(balance, timeoff_request.allocation_days)
+        if error:
             return Response(
                 {
                     'error': 'INSUFFICIENT_BALANCE',
-                    'detail': validation_error
+                    'detail': error
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Deduct from balance
-        balance.used_days += timeoff_request.allocation_days
-        balance.save()
+        record_usage(balance, timeoff_request, request.user)
 
-        # Update request status
+        # Update request status (the row is locked, so no re-validation needed)
         timeoff_request.status = 'APPROVED'
         timeoff_request.approved_by = request.user
-        timeoff_request.save()
+        timeoff_request.updated_at = timezone.now()
+        TimeOffRequest.objects.filter(pk=timeoff_request.pk).update(
+            status=timeoff_request.status,
+            approved_by=request.user,
+            updated_at=timeoff_request.updated_at
+        )
+        sync_leave_days([timeoff_request])
+        invalidate_user_responses(timeoff_request.employee_id)
 
         # Get updated balances for the employee
         balances = TimeOffBalance.objects.filter(
             user=timeoff_request.employee,
             year=year
-        ).select_related('timeoff_type')
+        ).select_related('timeoff_type').with_pending()
 
         # Serialize response
         request_serializer = TimeOffRequestDetailSerializer(
@@ -220,21 +237,25 @@ def reject_timeoff_request(request, request_id):
     POST /api/timeoff/admin/<uuid:request_id>/reject/
     Reject a time off request
     """
-    timeoff_request = get_object_or_404(TimeOffRequest, id=request_id)
-
-    if timeoff_request.status != 'PENDING':
-        return Response(
-            {
-                'error': 'INVALID_STATUS',
-                'detail': f'Cannot reject request with status: {timeoff_request.status}'
-            },
-            status=status.HTTP_400_BAD_REQUEST
-        )
-
     # Get rejection reason from request body
     rejection_reason = request.data.get('rejection_reason', '')
 
     with transaction.atomic():
+        # Lock the request so it cannot be rejected while being approved
+        timeoff_request = get_object_or_404(
+            TimeOffRequest.objects.select_for_update(of=('self',)).select_related('employee', 'timeoff_type'),
+            id=request_id
+        )
+
+        if timeoff_request.status != 'PENDING':
+            return Response(
+                {
+                    'error': 'INVALID_STATUS',
+                    'detail': f'Cannot reject request with status: {timeoff_request.status}'
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         # Update request status (no balance changes)
         timeoff_request.status = 'REJECTED'
         timeoff_request.approved_by = request.user
@@ -246,7 +267,7 @@ def reject_timeoff_request(request, request_id):
         balances = TimeOffBalance.objects.filter(
             user=timeoff_request.employee,
             year=year
-        ).select_related('timeoff_type')
+        ).select_related('timeoff_type').with_pending()
 
         # Serialize response
         request_serializer = TimeOffRequestDetailSerializer(
@@ -261,8 +282,98 @@ def reject_timeoff_request(request, request_id):
             'message': 'Time off request rejected'
         }, status=status.HTTP_200_OK)
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminOrHR])
+def cancel_timeoff_request(request, request_id):
+    """
+    POST /api/timeoff/admin/<uuid:request_id>/cancel/
+    Cancel an approved time off request and give its days back
+    """
+    note = request.data.get('reason', '')
+
+    with transaction.atomic():
+        # Lock the request so it cannot be cancelled twice
+        timeoff_request = get_object_or_404(
+            TimeOffRequest.objects.select_for_update(of=('self',)).select_related('employee', 'timeoff_type'),
+            id=request_id
+        )
+
+        if timeoff_request.status != 'APPROVED':
+            return Response(
+                {
+                    'error': 'INVALID_STATUS',
+                    'detail': f'Cannot cancel request with status: {timeoff_request.status}'
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Reverse the usage (an insert; the balance row is not locked)
+        try:
+            reverse_request_usage(timeoff_request, request.user, note)
+        except BalanceNotFound:
+            return Response(
+                {
+                    'error': 'BALANCE_NOT_FOUND',
+                    'detail': (
+                        f'The {timeoff_request.timeoff_type.name} balance for {timeoff_request.start_date.year} '
+                        f'no longer exists, so the days cannot be given back. Restore it and retry.'
+                    )
+                },
+                status=status.HTTP_409_CONFLICT
+            )
+
+        timeoff_request.status = 'CANCELLED'
+        timeoff_request.updated_at = timezone.now()
+        TimeOffRequest.objects.filter(pk=timeoff_request.pk).update(
+            status=timeoff_request.status,
+            updated_at=timeoff_request.updated_at
+        )
+        sync_leave_days([timeoff_request])
+        invalidate_user_responses(timeoff_request.employee_id)
+
+        year = timeoff_request.start_date.year
+        balances = TimeOffBalance.objects.filter(
+            user=timeoff_request.employee,
+            year=year
+        ).select_related('timeoff_type').with_pending()
+
+        # Serialize response
+        request_serializer = TimeOffRequestDetailSerializer(
+            timeoff_request,
+            context={'request': request}
+        )
+        balance_serializer = TimeOffBalanceSerializer(balances, many=True)
+
+        return Response({
+            'request': request_serializer.data,
+            'balances': balance_serializer.data,
+            'message': 'Time off request cancelled'
+        }, status=status.HTTP_200_OK)
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminOrHR])
+def bulk_review_timeoff_requests(request):
+    """
+    POST /api/timeoff/admin/bulk/
+    Approve or reject many time off requests at once
+    """
+    serializer = BulkReviewSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    results = bulk_review(serializer.validated_data['actions'], request.user)
+    applied = [result for result in results if 'error' not in result]
+
+    return Response({
+        'approved': sum(1 for result in applied if result['status'] == 'APPROVED'),
+        'rejected': sum(1 for result in applied if result['status'] == 'REJECTED'),
+        'failed': len(results) - len(applied),
+        'results': results
+    }, status=status.HTTP_200_OK)
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminOrHR])
+@cache_response('employee-balances', owner_kwarg='employee_id', daily=True)
 def get_employee_balances(request, employee_id):
     """
     GET /api/timeoff/admin/balances/<uuid:employee_id>/
@@ -281,7 +392,7 @@ def get_employee_balances(request, employee_id):
     balances = TimeOffBalance.objects.filter(
         user=employee,
         year=year
-    ).select_related('timeoff_type')
+    ).select_related('timeoff_type').with_pending()
 
     serializer = TimeOffBalanceSerializer(balances, many=True)
     
@@ -291,3 +402,50 @@ def get_employee_balances(request, employee_id):
         'year': year,
         'balances': serializer.data
     }, status=status.HTTP_200_OK)
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def leave_calendar(request):
+    """
+    GET /api/timeoff/calendar/?from=YYYY-MM-DD&to=YYYY-MM-DD
+    Who is on approved leave on each day of the range (default: the next 7 days)
+    Leave types are only shown to Admin/HR
+    """
+    try:
+        from_str = request.query_params.get('from')
+        first_day = datetime.strptime(from_str, '%Y-%m-%d').date() if from_str else timezone.localdate()
+        to_str = request.query_params.get('to')
+        last_day = datetime.strptime(to_str, '%Y-%m-%d').date() if to_str else first_day + timedelta(days=6)
+    except ValueError:
+        return Response(
+            {'error': 'Invalid date format. Use YYYY-MM-DD'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if last_day < first_day or (last_day - first_day).days >= CALENDAR_MAX_DAYS:
+        return Response(
+            {'error': f'"to" must be on or after "from" and at most {CALENDAR_MAX_DAYS} days later'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    show_type = request.user.role in ['ADMIN', 'HR']
+    days = {
+        first_day + timedelta(days=offset): []
+        for offset in range((last_day - first_day).days + 1)
+    }
+    leave_days = LeaveDay.objects.filter(
+        day__range=(first_day, last_day)
+    ).order_by('day', 'user__full_name').values_list(
+        'day', 'user_id', 'user__full_name', 'timeoff_type__code'
+    )
+    for day, user_id, full_name, type_code in leave_days:
+        entry = {'employee_id': user_id, 'employee_name': full_name}
+        if show_type:
+            entry['timeoff_type_code'] = type_code
+        days[day].append(entry)
+
+    return Response({
+        'from': first_day,
+        'to': last_day,
+        'days': [{'date': day, 'employees': employees} for day, employees in days.items()]
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,183 @@
+import threading
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from dayflow_core.response_cache import invalidate_user_responses
+from timeoff.models import Holiday, TimeOffRequest, WorkCalendar
+
+# Weekdays off when no work calendar is configured (Saturday, Sunday)
+DEFAULT_WEEKEND = frozenset({5, 6})
+HALF = Decimal('0.5')
+RECOMPUTE_BATCH_SIZE = 2000
+
+# Built indexes by (calendar id, calendar updated_at, year). Holiday changes
+# bump the calendar's updated_at, so an outdated index is never looked up
+# again, in this process or any other.
+INDEX_CACHE_MAX = 256
+_index_cache = {}
+_index_cache_lock = threading.Lock()
+
+
+class BusinessDayIndex:
+    """
+    Cumulative working time of one calendar year, in half days.
+
+    weights[i] is the working half days of day-of-year i (2 for a working
+    day, 1 for a half-day holiday, 0 for weekends and holidays) and
+    prefix[i] the sum of the weights before it, so the working time between
+    two dates of the year is the difference of two prefix entries.
+    """
+
+    def __init__(self, year, weekend, holidays):
+        self.first = date(year, 1, 1)
+        self.weights = []
+        self.prefix = [0]
+        for offset in range((date(year + 1, 1, 1) - self.first).days):
+            day = self.first + timedelta(days=offset)
+            if day.weekday() in weekend:
+                weight = 0
+            elif day in holidays:
+                weight = 1 if holidays[day] else 0
+            else:
+                weight = 2
+            self.weights.append(weight)
+            self.prefix.append(self.prefix[-1] + weight)
+
+    def half_days(self, start, end):
+        """Working half days from start to end, both inclusive and in this year"""
+        return self.prefix[(end - self.first).days + 1] - self.prefix[(start - self.first).days]
+
+    def weight(self, day):
+        return self.weights[(day - self.first).days]
+
+
+class WorkingDayCalculator:
+    """
+    Working days between dates in each company's work calendar.
+
+    Calendars are read in one query when the calculator is created, and a
+    calendar's holidays on the first index built for it. Each call is then
+    O(1) per calendar year spanned, so one calculator can price a whole
+    batch of requests.
+    """
+
+    def __init__(self):
+        self._calendars = {
+            calendar.company_name.casefold(): calendar
+            for calendar in WorkCalendar.objects.only('id', 'company_name', 'weekend_days', 'updated_at')
+        }
+        self._holidays = {}
+
+    def calendar_for(self, company_name):
+        """The company's calendar, else the default one, else None (built-in week)"""
+        return self._calendars.get((company_name or '').casefold()) or self._calendars.get('')
+
+    def _calendar_holidays(self, calendar):
+        if calendar.pk not in self._holidays:
+            self._holidays[calendar.pk] = dict(
+                Holiday.objects.filter(calendar=calendar).values_list('date', 'is_half_day')
+            )
+        return self._holidays[calendar.pk]
+
+    def index(self, calendar, year):
+        """BusinessDayIndex of a calendar (None: DEFAULT_WEEKEND, no holidays) for a year"""
+        key = (calendar.pk, calendar.updated_at, year) if calendar else (None, None, year)
+        index = _index_cache.get(key)
+        if index is None:
+            if calendar is None:
+                index = BusinessDayIndex(year, DEFAULT_WEEKEND, {})
+            else:
+                index = BusinessDayIndex(year, calendar.weekend, self._calendar_holidays(calendar))
+            with _index_cache_lock:
+                if len(_index_cache) >= INDEX_CACHE_MAX:
+                    _index_cache.clear()
+                _index_cache[key] = index
+        return index
+
+    def working_days(self, start_date, end_date, company_name='', start_half_day=False, end_half_day=False):
+        """
+        Working days from start_date to end_date (inclusive) as a Decimal in
+        steps of 0.5. start_half_day / end_half_day: the leave starts or ends
+        at midday, so that day counts at most half a day.
+        """
+        if end_date < start_date:
+            raise ValueError("End date must be after start date")
+
+        calendar = self.calendar_for(company_name)
+        half_days = 0
+        for year in range(start_date.year, end_date.year + 1):
+            half_days += self.index(calendar, year).half_days(
+                max(start_date, date(year, 1, 1)),
+                min(end_date, date(year, 12, 31))
+            )
+
+        if start_half_day:
+            half_days -= max(self.index(calendar, start_date.year).weight(start_date) - 1, 0)
+        if end_half_day and not (start_half_day and end_date == start_date):
+            half_days -= max(self.index(calendar, end_date.year).weight(end_date) - 1, 0)
+
+        return Decimal(half_days) * HALF
+
+    def working_dates(self, start_date, end_date, company_name=''):
+        """
+        The dates from start_date to end_date (inclusive) that leave is
+        charged for: working days and half-day holidays
+        """
+        calendar = self.calendar_for(company_name)
+        dates = []
+        day = start_date
+        while day <= end_date:
+            if self.index(calendar, day.year).weight(day):
+                dates.append(day)
+            day += timedelta(days=1)
+        return dates
+
+
+def working_days(start_date, end_date, company_name='', start_half_day=False, end_half_day=False):
+    """Working days for a single date range; use a WorkingDayCalculator for batches"""
+    return WorkingDayCalculator().working_days(start_date, end_date, company_name, start_half_day, end_half_day)
+
+
+def recompute_pending_allocations(dry_run=False):
+    """
+    Re-price every pending request in working days, e.g. after holidays
+    were added. Returns (checked, changed). Changed requests are grouped by
+    their new allocation, so each group is one UPDATE per
+    RECOMPUTE_BATCH_SIZE ids. Requests that no longer contain a working day
+    are left for HR to review.
+    """
+    calculator = WorkingDayCalculator()
+    requests = TimeOffRequest.objects.filter(status='PENDING').values_list(
+        'id', 'employee_id', 'employee__company_name',
+        'start_date', 'end_date', 'start_half_day', 'end_half_day', 'allocation_days'
+    )
+
+    checked = 0
+    changed = defaultdict(list)
+    employee_ids = set()
+    for request_id, employee_id, company_name, start, end, start_half, end_half, allocation in \
+            requests.iterator(chunk_size=RECOMPUTE_BATCH_SIZE):
+        checked += 1
+        days = calculator.working_days(start, end, company_name, start_half, end_half)
+        if days and days != allocation:
+            changed[days].append(request_id)
+            employee_ids.add(employee_id)
+
+    if changed and not dry_run:
+        now = timezone.now()
+        with transaction.atomic():
+            for days, request_ids in changed.items():
+                for offset in range(0, len(request_ids), RECOMPUTE_BATCH_SIZE):
+                    TimeOffRequest.objects.filter(
+                        pk__in=request_ids[offset:offset + RECOMPUTE_BATCH_SIZE],
+                        status='PENDING'
+                    ).update(allocation_days=days, updated_at=now)
+            # Queryset updates do not send post_save
+            for employee_id in employee_ids:
+                invalidate_user_responses(employee_id)
+
+    return checked, sum(len(request_ids) for request_ids in changed.values())
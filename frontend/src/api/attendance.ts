@@ -50,6 +50,8 @@ export interface EmployeeMonthAttendanceResponse {
   days_present: number;
   days_on_leave: number;
   total_days: number;
+  total_work_hours: string; // HH:MM
+  total_extra_hours: string; // HH:MM
   records: AttendanceRecord[];
 }
 
@@ -142,6 +142,21 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Cursor-paginated list responses
+export interface CursorPage<T> {
+  results: T[];
+  next: string | null; // Cursor for the next page, null on the last page
+}
+
+/**
+ * Unwrap a paginated list response, keeping the cursor of the next page
+ * (the backend returns it inside the `next` URL)
+ */
+export const toCursorPage = <T>(data: { next: string | null; results: T[] }): CursorPage<T> => ({
+  results: data.results,
+  next: data.next ? new URL(data.next, API_BASE_URL).searchParams.get('cursor') : null,
+});
+
 // API Error handler
 export const handleApiError = (error: unknown): string => {
   if (axios.isAxiosError(error)) {
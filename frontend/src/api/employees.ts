@@ -2,7 +2,7 @@
  * Employees API
  */
 
-import apiClient from './client';
+import apiClient, { CursorPage, toCursorPage } from './client';
 
 export interface Employee {
   id: string;
@@ -22,7 +22,6 @@ export interface EmployeeDetail extends Employee {
 }
 
 export interface EmployeesListResponse {
-  count: number;
   next: string | null;
   previous: string | null;
   results: Employee[];
@@ -30,11 +29,11 @@ export interface EmployeesListResponse {
 
 export const employeesApi = {
   /**
-   * Get list of employees
+   * Get a page of employees (pass the returned `next` as `cursor` for the next page)
    */
-  list: async (params?: { search?: string; page?: number }): Promise<Employee[]> => {
-    const response = await apiClient.get<Employee[]>('/employees/', { params });
-    return response.data;
+  list: async (params?: { search?: string; cursor?: string; page_size?: number }): Promise<CursorPage<Employee>> => {
+    const response = await apiClient.get<EmployeesListResponse>('/employees/', { params });
+    return toCursorPage(response.data);
   },
 
   /**
@@ -2,7 +2,7 @@
  * Time Off API
  */
 
-import apiClient from './client';
+import apiClient, { CursorPage, toCursorPage } from './client';
 
 export interface TimeOffBalance {
   id: string; // Balance ID
@@ -79,15 +79,20 @@ export const timeoffApi = {
   },
 
   /**
-   * Admin - Get all time off requests
+   * Admin - Get a page of time off requests (pass the returned `next` as `cursor` for the next page)
    */
   getAdminTimeOffList: async (params?: {
     status?: 'PENDING' | 'APPROVED' | 'REJECTED';
     search?: string;
-    page?: number;
-  }): Promise<TimeOffRequest[]> => {
-    const response = await apiClient.get<TimeOffRequest[]>('/timeoff/admin/', { params });
-    return response.data;
+    cursor?: string;
+    page_size?: number;
+  }): Promise<CursorPage<TimeOffRequest>> => {
+    const response = await apiClient.get<{
+      next: string | null;
+      previous: string | null;
+      results: TimeOffRequest[];
+    }>('/timeoff/admin/', { params });
+    return toCursorPage(response.data);
   },
 
   /**
@@ -4,7 +4,7 @@ import MyProfile from './MyProfile';
 import TimeOff from './TimeOff';
 import AttendancePage from './AttendancePage';
 import EmployeeDetail from './EmployeeDetail';
-import { employeesApi } from '../../api/employees';
+import { employeesApi, Employee as ApiEmployee } from '../../api/employees';
 import { attendanceApi } from '../../api/attendance';
 import { handleApiError } from '../../api/client';
 
@@ -24,6 +24,14 @@ interface EmployeesDashboardProps {
   onLogout: () => void;
 }
 
+// Map an API employee to the card format
+const mapEmployee = (emp: ApiEmployee): Employee => ({
+  id: emp.id,
+  name: emp.full_name,
+  status: emp.status_icon.toLowerCase().replace('_', '-') as EmployeeStatus,
+  avatar: emp.profile_picture || undefined,
+});
+
 export default function EmployeesDashboard({ userRole, userName, onLogout }: EmployeesDashboardProps) {
   const [activeTab, setActiveTab] = useState<'employees' | 'attendance' | 'timeoff'>('employees');
   const [showUserDropdown, setShowUserDropdown] = useState(false);
@@ -35,6 +43,8 @@ export default function EmployeesDashboard({ userRole, userName, onLogout }: Emp
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string>('');
   const [selectedEmployeeId, setSelectedEmployeeId] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // Load employees on mount
   useEffect(() => {
@@ -50,17 +60,9 @@ export default function EmployeesDashboard({ userRole, userName, onLogout }: Emp
     try {
       setLoading(true);
       setError(''); // Clear any previous errors
-      const employeesList = await employeesApi.list({ search: searchQuery });
-      
-      // Map API response to component format
-      const mappedEmployees = employeesList.map(emp => ({
-        id: emp.id,
-        name: emp.full_name,
-        status: emp.status_icon.toLowerCase().replace('_', '-') as EmployeeStatus,
-        avatar: emp.profile_picture || undefined,
-      }));
-      
-      setEmployees(mappedEmployees);
+      const page = await employeesApi.list({ search: searchQuery });
+      setEmployees(page.results.map(mapEmployee));
+      setNextCursor(page.next);
     } catch (err) {
       setError(handleApiError(err));
       console.error('Failed to load employees:', err);
@@ -69,6 +71,20 @@ export default function EmployeesDashboard({ userRole, userName, onLogout }: Emp
     }
   };
 
+  const loadMoreEmployees = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await employeesApi.list({ search: searchQuery, cursor: nextCursor });
+      setEmployees(prev => [...prev, ...page.results.map(mapEmployee)]);
+      setNextCursor(page.next);
+    } catch (err) {
+      alert(handleApiError(err));
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const loadCurrentStatus = async () => {
     try {
       const status = await attendanceApi.getCurrentStatus();
@@ -351,6 +367,18 @@ export default function EmployeesDashboard({ userRole, userName, onLogout }: Emp
             )}
           </div>
 
+          {nextCursor && !loading && !error && (
+            <div className="text-center mb-8">
+              <button
+                onClick={loadMoreEmployees}
+                disabled={loadingMore}
+                className="px-4 py-2 text-sm text-[#E381FF] border border-[#E381FF] rounded-lg hover:bg-[#E381FF] hover:text-white transition-colors disabled:opacity-50"
+              >
+                {loadingMore ? 'Loading...' : 'Load more'}
+              </button>
+            </div>
+          )}
+
           {/* Status Legend */}
           <div className="bg-white border border-gray-200 rounded-xl p-4 inline-block">
             <p className="text-gray-700 mb-3 text-sm">Status Indicators:</p>
@@ -51,6 +51,8 @@ export default function TimeOff({ userRole, userName, onBack, onNavigateToAttend
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState<string>('');
   const [submitting, setSubmitting] = useState(false);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   const isAdmin = userRole === 'admin';
 
@@ -66,8 +68,9 @@ export default function TimeOff({ userRole, userName, onBack, onNavigateToAttend
       
       if (isAdmin) {
         // Load all requests for admin view
-        const requestsData = await timeoffApi.getAdminTimeOffList({ status: undefined });
-        setRequests(requestsData);
+        const page = await timeoffApi.getAdminTimeOffList({ status: undefined });
+        setRequests(page.results);
+        setNextCursor(page.next);
         
         // Also load admin's own balances so they can create requests
         const myData = await timeoffApi.getMyTimeOff();
@@ -86,6 +89,20 @@ export default function TimeOff({ userRole, userName, onBack, onNavigateToAttend
     }
   };
 
+  const loadMoreRequests = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await timeoffApi.getAdminTimeOffList({ cursor: nextCursor });
+      setRequests(prev => [...prev, ...page.results]);
+      setNextCursor(page.next);
+    } catch (err) {
+      alert(handleApiError(err));
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleApprove = async (id: string) => {
     try {
       const response = await timeoffApi.approveRequest(id);
@@ -388,6 +405,17 @@ export default function TimeOff({ userRole, userName, onBack, onNavigateToAttend
                     ))}
                   </tbody>
                 </table>
+                {isAdmin && nextCursor && (
+                  <div className="text-center py-4 border-t border-gray-100">
+                    <button
+                      onClick={loadMoreRequests}
+                      disabled={loadingMore}
+                      className="px-4 py-2 text-sm text-[#E381FF] border border-[#E381FF] rounded-lg hover:bg-[#E381FF] hover:text-white transition-colors disabled:opacity-50"
+                    >
+                      {loadingMore ? 'Loading...' : 'Load more'}
+                    </button>
+                  </div>
+                )}
               </div>
             </div>
           )}